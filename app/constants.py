@@ -6,3 +6,4 @@ INSTANCE_DIR = BASE_DIR / 'instance'
 TEMPLATES_DIR = BASE_DIR / 'templates'
 STATIC_DIR = BASE_DIR / 'static'
 LOCAL_DATABASE_PATH = INSTANCE_DIR / 'database.sqlite'
+JINJA_CACHE_DIR = INSTANCE_DIR / 'jinja'
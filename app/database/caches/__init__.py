@@ -0,0 +1 @@
+from .lru_cache import LRUCache  # isort:skip
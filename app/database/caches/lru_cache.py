@@ -0,0 +1,50 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.registers: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.lock:
+            register = self.registers.get(key, None)
+            if register is None or (self.ttl is not None and register[0] < time.monotonic()):
+                self.registers.pop(key, None)
+                self.misses += 1
+                return default
+
+            self.registers.move_to_end(key)
+            self.hits += 1
+            return register[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float('inf')
+        with self.lock:
+            self.registers[key] = (expires, value)
+            self.registers.move_to_end(key)
+            while len(self.registers) > self.maxsize:
+                self.registers.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self.lock:
+            self.registers.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.registers.clear()
+
+    def statistics(self) -> Dict[str, int]:
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.registers)}
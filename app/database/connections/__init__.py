@@ -1 +1,13 @@
 from .local_connection import LocalConnection  # isort:skip
+from .shard_set import Shard  # isort:skip
+from .shard_set import ShardSet  # isort:skip
+from .unit_of_work import UnitOfWork  # isort:skip
+from .unit_of_work import Connection  # isort:skip
+from .statement_counter import StatementCounter  # isort:skip
+from .statement_counter import assert_max_statements  # isort:skip
+from .sqlite_profiles import SQLITE_PROFILES  # isort:skip
+from .sqlite_profiles import read_only_url  # isort:skip
+from .sqlite_profiles import is_sqlite_file  # isort:skip
+from .sqlite_profiles import async_url  # isort:skip
+from .async_local_connection import AsyncLocalConnection  # isort:skip
+from .group_commit_writer import GroupCommitWriter  # isort:skip
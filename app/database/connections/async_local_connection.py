@@ -0,0 +1,90 @@
+import threading
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import aiosqlite
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.database.caches import LRUCache
+from app.database.connections.local_connection import LocalConnection
+from app.database.connections.sqlite_profiles import async_url
+
+
+class AsyncLocalConnection:
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_recycle: int = -1,
+        user_cache_size: int = 1024,
+        user_cache_ttl: Optional[float] = 60.0,
+        pragmas: Optional[Dict[str, Any]] = None,
+        primary: Optional[LocalConnection] = None,
+    ) -> None:
+        self.url = async_url(url)
+        self.pragmas: Dict[str, Any] = dict(pragmas or {})
+        self.primary = primary
+        engine_options = LocalConnection.pool_options(self.url, pool_size, max_overflow, pool_recycle)
+        if len(engine_options):
+            engine_options.update(poolclass=AsyncAdaptedQueuePool, async_creator=self.create_connection)
+
+        self.engine: AsyncEngine = create_async_engine(self.url, **engine_options)
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.statistics: Dict[str, int] = {'connects': 0}
+        self.statistics_lock = threading.Lock()
+        self.user_cache = primary.user_cache if primary is not None else LRUCache(user_cache_size, user_cache_ttl)
+        self.generation = 0
+
+        event.listen(self.engine.sync_engine, 'connect', self.on_connect)
+
+    @classmethod
+    def from_connection(cls, connection: LocalConnection, **kwargs: Any) -> 'AsyncLocalConnection':
+        return cls(connection.url, pragmas=connection.pragmas, primary=connection, **kwargs)
+
+    async def initialize(self) -> None:
+        # The first connection initializes the dialect under an asyncio lock bound to
+        # the calling event loop; doing it once up front keeps that lock uncontended.
+        async with self.engine.connect():
+            pass
+
+    async def create_connection(self) -> aiosqlite.Connection:
+        arguments, options = self.engine.dialect.create_connect_args(self.engine.url)
+        connection = aiosqlite.connect(*arguments, **options)
+        # aiosqlite runs each connection on its own worker thread; pooled connections
+        # would otherwise keep the interpreter alive at exit.
+        connection._thread.daemon = True
+        return await connection
+
+    def on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self.statistics_lock:
+            self.statistics['connects'] += 1
+
+        if len(self.pragmas):
+            cursor = dbapi_connection.cursor()
+            for key, value in self.pragmas.items():
+                cursor.execute(f'PRAGMA {key} = {value}')
+            cursor.close()
+
+    def ReadSession(self) -> AsyncSession:
+        return self.Session()
+
+    def mark_written(self) -> None:
+        if self.primary is not None:
+            self.primary.mark_written()
+
+    def bump_generation(self) -> None:
+        with self.statistics_lock:
+            self.generation += 1
+
+        if self.primary is not None:
+            self.primary.bump_generation()
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
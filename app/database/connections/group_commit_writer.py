@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+Operation = Callable[[Session], Any]
+BatchObserver = Callable[[int, float], None]
+
+
+class GroupCommitWriter:
+    def __init__(
+        self,
+        engine: Engine,
+        on_commit: Callable[[], None],
+        max_batch: int = 64,
+        max_delay: float = 0.005,
+        timeout: float = 30.0,
+    ) -> None:
+        self.engine = engine
+        self.on_commit = on_commit
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.queue: 'queue.Queue[Optional[Tuple[Operation, Future]]]' = queue.Queue()
+        self.observers: List[BatchObserver] = []
+        self.statistics: Dict[str, int] = {'batches': 0, 'operations': 0, 'errors': 0}
+        self.statistics_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name='group-commit-writer', daemon=True)
+        self.thread.start()
+
+    def count(self, key: str, amount: int = 1) -> None:
+        with self.statistics_lock:
+            self.statistics[key] += amount
+
+    def status(self) -> Dict[str, int]:
+        with self.statistics_lock:
+            return dict(self.statistics)
+
+    def submit(self, operation: Operation) -> Future:
+        if not self.thread.is_alive():
+            raise RuntimeError('Group commit writer is not running')
+
+        future: Future = Future()
+        self.queue.put((operation, future))
+
+        return future
+
+    def execute(self, operation: Operation) -> Any:
+        return self.submit(operation).result(self.timeout)
+
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    stop = True
+                    break
+
+                batch.append(item)
+
+            try:
+                self.commit(batch)
+            except Exception as error:
+                self.fail(batch, error)
+
+            if stop:
+                return
+
+    @staticmethod
+    def on_begin(bind: Connection) -> None:
+        bind.exec_driver_sql('BEGIN IMMEDIATE')
+
+    def commit(self, batch: List[Tuple[Operation, Future]]) -> None:
+        start = time.perf_counter()
+        results: List[Tuple[Future, Any]] = []
+
+        with self.engine.connect() as bind, Session(bind=bind, expire_on_commit=False) as session:
+            bind.execution_options(isolation_level='AUTOCOMMIT')
+            event.listen(bind, 'begin', self.on_begin)
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    with session.begin_nested():
+                        results.append((future, operation(session)))
+                except Exception as error:
+                    self.count('errors')
+                    future.set_exception(error)
+
+            try:
+                session.commit()
+            except Exception as error:
+                self.count('errors', len(results))
+                for future, _ in results:
+                    future.set_exception(error)
+                results = []
+
+        if len(results):
+            self.on_commit()
+
+        for future, result in results:
+            future.set_result(result)
+
+        seconds = time.perf_counter() - start
+        with self.statistics_lock:
+            self.statistics['batches'] += 1
+            self.statistics['operations'] += len(batch)
+
+        for observer in self.observers:
+            observer(len(batch), seconds)
+
+    def fail(self, batch: List[Tuple[Operation, Future]], error: Exception) -> None:
+        pending = [future for _, future in batch if not future.done()]
+        self.count('errors', len(pending))
+        for future in pending:
+            future.set_exception(error)
+
+    def close(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
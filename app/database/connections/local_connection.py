@@ -1,16 +1,164 @@
+import threading
+from contextvars import ContextVar
+from typing import Any
+from typing import Dict
 from typing import Optional
+from typing import Sequence
 
 from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy import make_url
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker
 
-from app.database.entities import BaseEntity
+from app.database.caches import LRUCache
+from app.database.connections.group_commit_writer import GroupCommitWriter
+from app.database.connections.replica_set import ReplicaSet
+from app.database.connections.shard_set import ShardSet
+from app.database.connections.sqlite_profiles import is_sqlite_file
+from app.database.connections.sqlite_profiles import read_only_url
+from app.database.connections.sqlite_profiles import READ_ONLY_IGNORED_PRAGMAS
+from app.database.migrations import MigrationRunner
 
 
 class LocalConnection:
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_recycle: int = -1,
+        user_cache_size: int = 1024,
+        user_cache_ttl: Optional[float] = 60.0,
+        pragmas: Optional[Dict[str, Any]] = None,
+        read_only: bool = False,
+        replica_urls: Sequence[str] = (),
+        replica_health_check_interval: float = 5.0,
+        shard_urls: Sequence[str] = (),
+        create_schema: bool = True,
+        group_commit: bool = False,
+        group_commit_batch: int = 64,
+        group_commit_delay: float = 0.005,
+        group_commit_timeout: float = 30.0,
+    ) -> None:
+        url = read_only_url(url) if read_only else url
+        self.url = url
+        self.read_only = read_only
+        self.pragmas: Dict[str, Any] = {
+            key: value
+            for key, value in (pragmas or {}).items()
+            if not (read_only and key in READ_ONLY_IGNORED_PRAGMAS)
+        }
         self.session: Optional[Session] = None
-        self.engine: Engine = create_engine(url)
+        engine_options = self.pool_options(url, pool_size, max_overflow, pool_recycle)
+        self.engine: Engine = create_engine(url, **engine_options)
         self.Session = sessionmaker(self.engine)
-        BaseEntity.metadata.create_all(self.engine)
+        self.statistics: Dict[str, int] = {'connects': 0, 'checkouts': 0, 'checkins': 0}
+        self.statistics_lock = threading.Lock()
+        self.user_cache = LRUCache(user_cache_size, user_cache_ttl)
+        self.generation = 0
+        self.replica_set = ReplicaSet(
+            [read_only_url(replica) if is_sqlite_file(replica) else replica for replica in replica_urls],
+            engine_options,
+            {key: value for key, value in self.pragmas.items() if key not in READ_ONLY_IGNORED_PRAGMAS},
+            replica_health_check_interval,
+        )
+        self.shard_set = ShardSet(
+            [read_only_url(shard) if read_only and is_sqlite_file(shard) else shard for shard in shard_urls],
+            engine_options,
+            self.pragmas,
+            create_schema and not read_only,
+        )
+        self.sticky: ContextVar[bool] = ContextVar(f'sticky_{id(self)}', default=False)
+        self.written: ContextVar[bool] = ContextVar(f'written_{id(self)}', default=False)
+        self.writer: Optional[GroupCommitWriter] = (
+            GroupCommitWriter(
+                self.engine, self.bump_generation, group_commit_batch, group_commit_delay, group_commit_timeout
+            )
+            if group_commit and not read_only
+            else None
+        )
+
+        event.listen(self.engine, 'connect', self.on_connect)
+        event.listen(self.engine, 'checkout', self.on_checkout)
+        event.listen(self.engine, 'checkin', self.on_checkin)
+
+        if create_schema and not read_only:
+            self.create_schema()
+
+    @staticmethod
+    def pool_options(url: str, pool_size: int, max_overflow: int, pool_recycle: int) -> Dict[str, Any]:
+        parsed_url = make_url(url)
+        if parsed_url.get_backend_name() == 'sqlite' and not is_sqlite_file(url):
+            return {}
+
+        return {'pool_size': pool_size, 'max_overflow': max_overflow, 'pool_recycle': pool_recycle}
+
+    def create_schema(self) -> None:
+        MigrationRunner.prepare(self.engine)
+
+    def count(self, key: str) -> None:
+        with self.statistics_lock:
+            self.statistics[key] += 1
+
+    def on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.count('connects')
+        if len(self.pragmas):
+            cursor = dbapi_connection.cursor()
+            for key, value in self.pragmas.items():
+                cursor.execute(f'PRAGMA {key} = {value}')
+            cursor.close()
+
+    def effective_pragmas(self) -> Dict[str, Any]:
+        with self.engine.connect() as connection:
+            return {
+                key: connection.exec_driver_sql(f'PRAGMA {key}').scalar()
+                for key in ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'busy_timeout')
+            }
+
+    def on_checkout(self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        self.count('checkouts')
+
+    def on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.count('checkins')
+
+    def ReadSession(self) -> Session:
+        if self.sticky.get() or not len(self.replica_set):
+            return self.Session()
+
+        replica = self.replica_set.choose()
+        return replica.Session() if replica is not None else self.Session()
+
+    def stick(self, sticky: bool = True) -> None:
+        self.sticky.set(sticky)
+        self.written.set(False)
+
+    def mark_written(self) -> None:
+        self.sticky.set(True)
+        self.written.set(True)
+
+    def bump_generation(self) -> None:
+        with self.statistics_lock:
+            self.generation += 1
+
+        self.mark_written()
+
+    def pool_status(self) -> Dict[str, int]:
+        pool = self.engine.pool
+        with self.statistics_lock:
+            status = dict(self.statistics)
+
+        status['size'] = getattr(pool, 'size', lambda: 0)()
+        status['checked_out'] = getattr(pool, 'checkedout', lambda: 0)()
+        status['overflow'] = getattr(pool, 'overflow', lambda: 0)()
+
+        return status
+
+    def dispose(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+        self.engine.dispose()
+        self.replica_set.dispose()
+        self.shard_set.dispose()
@@ -0,0 +1,81 @@
+import itertools
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+
+class Replica:
+    def __init__(self, url: str, engine_options: Dict[str, Any], pragmas: Dict[str, Any]) -> None:
+        self.url = url
+        self.engine: Engine = create_engine(url, **engine_options)
+        self.Session = sessionmaker(self.engine)
+        self.pragmas = pragmas
+        self.healthy = True
+        self.checked_at = 0.0
+        self.reads = 0
+
+        event.listen(self.engine, 'connect', self.on_connect)
+
+    def on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for key, value in self.pragmas.items():
+            cursor.execute(f'PRAGMA {key} = {value}')
+        cursor.close()
+
+    def check(self) -> bool:
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text('SELECT 1 FROM post LIMIT 1'))
+            self.healthy = True
+        except SQLAlchemyError:
+            self.healthy = False
+
+        self.checked_at = time.monotonic()
+        return self.healthy
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        urls: Sequence[str],
+        engine_options: Dict[str, Any],
+        pragmas: Dict[str, Any],
+        health_check_interval: float = 5.0,
+    ) -> None:
+        self.replicas: List[Replica] = [Replica(url, engine_options, pragmas) for url in urls]
+        self.health_check_interval = health_check_interval
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        for _ in range(len(self.replicas)):
+            with self.lock:
+                replica = self.replicas[next(self.counter) % len(self.replicas)]
+                due = time.monotonic() - replica.checked_at >= self.health_check_interval
+
+            if (replica.check() if due else replica.healthy):
+                replica.reads += 1
+                return replica
+
+        return None
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [{'url': replica.url, 'healthy': replica.healthy, 'reads': replica.reads} for replica in self.replicas]
+
+    def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.engine.dispose()
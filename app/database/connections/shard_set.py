@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.migrations import MigrationRunner
+
+
+T = TypeVar('T')
+
+
+class Shard:
+    def __init__(self, index: int, url: str, engine_options: Dict[str, Any], pragmas: Dict[str, Any]) -> None:
+        self.index = index
+        self.url = url
+        self.engine: Engine = create_engine(url, **engine_options)
+        self.Session = sessionmaker(self.engine)
+        self.pragmas = pragmas
+
+        event.listen(self.engine, 'connect', self.on_connect)
+
+    def on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for key, value in self.pragmas.items():
+            cursor.execute(f'PRAGMA {key} = {value}')
+        cursor.close()
+
+
+class ShardSet:
+    def __init__(
+        self,
+        urls: Sequence[str],
+        engine_options: Dict[str, Any],
+        pragmas: Dict[str, Any],
+        create_schema: bool = True,
+    ) -> None:
+        self.shards: List[Shard] = [Shard(index, url, engine_options, pragmas) for index, url in enumerate(urls)]
+        self.executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(len(self.shards), thread_name_prefix='shard') if len(self.shards) > 1 else None
+        )
+
+        if create_schema:
+            for shard in self.shards:
+                MigrationRunner.prepare(shard.engine)
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    def __iter__(self) -> Iterator[Shard]:
+        return iter(self.shards)
+
+    def __getitem__(self, index: int) -> Shard:
+        return self.shards[index]
+
+    def hashed(self, id_user: int) -> Shard:
+        return self.shards[id_user % len(self.shards)]
+
+    def scatter(self, function: Callable[[Shard], T]) -> List[T]:
+        if self.executor is None:
+            return [function(shard) for shard in self.shards]
+
+        return list(self.executor.map(function, self.shards))
+
+    def dispose(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+
+        for shard in self.shards:
+            shard.engine.dispose()
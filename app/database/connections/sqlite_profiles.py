@@ -0,0 +1,52 @@
+from typing import Any
+from typing import Dict
+
+from sqlalchemy import make_url
+
+
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {},
+    'development': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+    },
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,
+        'cache_size': -65536,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'testing': {
+        'synchronous': 'OFF',
+        'temp_store': 'MEMORY',
+    },
+}
+
+READ_ONLY_IGNORED_PRAGMAS = ('journal_mode',)
+
+
+def is_sqlite_file(url: str) -> bool:
+    parsed_url = make_url(url)
+    return parsed_url.get_backend_name() == 'sqlite' and parsed_url.database not in (None, '', ':memory:')
+
+
+def read_only_url(url: str) -> str:
+    parsed_url = make_url(url)
+    database = parsed_url.database or ''
+    if not database.startswith('file:'):
+        database = f'file:{database}'
+
+    return parsed_url.set(database=database, query={**parsed_url.query, 'mode': 'ro', 'uri': 'true'}).render_as_string(
+        hide_password=False
+    )
+
+
+def async_url(url: str) -> str:
+    parsed_url = make_url(url)
+    if parsed_url.drivername != 'sqlite':
+        return url
+
+    return parsed_url.set(drivername='sqlite+aiosqlite').render_as_string(hide_password=False)
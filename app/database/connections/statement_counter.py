@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterator
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class StatementCounter:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def __enter__(self) -> 'StatementCounter':
+        event.listen(self.engine, 'before_cursor_execute', self.on_before_cursor_execute)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        event.remove(self.engine, 'before_cursor_execute', self.on_before_cursor_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def on_before_cursor_execute(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        self.statements.append(statement)
+
+
+@contextmanager
+def assert_max_statements(engine: Engine, maximum: int) -> Iterator[StatementCounter]:
+    with StatementCounter(engine) as counter:
+        yield counter
+
+    assert counter.count <= maximum, f'Expected at most {maximum} statements, got {counter.count}: {counter.statements}'
@@ -0,0 +1,96 @@
+from contextlib import nullcontext
+from typing import Any
+from typing import ContextManager
+from typing import List
+from typing import Optional
+from typing import Protocol
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session as OrmSession
+
+from app.database.caches import LRUCache
+from app.database.connections.group_commit_writer import GroupCommitWriter
+from app.database.connections.local_connection import LocalConnection
+from app.database.connections.replica_set import ReplicaSet
+from app.database.connections.shard_set import ShardSet
+
+
+class Connection(Protocol):
+    engine: Engine
+    user_cache: LRUCache
+    replica_set: ReplicaSet
+    shard_set: ShardSet
+    writer: Optional[GroupCommitWriter]
+
+    def Session(self) -> ContextManager[OrmSession]:
+        ...
+
+    def ReadSession(self) -> ContextManager[OrmSession]:
+        ...
+
+    def mark_written(self) -> None:
+        ...
+
+    def bump_generation(self) -> None:
+        ...
+
+
+class UnitOfWork:
+    def __init__(self, connection: LocalConnection) -> None:
+        self.connection = connection
+        self.engine: Engine = connection.engine
+        self.statements = 0
+        self.references: List[Any] = []
+        self.changed = False
+        self.writer: Optional[GroupCommitWriter] = None
+        self.bind = self.engine.connect()
+        self.transaction = self.bind.begin()
+        self.session = OrmSession(bind=self.bind, join_transaction_mode='rollback_only', expire_on_commit=False)
+
+        event.listen(self.bind, 'before_cursor_execute', self.on_before_cursor_execute)
+        event.listen(self.session, 'loaded_as_persistent', self.on_persistent)
+        event.listen(self.session, 'pending_to_persistent', self.on_persistent)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.connection, name)
+
+    def Session(self) -> ContextManager[OrmSession]:
+        return nullcontext(self.session)
+
+    def ReadSession(self) -> ContextManager[OrmSession]:
+        return self.Session()
+
+    def mark_written(self) -> None:
+        self.connection.mark_written()
+
+    def on_before_cursor_execute(self, *args: Any) -> None:
+        self.statements += 1
+
+    def on_persistent(self, session: OrmSession, instance: Any) -> None:
+        self.references.append(instance)
+
+    def bump_generation(self) -> None:
+        self.changed = True
+        self.connection.mark_written()
+
+    def commit(self) -> None:
+        self.session.flush()
+        if self.transaction.is_active:
+            self.transaction.commit()
+
+        if self.changed:
+            self.connection.bump_generation()
+            self.changed = False
+
+    def rollback(self) -> None:
+        if self.transaction.is_active:
+            self.transaction.rollback()
+
+        self.changed = False
+
+    def close(self) -> None:
+        self.references.clear()
+        self.session.close()
+        self.bind.close()
+
@@ -1,3 +1,12 @@
 from .base_entity import BaseEntity  # isort:skip
 from .user_entity import UserEntity  # isort:skip
 from .post_entity import PostEntity  # isort:skip
+from .schema_version_entity import SchemaVersionEntity  # isort:skip
+from .post_search import POST_SEARCH_STATEMENTS  # isort:skip
+from .post_search import POST_SEARCH_REBUILD_STATEMENT  # isort:skip
+from .feed_entity import FeedEntity  # isort:skip
+from .feed_entity import FEED_EXCERPT_LENGTH  # isort:skip
+from .feed_entity import FEED_TRIGGER_STATEMENTS  # isort:skip
+from .feed_entity import FEED_REBUILD_STATEMENTS  # isort:skip
+from .user_shard_entity import UserShardEntity  # isort:skip
+from .post_sequence_entity import PostSequenceEntity  # isort:skip
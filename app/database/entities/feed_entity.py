@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from sqlalchemy import DDL
+from sqlalchemy import event
+from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.database.entities import BaseEntity
+
+
+FEED_EXCERPT_LENGTH = 500
+
+
+class FeedEntity(BaseEntity):
+    __tablename__ = 'feed'
+
+    __table_args__ = (
+        Index('ix_feed_created_idpost', 'created', 'idpost'),
+        Index('ix_feed_id_user', 'id_user'),
+    )
+
+    idpost: Mapped[int] = mapped_column(
+        ForeignKey('post.idpost', ondelete='CASCADE'), init=True, primary_key=True, autoincrement=False
+    )
+    title: Mapped[str] = mapped_column(init=True, nullable=False)
+    excerpt: Mapped[str] = mapped_column(init=True, nullable=False)
+    created: Mapped[datetime] = mapped_column(init=True, nullable=False)
+    id_user: Mapped[int] = mapped_column(init=True, nullable=False)
+    username: Mapped[str] = mapped_column(init=True, nullable=False)
+
+
+FEED_TRIGGER_STATEMENTS = (
+    'CREATE TRIGGER IF NOT EXISTS feed_post_insert AFTER INSERT ON post BEGIN '
+    'INSERT INTO feed (idpost, title, excerpt, created, id_user, username) '
+    f'SELECT new.idpost, new.title, substr(new.body, 1, {FEED_EXCERPT_LENGTH}), new.created, new.id_user, '
+    'user.username FROM user WHERE user.iduser = new.id_user; END',
+    'CREATE TRIGGER IF NOT EXISTS feed_post_update AFTER UPDATE OF title, body, created, id_user ON post BEGIN '
+    f'UPDATE feed SET title = new.title, excerpt = substr(new.body, 1, {FEED_EXCERPT_LENGTH}), '
+    'created = new.created, id_user = new.id_user, '
+    'username = (SELECT username FROM user WHERE user.iduser = new.id_user) WHERE idpost = new.idpost; END',
+    'CREATE TRIGGER IF NOT EXISTS feed_post_delete AFTER DELETE ON post BEGIN '
+    'DELETE FROM feed WHERE idpost = old.idpost; END',
+    'CREATE TRIGGER IF NOT EXISTS feed_user_update AFTER UPDATE OF username ON user BEGIN '
+    'UPDATE feed SET username = new.username WHERE id_user = new.iduser; END',
+)
+
+FEED_REBUILD_STATEMENTS = (
+    'DELETE FROM feed',
+    'INSERT INTO feed (idpost, title, excerpt, created, id_user, username) '
+    f'SELECT post.idpost, post.title, substr(post.body, 1, {FEED_EXCERPT_LENGTH}), post.created, post.id_user, '
+    'user.username FROM post JOIN user ON user.iduser = post.id_user',
+)
+
+
+for statement in FEED_TRIGGER_STATEMENTS:
+    event.listen(FeedEntity.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import CheckConstraint
 from sqlalchemy import ForeignKey
 from sqlalchemy import func
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -22,12 +23,14 @@ class PostEntity(BaseEntity):
     __table_args__ = (
         CheckConstraint('title > 0', name='title_not_blank'),
         CheckConstraint('body > 0', name='body_not_blank'),
+        Index('ix_post_created_idpost', 'created', 'idpost'),
+        Index('ix_post_id_user_created', 'id_user', 'created'),
     )
 
     idpost: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str] = mapped_column(init=True, nullable=False)
     body: Mapped[str] = mapped_column(init=True, nullable=False)
-    created: Mapped[datetime] = mapped_column(init=False, default=datetime.now())
+    created: Mapped[datetime] = mapped_column(init=False, default_factory=datetime.now)
 
     user: Mapped['UserEntity'] = relationship(init=True)
     id_user: Mapped[int] = mapped_column(ForeignKey('user.iduser'), init=False)
@@ -0,0 +1,23 @@
+from sqlalchemy import DDL
+from sqlalchemy import event
+
+from app.database.entities.post_entity import PostEntity
+
+
+POST_SEARCH_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5("
+    "title, body, content='post', content_rowid='idpost', tokenize='unicode61 remove_diacritics 2')",
+    'CREATE TRIGGER IF NOT EXISTS post_fts_insert AFTER INSERT ON post BEGIN '
+    'INSERT INTO post_fts (rowid, title, body) VALUES (new.idpost, new.title, new.body); END',
+    'CREATE TRIGGER IF NOT EXISTS post_fts_delete AFTER DELETE ON post BEGIN '
+    "INSERT INTO post_fts (post_fts, rowid, title, body) VALUES ('delete', old.idpost, old.title, old.body); END",
+    'CREATE TRIGGER IF NOT EXISTS post_fts_update AFTER UPDATE OF title, body ON post BEGIN '
+    "INSERT INTO post_fts (post_fts, rowid, title, body) VALUES ('delete', old.idpost, old.title, old.body); "
+    'INSERT INTO post_fts (rowid, title, body) VALUES (new.idpost, new.title, new.body); END',
+)
+
+POST_SEARCH_REBUILD_STATEMENT = "INSERT INTO post_fts (post_fts) VALUES ('rebuild')"
+
+
+for statement in POST_SEARCH_STATEMENTS:
+    event.listen(PostEntity.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
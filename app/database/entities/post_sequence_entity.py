@@ -0,0 +1,11 @@
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.database.entities import BaseEntity
+
+
+class PostSequenceEntity(BaseEntity):
+    __tablename__ = 'post_sequence'
+
+    name: Mapped[str] = mapped_column(init=True, primary_key=True)
+    value: Mapped[int] = mapped_column(init=True, nullable=False)
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.database.entities import BaseEntity
+
+
+class SchemaVersionEntity(BaseEntity):
+    __tablename__ = 'schema_version'
+
+    version: Mapped[int] = mapped_column(init=True, primary_key=True, autoincrement=False)
+    description: Mapped[str] = mapped_column(init=True, nullable=False)
+    applied: Mapped[datetime] = mapped_column(init=False, default_factory=datetime.now)
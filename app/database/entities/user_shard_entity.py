@@ -0,0 +1,14 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.database.entities import BaseEntity
+
+
+class UserShardEntity(BaseEntity):
+    __tablename__ = 'user_shard'
+
+    id_user: Mapped[int] = mapped_column(
+        ForeignKey('user.iduser', ondelete='CASCADE'), init=True, primary_key=True, autoincrement=False
+    )
+    shard: Mapped[int] = mapped_column(init=True, nullable=False)
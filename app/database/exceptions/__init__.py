@@ -1,3 +1,6 @@
 from .exceptions import RegisterNotFound  # isort:skip
 from .exceptions import AlreadyRegistered  # isort:skip
 from .exceptions import MissingRequiredField  # isort:skip
+from .exceptions import InvalidOption  # isort:skip
+from .exceptions import InvalidRegister  # isort:skip
+from .exceptions import NotRegisterOwner  # isort:skip
@@ -11,3 +11,18 @@ class AlreadyRegistered(Exception):
 class MissingRequiredField(Exception):
     def __init__(self, field: str) -> None:
         super().__init__(f'Missing required field {field}.')
+
+
+class InvalidOption(Exception):
+    def __init__(self, option: str, value: str) -> None:
+        super().__init__(f'Invalid {option} {value}.')
+
+
+class InvalidRegister(Exception):
+    def __init__(self, register: str) -> None:
+        super().__init__(f'Invalid {register} register.')
+
+
+class NotRegisterOwner(Exception):
+    def __init__(self, register: str) -> None:
+        super().__init__(f'Current user is not {register} owner.')
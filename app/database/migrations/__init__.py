@@ -0,0 +1,3 @@
+from .migrations import Migration  # isort:skip
+from .migrations import MIGRATIONS  # isort:skip
+from .migration_runner import MigrationRunner  # isort:skip
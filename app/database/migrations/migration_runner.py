@@ -0,0 +1,74 @@
+from typing import List
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy import inspect
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.database.entities import BaseEntity
+from app.database.entities import SchemaVersionEntity
+from app.database.migrations.migrations import Migration
+from app.database.migrations.migrations import MIGRATIONS
+
+
+class MigrationRunner:
+    @staticmethod
+    def head() -> int:
+        return max((migration.version for migration in MIGRATIONS), default=0)
+
+    @staticmethod
+    def prepare(engine: Engine) -> None:
+        try:
+            if MigrationRunner.current_version(engine) >= MigrationRunner.head():
+                return
+        except DBAPIError:
+            pass
+
+        if not inspect(engine).has_table('post'):
+            BaseEntity.metadata.create_all(engine)
+            MigrationRunner.stamp(engine, MigrationRunner.head())
+            return
+
+        BaseEntity.metadata.create_all(engine, tables=[BaseEntity.metadata.tables[SchemaVersionEntity.__tablename__]])
+        MigrationRunner.upgrade(engine)
+
+    @staticmethod
+    def current_version(engine: Engine) -> int:
+        with Session(engine) as session:
+            version = session.scalar(select(func.max(SchemaVersionEntity.version)))
+
+        return version or 0
+
+    @staticmethod
+    def pending(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+        current = MigrationRunner.current_version(engine)
+        target = MigrationRunner.head() if target is None else target
+
+        return [migration for migration in MIGRATIONS if current < migration.version <= target]
+
+    @staticmethod
+    def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+        migrations = MigrationRunner.pending(engine, target)
+
+        for migration in migrations:
+            with Session(engine) as session:
+                for statement in migration.statements:
+                    session.execute(text(statement))
+
+                session.add(SchemaVersionEntity(version=migration.version, description=migration.description))
+                session.commit()
+
+        return migrations
+
+    @staticmethod
+    def stamp(engine: Engine, version: int) -> None:
+        with Session(engine) as session:
+            for migration in MIGRATIONS:
+                if migration.version <= version and session.get(SchemaVersionEntity, migration.version) is None:
+                    session.add(SchemaVersionEntity(version=migration.version, description=migration.description))
+
+            session.commit()
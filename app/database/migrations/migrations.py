@@ -0,0 +1,62 @@
+from typing import List
+from typing import NamedTuple
+from typing import Tuple
+
+from app.database.entities import FEED_REBUILD_STATEMENTS
+from app.database.entities import FEED_TRIGGER_STATEMENTS
+from app.database.entities import POST_SEARCH_REBUILD_STATEMENT
+from app.database.entities import POST_SEARCH_STATEMENTS
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        'Add post ordering and ownership indexes',
+        (
+            'CREATE INDEX IF NOT EXISTS ix_post_created_idpost ON post (created, idpost)',
+            'CREATE INDEX IF NOT EXISTS ix_post_id_user_created ON post (id_user, created)',
+        ),
+    ),
+    Migration(
+        2,
+        'Add full-text search index for posts',
+        POST_SEARCH_STATEMENTS + (POST_SEARCH_REBUILD_STATEMENT,),
+    ),
+    Migration(
+        3,
+        'Add denormalized feed table for the front page',
+        (
+            'CREATE TABLE IF NOT EXISTS feed ('
+            'idpost INTEGER NOT NULL, title VARCHAR NOT NULL, excerpt VARCHAR NOT NULL, created DATETIME NOT NULL, '
+            'id_user INTEGER NOT NULL, username VARCHAR NOT NULL, PRIMARY KEY (idpost), '
+            'FOREIGN KEY(idpost) REFERENCES post (idpost) ON DELETE CASCADE)',
+            'CREATE INDEX IF NOT EXISTS ix_feed_created_idpost ON feed (created, idpost)',
+            'CREATE INDEX IF NOT EXISTS ix_feed_id_user ON feed (id_user)',
+        )
+        + FEED_TRIGGER_STATEMENTS
+        + FEED_REBUILD_STATEMENTS,
+    ),
+    Migration(
+        4,
+        'Add user shard directory',
+        (
+            'CREATE TABLE IF NOT EXISTS user_shard ('
+            'id_user INTEGER NOT NULL, shard INTEGER NOT NULL, PRIMARY KEY (id_user), '
+            'FOREIGN KEY(id_user) REFERENCES user (iduser) ON DELETE CASCADE)',
+        ),
+    ),
+    Migration(
+        5,
+        'Add post id sequence for shards',
+        (
+            'CREATE TABLE IF NOT EXISTS post_sequence ('
+            'name VARCHAR NOT NULL, value INTEGER NOT NULL, PRIMARY KEY (name))',
+        ),
+    ),
+]
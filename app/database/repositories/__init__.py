@@ -1,2 +1,6 @@
 from .user_repository import UserRepository  # isort:skip
+from .shard_repository import ShardRepository  # isort:skip
 from .post_repository import PostRepository  # isort:skip
+from .async_user_repository import AsyncUserRepository  # isort:skip
+from .async_post_repository import AsyncPostRepository  # isort:skip
+from .feed_repository import FeedRepository  # isort:skip
@@ -0,0 +1,122 @@
+import itertools
+from datetime import datetime
+from typing import Dict
+from typing import NoReturn
+from typing import Optional
+from typing import Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.database.connections import AsyncLocalConnection
+from app.database.entities import PostEntity
+from app.database.entities import UserEntity
+from app.database.exceptions import NotRegisterOwner
+from app.database.exceptions import RegisterNotFound
+from app.database.repositories.async_user_repository import AsyncUserRepository
+from app.database.repositories.feed_repository import FeedRepository
+from app.database.repositories.pagination import page
+from app.database.repositories.post_repository import PostRepository
+from app.database.rows import PostRow
+from app.database.rows import SearchRow
+
+
+class AsyncPostRepository:
+    @staticmethod
+    async def check_insert_one(connection: AsyncLocalConnection, title: str, body: str, id_user: int) -> None:
+        PostRepository.check_fields(title, body)
+        await AsyncUserRepository.select_current(connection, id_user)
+
+    @staticmethod
+    async def insert_one(connection: AsyncLocalConnection, title: str, body: str, id_user: int) -> Dict:
+        await AsyncPostRepository.check_insert_one(connection, title, body, id_user)
+
+        async with connection.Session() as session:
+            user = await session.get_one(UserEntity, id_user)
+            post = PostEntity(title=title, body=body, user=user)
+            session.add(post)
+            await session.commit()
+            connection.bump_generation()
+
+            return post.asdict()
+
+    @staticmethod
+    async def select_one(connection: AsyncLocalConnection, idpost: int) -> Dict:
+        async with connection.ReadSession() as session:
+            post = await session.get(PostEntity, idpost, options=[joinedload(PostEntity.user)])
+            if post is not None:
+                return post.asdict()
+
+        raise RegisterNotFound('post')
+
+    @staticmethod
+    async def select_page(
+        connection: AsyncLocalConnection,
+        after_created: Optional[datetime] = None,
+        after_idpost: Optional[int] = None,
+        limit: int = 20,
+        backwards: bool = False,
+    ) -> Dict:
+        statement = FeedRepository.page_statement(after_created, after_idpost, limit, backwards)
+
+        async with connection.ReadSession() as session:
+            registers = list(itertools.starmap(PostRow, await session.execute(statement)))
+
+        return page(registers, limit, backwards)
+
+    @staticmethod
+    async def search(
+        connection: AsyncLocalConnection,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[Tuple[float, int]] = None,
+        snippet_tokens: int = 24,
+    ) -> Dict:
+        search = PostRepository.search_statement(query, limit, cursor, snippet_tokens)
+        if search is None:
+            return {'posts': [], 'has_more': False}
+
+        async with connection.ReadSession() as session:
+            registers = list(itertools.starmap(SearchRow, await session.execute(*search)))
+
+        return {'posts': registers[:limit], 'has_more': len(registers) > limit}
+
+    @staticmethod
+    async def update_owned(connection: AsyncLocalConnection, idpost: int, id_user: int, title: str, body: str) -> Dict:
+        PostRepository.check_fields(title, body)
+        statement = PostRepository.update_owned_statement(idpost, id_user, title, body)
+
+        async with connection.Session() as session:
+            register = (await session.execute(statement)).mappings().first()
+            if register is None:
+                await session.rollback()
+                await AsyncPostRepository.raise_not_owned(connection, idpost)
+
+            post = dict(register)
+            await session.commit()
+            connection.bump_generation()
+
+        return post
+
+    @staticmethod
+    async def delete_owned(connection: AsyncLocalConnection, idpost: int, id_user: int) -> None:
+        statement = PostRepository.delete_owned_statement(idpost, id_user)
+
+        async with connection.Session() as session:
+            deleted = (await session.execute(statement)).scalar()
+            if deleted is None:
+                await session.rollback()
+                await AsyncPostRepository.raise_not_owned(connection, idpost)
+
+            await session.commit()
+            connection.bump_generation()
+
+    @staticmethod
+    async def raise_not_owned(connection: AsyncLocalConnection, idpost: int) -> NoReturn:
+        async with connection.Session() as session:
+            exists = await session.scalar(select(PostEntity.idpost).where(PostEntity.idpost == idpost))
+
+        if exists is None:
+            raise RegisterNotFound('post')
+
+        raise NotRegisterOwner('post')
@@ -0,0 +1,88 @@
+from typing import Dict
+
+from sqlalchemy import select
+from sqlalchemy import update
+
+from app.database.connections import AsyncLocalConnection
+from app.database.entities import UserEntity
+from app.database.exceptions import AlreadyRegistered
+from app.database.exceptions import MissingRequiredField
+from app.database.exceptions import RegisterNotFound
+
+
+class AsyncUserRepository:
+    @staticmethod
+    async def check_insert_one(connection: AsyncLocalConnection, username: str, password: str) -> None:
+        if not len(username):
+            raise MissingRequiredField('username')
+
+        elif not len(password):
+            raise MissingRequiredField('password')
+
+        try:
+            await AsyncUserRepository.select_one(connection, username=username)
+            raise AlreadyRegistered(username)
+
+        except RegisterNotFound:
+            pass
+
+    @staticmethod
+    async def insert_one(connection: AsyncLocalConnection, username: str, password: str) -> Dict:
+        await AsyncUserRepository.check_insert_one(connection, username, password)
+
+        async with connection.Session() as session:
+            user = UserEntity(username=username, password=password)
+            session.add(user)
+            await session.commit()
+            connection.mark_written()
+            connection.user_cache.invalidate(user.iduser)
+
+            return {'iduser': user.iduser, 'username': user.username, 'password': user.password, 'posts': []}
+
+    @staticmethod
+    async def select_one(connection: AsyncLocalConnection, **kwargs) -> Dict:
+        statement = (
+            select(UserEntity.iduser, UserEntity.username, UserEntity.password).filter_by(**kwargs).limit(1)
+        )
+
+        async with connection.ReadSession() as session:
+            register = (await session.execute(statement)).mappings().first()
+            if register is not None:
+                return dict(register)
+
+        raise RegisterNotFound('user')
+
+    @staticmethod
+    async def update_password(connection: AsyncLocalConnection, iduser: int, password: str) -> None:
+        if not len(password):
+            raise MissingRequiredField('password')
+
+        async with connection.Session() as session:
+            result = await session.execute(
+                update(UserEntity).where(UserEntity.iduser == iduser).values(password=password)
+            )
+            await session.commit()
+            connection.mark_written()
+            connection.user_cache.invalidate(iduser)
+
+            if result.rowcount == 0:
+                raise RegisterNotFound('user')
+
+    @staticmethod
+    async def select_shallow(connection: AsyncLocalConnection, iduser: int) -> Dict:
+        statement = select(UserEntity.iduser, UserEntity.username).where(UserEntity.iduser == iduser)
+        async with connection.ReadSession() as session:
+            register = (await session.execute(statement)).mappings().first()
+            if register is not None:
+                return dict(register)
+
+        raise RegisterNotFound('user')
+
+    @staticmethod
+    async def select_current(connection: AsyncLocalConnection, iduser: int) -> Dict:
+        user = connection.user_cache.get(iduser)
+        if user is None:
+            user = await AsyncUserRepository.select_shallow(connection, iduser)
+            connection.user_cache.set(iduser, user)
+
+        return user
@@ -0,0 +1,38 @@
+import itertools
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+ErrorHandler = Callable[[int, str], None]
+
+
+def chunked(registers: Iterable[Any], size: int) -> Iterator[List[Tuple[int, Any]]]:
+    iterator = enumerate(registers)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not len(chunk):
+            return
+
+        yield chunk
+
+
+class BatchReport:
+    def __init__(self, on_error: Optional[ErrorHandler] = None) -> None:
+        self.inserted = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.on_error = on_error
+
+    def fail(self, index: int, error: Exception) -> None:
+        if self.on_error is not None:
+            self.on_error(index, str(error))
+        else:
+            self.errors.append((index, str(error)))
+
+    def asdict(self) -> Dict:
+        return {'inserted': self.inserted, 'errors': self.errors}
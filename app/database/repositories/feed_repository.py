@@ -0,0 +1,80 @@
+import itertools
+from datetime import datetime
+from typing import Dict
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.sql import Select
+
+from app.database.connections import Connection
+from app.database.entities import FEED_REBUILD_STATEMENTS
+from app.database.entities import FeedEntity
+from app.database.repositories import ShardRepository
+from app.database.repositories.pagination import keyset_page
+from app.database.repositories.pagination import merge_page
+from app.database.repositories.pagination import page
+from app.database.rows import PostRow
+
+
+class FeedRepository:
+    @staticmethod
+    def projection() -> Select:
+        return select(
+            FeedEntity.idpost,
+            FeedEntity.title,
+            FeedEntity.excerpt.label('body'),
+            FeedEntity.created,
+            FeedEntity.id_user,
+            FeedEntity.username,
+        )
+
+    @staticmethod
+    def page_statement(
+        after_created: Optional[datetime] = None,
+        after_idpost: Optional[int] = None,
+        limit: int = 20,
+        backwards: bool = False,
+    ) -> Select:
+        return keyset_page(
+            FeedRepository.projection(),
+            FeedEntity.created,
+            FeedEntity.idpost,
+            after_created,
+            after_idpost,
+            limit,
+            backwards,
+        )
+
+    @staticmethod
+    def select_page(
+        connection: Connection,
+        after_created: Optional[datetime] = None,
+        after_idpost: Optional[int] = None,
+        limit: int = 20,
+        backwards: bool = False,
+    ) -> Dict:
+        statement = FeedRepository.page_statement(after_created, after_idpost, limit, backwards)
+        if len(connection.shard_set):
+            return merge_page(ShardRepository.scatter(connection, statement), limit, backwards)
+
+        with connection.ReadSession() as session:
+            registers = list(itertools.starmap(PostRow, session.execute(statement)))
+
+        return page(registers, limit, backwards)
+
+    @staticmethod
+    def rebuild(connection: Connection) -> int:
+        count = 0
+        for factory in [connection.Session] + [shard.Session for shard in connection.shard_set]:
+            with factory() as session:
+                for statement in FEED_REBUILD_STATEMENTS:
+                    session.execute(text(statement))
+
+                count += session.scalar(select(func.count()).select_from(FeedEntity)) or 0
+                session.commit()
+
+        connection.bump_generation()
+
+        return count
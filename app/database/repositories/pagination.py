@@ -0,0 +1,70 @@
+import heapq
+import itertools
+from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from sqlalchemy import and_
+from sqlalchemy import or_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+
+
+def keyset_page(
+    statement: Select,
+    created: InstrumentedAttribute,
+    idpost: InstrumentedAttribute,
+    after_created: Optional[datetime] = None,
+    after_idpost: Optional[int] = None,
+    limit: int = 20,
+    backwards: bool = False,
+) -> Select:
+    if after_created is not None and after_idpost is not None:
+        if backwards:
+            statement = statement.where(
+                or_(created > after_created, and_(created == after_created, idpost > after_idpost))
+            )
+        else:
+            statement = statement.where(
+                or_(created < after_created, and_(created == after_created, idpost < after_idpost))
+            )
+
+    if backwards:
+        statement = statement.order_by(created.asc(), idpost.asc())
+    else:
+        statement = statement.order_by(created.desc(), idpost.desc())
+
+    return statement.limit(limit + 1)
+
+
+def page(registers: List[Any], limit: int, backwards: bool) -> Dict:
+    has_more = len(registers) > limit
+    registers = registers[:limit]
+    if backwards:
+        registers.reverse()
+
+    return {'posts': registers, 'has_more': has_more}
+
+
+def keyset_key(register: Any) -> Any:
+    return register['created'], register['idpost']
+
+
+def merge(
+    results: Iterable[Iterable[Any]], key: Callable[[Any], Any] = keyset_key, reverse: bool = False
+) -> Iterator[Any]:
+    previous = None
+    for register in heapq.merge(*results, key=key, reverse=reverse):
+        if previous is None or register['idpost'] != previous:
+            previous = register['idpost']
+            yield register
+
+
+def merge_page(results: Iterable[List[Any]], limit: int, backwards: bool) -> Dict:
+    registers = list(itertools.islice(merge(results, reverse=not backwards), limit + 1))
+    return page(registers, limit, backwards)
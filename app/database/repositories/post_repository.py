@@ -1,17 +1,88 @@
+import itertools
+import re
+from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import ContextManager
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Mapping
+from typing import NoReturn
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
 
-from app.database.connections import LocalConnection
+from sqlalchemy import DateTime
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import lazyload
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import ReturningDelete
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import TextualSelect
+from sqlalchemy.sql import Update
+
+from app.database.connections import Connection
+from app.database.connections import Shard
+from app.database.entities import POST_SEARCH_REBUILD_STATEMENT
 from app.database.entities import PostEntity
 from app.database.entities import UserEntity
+from app.database.exceptions import InvalidOption
+from app.database.exceptions import InvalidRegister
 from app.database.exceptions import MissingRequiredField
+from app.database.exceptions import NotRegisterOwner
 from app.database.exceptions import RegisterNotFound
+from app.database.repositories import ShardRepository
 from app.database.repositories import UserRepository
+from app.database.rows import PostRow
+from app.database.rows import SearchRow
+from app.database.repositories.batches import BatchReport
+from app.database.repositories.batches import chunked
+from app.database.repositories.batches import ErrorHandler
+from app.database.repositories.pagination import keyset_page
+from app.database.repositories.pagination import merge
+from app.database.repositories.pagination import merge_page
+from app.database.repositories.pagination import page
+
+
+SEARCH_STATEMENT = '''
+    SELECT post.idpost, post.title, post.body, post.created, post.id_user, user.username,
+           snippet(post_fts, -1, :highlight_start, :highlight_end, '…', :snippet_tokens) AS snippet,
+           bm25(post_fts) AS rank
+    FROM post_fts
+    JOIN post ON post.idpost = post_fts.rowid
+    JOIN user ON user.iduser = post.id_user
+    WHERE post_fts MATCH :match {cursor}
+    ORDER BY rank, post.idpost
+    LIMIT :limit
+'''
+
+SEARCH_CURSOR = 'AND (bm25(post_fts) > :rank OR (bm25(post_fts) = :rank AND post.idpost > :idpost))'
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+LOADER_STRATEGIES: Dict[str, Callable[..., Any]] = {
+    'joined': joinedload,
+    'selectin': selectinload,
+    'lazy': lazyload,
+}
+
+
+def search_key(register: SearchRow) -> Tuple[float, int]:
+    return register['rank'], register['idpost']
 
 
 class PostRepository:
     @staticmethod
-    def check_insert_one(connection: LocalConnection, title: str, body: str, id_user: int) -> None:
+    def check_insert_one(connection: Connection, title: str, body: str, id_user: int) -> None:
         if not len(title):
             raise MissingRequiredField('title')
 
@@ -19,12 +90,12 @@ class PostRepository:
             raise MissingRequiredField('body')
 
         try:
-            UserRepository.select_one(connection, iduser=id_user)
+            UserRepository.select_current(connection, id_user)
         except RegisterNotFound as error:
             raise error
 
     @staticmethod
-    def check_update_one(connection: LocalConnection, title: str, body: str, id_user: int) -> None:
+    def check_update_one(connection: Connection, title: str, body: str, id_user: int) -> None:
         if not len(title):
             raise MissingRequiredField('title')
 
@@ -32,64 +103,492 @@ class PostRepository:
             raise MissingRequiredField('body')
 
         try:
-            user = UserRepository.select_one(connection, iduser=id_user)
+            user = UserRepository.select_current(connection, id_user)
         except RegisterNotFound as error:
             raise error
 
     @staticmethod
-    def insert_one(connection: LocalConnection, title: str, body: str, id_user: int) -> Dict:
-        PostRepository.check_insert_one(connection, title, body, id_user)
+    def write(connection: Connection, operation: Callable[[Session], Any], shard: Optional[Shard] = None) -> Any:
+        if shard is not None:
+            with shard.Session() as session:
+                result = operation(session)
+                session.commit()
+
+            connection.bump_generation()
+            return result
+
+        elif connection.writer is not None:
+            result = connection.writer.execute(operation)
+            connection.mark_written()
+            return result
 
         with connection.Session() as session:
-            user = session.query(UserEntity).filter(UserEntity.iduser == id_user).one()
+            result = operation(session)
+            session.commit()
+            connection.bump_generation()
+
+        return result
+
+    @staticmethod
+    def insert_one(connection: Connection, title: str, body: str, id_user: int) -> Dict:
+        PostRepository.check_insert_one(connection, title, body, id_user)
+        if len(connection.shard_set):
+            return PostRepository.insert_one_sharded(connection, title, body, id_user)
+
+        def insert(session: Session) -> Dict:
+            user = session.get_one(UserEntity, id_user)
             post = PostEntity(title=title, body=body, user=user)
             session.add(post)
-            session.commit()
+            session.flush()
 
             return post.asdict()
 
+        return PostRepository.write(connection, insert)
+
     @staticmethod
-    def select_one(connection: LocalConnection, **kwargs) -> Dict:
-        with connection.Session() as session:
-            registers = session.query(PostEntity).filter_by(**kwargs).all()
-            if len(registers):
-                post = registers[0].asdict()
-                return post
+    def insert_one_sharded(connection: Connection, title: str, body: str, id_user: int) -> Dict:
+        user = UserRepository.select_current(connection, id_user)
+        shard = ShardRepository.locate(connection, id_user)
+        idpost = ShardRepository.allocate(connection)[0]
+        post = {'idpost': idpost, 'title': title, 'body': body, 'created': datetime.now(), 'id_user': id_user}
+
+        def insert_post(session: Session) -> Dict:
+            ShardRepository.mirror_user(session, id_user, user['username'])
+            session.execute(insert(PostEntity).values(**post))
+
+            return {**post, 'username': user['username']}
+
+        return PostRepository.write(connection, insert_post, shard)
+
+    @staticmethod
+    def select_one(connection: Connection, **kwargs) -> Dict:
+        if len(connection.shard_set):
+            for shard in connection.shard_set:
+                with shard.Session() as session:
+                    post = PostRepository.select_one_from(session, **kwargs)
+
+                if post is not None:
+                    return post
+
+            raise RegisterNotFound('post')
+
+        with connection.ReadSession() as session:
+            post = PostRepository.select_one_from(session, **kwargs)
+
+        if post is not None:
+            return post
 
         raise RegisterNotFound('post')
 
     @staticmethod
-    def select_all(connection: LocalConnection) -> List[Dict]:
+    def select_one_from(session: Session, **kwargs) -> Optional[Dict]:
+        if list(kwargs) == ['idpost']:
+            register = session.get(PostEntity, kwargs['idpost'])
+            registers = [register] if register is not None else []
+        else:
+            registers = session.query(PostEntity).filter_by(**kwargs).all()
+
+        return registers[0].asdict() if len(registers) else None
+
+    @staticmethod
+    def select_all(connection: Connection, strategy: str = 'projection') -> Sequence[Mapping]:
+        if strategy == 'projection':
+            return PostRepository.select_all_projection(connection)
+
+        elif strategy not in LOADER_STRATEGIES:
+            raise InvalidOption('loader strategy', strategy)
+
+        elif len(connection.shard_set):
+            loader = LOADER_STRATEGIES[strategy](PostEntity.user)
+
+            def select_shard(shard: Shard) -> List[Dict]:
+                with shard.Session() as session:
+                    query = session.query(PostEntity).options(loader)
+                    query = query.order_by(PostEntity.created.desc(), PostEntity.idpost.desc())
+                    return [post.asdict() for post in query.all()]
+
+            return list(merge(connection.shard_set.scatter(select_shard), reverse=True))
+
         registers: List[Dict] = []
-        with connection.Session() as session:
-            for post in session.query(PostEntity).all():
+        with connection.ReadSession() as session:
+            loader = LOADER_STRATEGIES[strategy](PostEntity.user)
+            query = session.query(PostEntity).options(loader)
+            for post in query.order_by(PostEntity.created.desc(), PostEntity.idpost.desc()).all():
                 registers.append(post.asdict())
 
         return registers
 
     @staticmethod
-    def update_one(connection: LocalConnection, idpost: int, **kwargs) -> Dict:
+    def projection() -> Select:
+        return select(
+            PostEntity.idpost,
+            PostEntity.title,
+            PostEntity.body,
+            PostEntity.created,
+            PostEntity.id_user,
+            UserEntity.username,
+        ).join(PostEntity.user)
+
+    @staticmethod
+    def select_all_projection(connection: Connection) -> List[PostRow]:
+        statement = PostRepository.projection().order_by(PostEntity.created.desc(), PostEntity.idpost.desc())
+        if len(connection.shard_set):
+            return list(merge(ShardRepository.scatter(connection, statement), reverse=True))
+
+        with connection.ReadSession() as session:
+            return list(itertools.starmap(PostRow, session.execute(statement)))
+
+    @staticmethod
+    def iterate(connection: Connection, since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[PostRow]:
+        statement = PostRepository.projection().order_by(PostEntity.created.asc(), PostEntity.idpost.asc())
+        if since is not None:
+            statement = statement.where(PostEntity.created > since)
+
+        if len(connection.shard_set):
+            shards = [PostRepository.iterate_session(shard.Session, statement, batch_size) for shard in connection.shard_set]
+            yield from merge(shards)
+            return
+
+        yield from PostRepository.iterate_session(connection.ReadSession, statement, batch_size)
+
+    @staticmethod
+    def iterate_session(
+        ReadSession: Callable[[], ContextManager[Session]], statement: Select, batch_size: int
+    ) -> Iterator[PostRow]:
+        with ReadSession() as session:
+            result = session.execute(statement, execution_options={'yield_per': batch_size})
+            for partition in result.partitions():
+                yield from itertools.starmap(PostRow, partition)
+
+    @staticmethod
+    def page_statement(
+        after_created: Optional[datetime] = None,
+        after_idpost: Optional[int] = None,
+        limit: int = 20,
+        backwards: bool = False,
+    ) -> Select:
+        return keyset_page(
+            PostRepository.projection(),
+            PostEntity.created,
+            PostEntity.idpost,
+            after_created,
+            after_idpost,
+            limit,
+            backwards,
+        )
+
+    @staticmethod
+    def select_page(
+        connection: Connection,
+        after_created: Optional[datetime] = None,
+        after_idpost: Optional[int] = None,
+        limit: int = 20,
+        backwards: bool = False,
+    ) -> Dict:
+        statement = PostRepository.page_statement(after_created, after_idpost, limit, backwards)
+        if len(connection.shard_set):
+            return merge_page(ShardRepository.scatter(connection, statement), limit, backwards)
+
+        with connection.ReadSession() as session:
+            registers = list(itertools.starmap(PostRow, session.execute(statement)))
+
+        return page(registers, limit, backwards)
+
+    @staticmethod
+    def update_one(connection: Connection, idpost: int, **kwargs) -> Dict:
         post = PostRepository.select_one(connection, idpost=idpost)
         title = kwargs.get('title', post['title'])
         body = kwargs.get('body', post['body'])
         id_user = kwargs.get('id_user', post['id_user'])
         PostRepository.check_update_one(connection, title, body, id_user)
+        if len(connection.shard_set):
+            return PostRepository.update_one_sharded(connection, post, title, body, id_user)
 
         with connection.Session() as session:
-            register = session.query(PostEntity).filter(PostEntity.idpost == idpost).one()
-            user = session.query(UserEntity).filter(UserEntity.iduser == id_user).one()
+            register = session.get_one(PostEntity, idpost)
+            user = session.get_one(UserEntity, id_user)
             register.title = title
             register.body = body
             register.user = user
             session.commit()
+            connection.bump_generation()
 
             return register.asdict()
 
     @staticmethod
-    def delete_one(connection: LocalConnection, idpost: int) -> None:
+    def update_one_sharded(connection: Connection, post: Dict, title: str, body: str, id_user: int) -> Dict:
+        user = UserRepository.select_current(connection, id_user)
+        source = ShardRepository.locate_post(connection, post['idpost'])
+        target = ShardRepository.locate(connection, id_user)
+        values = {'title': title, 'body': body, 'id_user': id_user}
+
+        def update_post(session: Session) -> None:
+            ShardRepository.mirror_user(session, id_user, user['username'])
+            if source is target:
+                session.execute(update(PostEntity).where(PostEntity.idpost == post['idpost']).values(**values))
+            else:
+                session.execute(insert(PostEntity).values(idpost=post['idpost'], created=post['created'], **values))
+
+        PostRepository.write(connection, update_post, target)
+        if source is not target:
+            ShardRepository.delete_posts(source.Session, {post['idpost']})
+
+        return {**post, **values, 'username': user['username']}
+
+    @staticmethod
+    def delete_one(connection: Connection, idpost: int) -> None:
+        if len(connection.shard_set):
+            statement = delete(PostEntity).where(PostEntity.idpost == idpost).returning(PostEntity.idpost)
+            for shard in connection.shard_set:
+                if PostRepository.write(connection, lambda session: session.scalar(statement), shard) is not None:
+                    return
+
+            return
+
         with connection.Session() as session:
             registers = session.query(PostEntity).filter(PostEntity.idpost == idpost).all()
             if len(registers):
                 post = registers[0]
                 session.delete(post)
                 session.commit()
+                connection.bump_generation()
+
+    @staticmethod
+    def check_fields(title: str, body: str) -> None:
+        if not len(title):
+            raise MissingRequiredField('title')
+
+        elif not len(body):
+            raise MissingRequiredField('body')
+
+    @staticmethod
+    def update_owned_statement(idpost: int, id_user: int, title: str, body: str) -> Update:
+        return (
+            update(PostEntity)
+            .where(PostEntity.idpost == idpost, PostEntity.id_user == id_user)
+            .values(title=title, body=body)
+            .returning(PostEntity.idpost, PostEntity.title, PostEntity.body, PostEntity.created, PostEntity.id_user)
+        )
+
+    @staticmethod
+    def delete_owned_statement(idpost: int, id_user: int) -> ReturningDelete[Tuple[int]]:
+        return (
+            delete(PostEntity)
+            .where(PostEntity.idpost == idpost, PostEntity.id_user == id_user)
+            .returning(PostEntity.idpost)
+        )
+
+    @staticmethod
+    def update_owned(connection: Connection, idpost: int, id_user: int, title: str, body: str) -> Dict:
+        PostRepository.check_fields(title, body)
+        statement = PostRepository.update_owned_statement(idpost, id_user, title, body)
+
+        def update(session: Session) -> Dict:
+            register = session.execute(statement).mappings().first()
+            if register is None:
+                raise RegisterNotFound('post')
+
+            return dict(register)
+
+        shard = ShardRepository.locate(connection, id_user) if len(connection.shard_set) else None
+        try:
+            return PostRepository.write(connection, update, shard)
+        except RegisterNotFound:
+            PostRepository.raise_not_owned(connection, idpost)
+            raise
+
+    @staticmethod
+    def delete_owned(connection: Connection, idpost: int, id_user: int) -> None:
+        statement = PostRepository.delete_owned_statement(idpost, id_user)
+        if len(connection.shard_set):
+            shard = ShardRepository.locate(connection, id_user)
+            if PostRepository.write(connection, lambda session: session.scalar(statement), shard) is None:
+                PostRepository.raise_not_owned(connection, idpost)
+
+            return
+
+        with connection.Session() as session:
+            deleted = session.execute(statement).scalar()
+            if deleted is None:
+                session.rollback()
+                PostRepository.raise_not_owned(connection, idpost)
+
+            session.commit()
+            connection.bump_generation()
+
+    @staticmethod
+    def raise_not_owned(connection: Connection, idpost: int) -> NoReturn:
+        if len(connection.shard_set):
+            ShardRepository.locate_post(connection, idpost)
+        else:
+            with connection.Session() as session:
+                exists = session.scalar(select(PostEntity.idpost).where(PostEntity.idpost == idpost))
+
+            if exists is None:
+                raise RegisterNotFound('post')
+
+        raise NotRegisterOwner('post')
+
+    @staticmethod
+    def insert_many(
+        connection: Connection,
+        registers: Iterable[Any],
+        chunk_size: int = 1000,
+        on_error: Optional[ErrorHandler] = None,
+    ) -> Dict:
+        report = BatchReport(on_error)
+        for chunk in chunked(registers, chunk_size):
+            PostRepository.insert_chunk(connection, chunk, report)
+
+        return report.asdict()
+
+    @staticmethod
+    def insert_chunk(connection: Connection, chunk: List[Tuple[int, Any]], report: BatchReport) -> None:
+        valid: List[Tuple[int, Dict]] = []
+        for index, register in chunk:
+            try:
+                if not isinstance(register, dict):
+                    raise InvalidRegister('post')
+
+                title = register.get('title', '')
+                body = register.get('body', '')
+                if not isinstance(title, str) or not isinstance(body, str):
+                    raise InvalidRegister('post')
+
+                elif not len(title):
+                    raise MissingRequiredField('title')
+
+                elif not len(body):
+                    raise MissingRequiredField('body')
+
+                elif 'id_user' not in register:
+                    raise MissingRequiredField('id_user')
+
+                created = register.get('created', None)
+                if created is None:
+                    created = datetime.now()
+
+                elif isinstance(created, str):
+                    created = datetime.fromisoformat(created)
+
+                elif not isinstance(created, datetime):
+                    raise InvalidRegister('post')
+
+                id_user = int(register['id_user'])
+                valid.append((index, {'title': title, 'body': body, 'id_user': id_user, 'created': created}))
+
+            except (InvalidRegister, MissingRequiredField) as error:
+                report.fail(index, error)
+
+            except (TypeError, ValueError):
+                report.fail(index, InvalidRegister('post'))
+
+        if len(connection.shard_set):
+            PostRepository.insert_chunk_sharded(connection, valid, report)
+            return
+
+        with connection.Session() as session:
+            statement = select(UserEntity.iduser).where(UserEntity.iduser.in_({row['id_user'] for _, row in valid}))
+            users = set(session.scalars(statement).all())
+
+            rows = []
+            for index, row in valid:
+                if row['id_user'] in users:
+                    rows.append(row)
+                else:
+                    report.fail(index, RegisterNotFound('user'))
+
+            if len(rows):
+                session.execute(insert(PostEntity), rows)
+                session.commit()
+                report.inserted += len(rows)
+                connection.bump_generation()
+
+    @staticmethod
+    def insert_chunk_sharded(connection: Connection, valid: List[Tuple[int, Dict]], report: BatchReport) -> None:
+        with connection.Session() as session:
+            statement = select(UserEntity.iduser, UserEntity.username).where(
+                UserEntity.iduser.in_({row['id_user'] for _, row in valid})
+            )
+            users = dict(session.execute(statement).tuples().all())
+
+        rows: Dict[int, List[Dict]] = {}
+        shards = ShardRepository.locate_many(connection, users)
+        for index, row in valid:
+            if row['id_user'] in users:
+                rows.setdefault(shards[row['id_user']].index, []).append(row)
+            else:
+                report.fail(index, RegisterNotFound('user'))
+
+        if not len(rows):
+            return
+
+        idposts = iter(ShardRepository.allocate(connection, sum(len(shard_rows) for shard_rows in rows.values())))
+        for index, shard_rows in rows.items():
+            shard = connection.shard_set[index]
+            shard_rows = [{**row, 'idpost': next(idposts)} for row in shard_rows]
+
+            def insert_rows(session: Session) -> None:
+                for id_user in {row['id_user'] for row in shard_rows}:
+                    ShardRepository.mirror_user(session, id_user, users[id_user])
+
+                session.execute(insert(PostEntity), shard_rows)
+
+            PostRepository.write(connection, insert_rows, shard)
+            report.inserted += len(shard_rows)
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        return ' '.join(f'"{term}"' for term in re.findall(r'\w+', query))
+
+    @staticmethod
+    def search_statement(
+        query: str,
+        limit: int = 20,
+        cursor: Optional[Tuple[float, int]] = None,
+        snippet_tokens: int = 24,
+    ) -> Optional[Tuple[TextualSelect, Dict[str, Any]]]:
+        match = PostRepository.match_expression(query)
+        if not len(match):
+            return None
+
+        parameters: Dict[str, Any] = {
+            'match': match,
+            'limit': limit + 1,
+            'highlight_start': HIGHLIGHT_START,
+            'highlight_end': HIGHLIGHT_END,
+            'snippet_tokens': snippet_tokens,
+        }
+        if cursor is not None:
+            parameters['rank'], parameters['idpost'] = cursor
+
+        statement = text(SEARCH_STATEMENT.format(cursor=SEARCH_CURSOR if cursor is not None else ''))
+        return statement.columns(created=DateTime()), parameters
+
+    @staticmethod
+    def search(
+        connection: Connection,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[Tuple[float, int]] = None,
+        snippet_tokens: int = 24,
+    ) -> Dict:
+        search = PostRepository.search_statement(query, limit, cursor, snippet_tokens)
+        if search is None:
+            return {'posts': [], 'has_more': False}
+
+        if len(connection.shard_set):
+            results = ShardRepository.scatter(connection, *search, row=SearchRow)
+            registers = list(itertools.islice(merge(results, key=search_key), limit + 1))
+        else:
+            with connection.ReadSession() as session:
+                registers = list(itertools.starmap(SearchRow, session.execute(*search)))
+
+        return {'posts': registers[:limit], 'has_more': len(registers) > limit}
+
+    @staticmethod
+    def rebuild_search_index(connection: Connection) -> None:
+        for factory in [connection.Session] + [shard.Session for shard in connection.shard_set]:
+            with factory() as session:
+                session.execute(text(POST_SEARCH_REBUILD_STATEMENT))
+                session.commit()
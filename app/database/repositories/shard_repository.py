@@ -0,0 +1,271 @@
+import itertools
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Type
+
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+
+from app.database.connections import Connection
+from app.database.connections import Shard
+from app.database.entities import PostEntity
+from app.database.entities import PostSequenceEntity
+from app.database.entities import UserEntity
+from app.database.entities import UserShardEntity
+from app.database.exceptions import InvalidOption
+from app.database.exceptions import RegisterNotFound
+from app.database.repositories import UserRepository
+from app.database.rows import PostRow
+
+
+MIRRORED_PASSWORD = 'mirrored'
+
+POST_SEQUENCE = 'post'
+
+Move = Tuple[int, int, int]
+
+
+class ShardRepository:
+    @staticmethod
+    def locate(connection: Connection, id_user: int) -> Shard:
+        with connection.Session() as session:
+            index = session.scalar(select(UserShardEntity.shard).where(UserShardEntity.id_user == id_user))
+
+        return connection.shard_set.hashed(id_user) if index is None else connection.shard_set[index]
+
+    @staticmethod
+    def locate_many(connection: Connection, id_users: Iterable[int]) -> Dict[int, Shard]:
+        id_users = set(id_users)
+        with connection.Session() as session:
+            statement = select(UserShardEntity.id_user, UserShardEntity.shard).where(
+                UserShardEntity.id_user.in_(id_users)
+            )
+            directory = dict(session.execute(statement).tuples().all())
+
+        return {
+            id_user: connection.shard_set[directory[id_user]]
+            if id_user in directory
+            else connection.shard_set.hashed(id_user)
+            for id_user in id_users
+        }
+
+    @staticmethod
+    def locate_post(connection: Connection, idpost: int) -> Shard:
+        for shard in connection.shard_set:
+            with shard.Session() as session:
+                if session.scalar(select(PostEntity.idpost).where(PostEntity.idpost == idpost)) is not None:
+                    return shard
+
+        raise RegisterNotFound('post')
+
+    @staticmethod
+    def scatter(
+        connection: Connection,
+        statement: Executable,
+        parameters: Optional[Dict[str, Any]] = None,
+        row: Type = PostRow,
+    ) -> List[List[Any]]:
+        def select_shard(shard: Shard) -> List[Any]:
+            with shard.Session() as session:
+                return list(itertools.starmap(row, session.execute(statement, parameters)))
+
+        return connection.shard_set.scatter(select_shard)
+
+    @staticmethod
+    def mirror_user(session: Session, iduser: int, username: str) -> None:
+        statement = sqlite_insert(UserEntity).values(iduser=iduser, username=username, password=MIRRORED_PASSWORD)
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[UserEntity.iduser], set_={'username': statement.excluded.username}
+            )
+        )
+
+    @staticmethod
+    def latest_idpost(connection: Connection, session: Session) -> int:
+        statement = select(func.coalesce(func.max(PostEntity.idpost), 0))
+
+        def latest(shard: Shard) -> int:
+            with shard.Session() as shard_session:
+                return shard_session.scalar(statement) or 0
+
+        return max([session.scalar(statement) or 0] + connection.shard_set.scatter(latest))
+
+    @staticmethod
+    def allocate(connection: Connection, count: int = 1) -> range:
+        statement = (
+            update(PostSequenceEntity)
+            .where(PostSequenceEntity.name == POST_SEQUENCE)
+            .values(value=PostSequenceEntity.value + count)
+            .returning(PostSequenceEntity.value)
+        )
+        with Session(connection.engine) as session:
+            value = session.scalar(statement)
+            if value is None:
+                seed = sqlite_insert(PostSequenceEntity).values(
+                    name=POST_SEQUENCE, value=ShardRepository.latest_idpost(connection, session) + count
+                )
+                value = session.execute(
+                    seed.on_conflict_do_update(
+                        index_elements=[PostSequenceEntity.name], set_={'value': PostSequenceEntity.value + count}
+                    ).returning(PostSequenceEntity.value)
+                ).scalar_one()
+
+            session.commit()
+
+        return range(value - count + 1, value + 1)
+
+    @staticmethod
+    def copy_posts(
+        source: Callable[[], ContextManager[Session]],
+        target: Shard,
+        user: Dict,
+        exclude: Set[int],
+    ) -> Set[int]:
+        statement = select(
+            PostEntity.idpost, PostEntity.title, PostEntity.body, PostEntity.created, PostEntity.id_user
+        ).where(PostEntity.id_user == user['iduser'])
+        with source() as session:
+            rows = [dict(row) for row in session.execute(statement).mappings() if row['idpost'] not in exclude]
+
+        if len(rows):
+            with target.Session() as session:
+                ShardRepository.mirror_user(session, user['iduser'], user['username'])
+                session.execute(insert(PostEntity), rows)
+                session.commit()
+
+        return {row['idpost'] for row in rows}
+
+    @staticmethod
+    def delete_posts(source: Callable[[], ContextManager[Session]], idposts: Set[int]) -> None:
+        with source() as session:
+            session.execute(delete(PostEntity).where(PostEntity.idpost.in_(idposts)))
+            session.commit()
+
+    @staticmethod
+    def assign(connection: Connection, id_user: int, shard: Shard) -> None:
+        statement = sqlite_insert(UserShardEntity).values(id_user=id_user, shard=shard.index)
+        with connection.Session() as session:
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[UserShardEntity.id_user], set_={'shard': statement.excluded.shard}
+                )
+            )
+            session.commit()
+
+    @staticmethod
+    def move_user(connection: Connection, id_user: int, target: int) -> int:
+        if not 0 <= target < len(connection.shard_set):
+            raise InvalidOption('shard', str(target))
+
+        user = UserRepository.select_shallow(connection, id_user)
+        source = ShardRepository.locate(connection, id_user)
+        destination = connection.shard_set[target]
+        if source is destination:
+            return 0
+
+        moved = ShardRepository.copy_posts(source.Session, destination, user, set())
+        ShardRepository.assign(connection, id_user, destination)
+        moved |= ShardRepository.copy_posts(source.Session, destination, user, moved)
+        ShardRepository.delete_posts(source.Session, moved)
+        connection.bump_generation()
+
+        return len(moved)
+
+    @staticmethod
+    def distribute(connection: Connection) -> int:
+        with connection.Session() as session:
+            statement = (
+                select(UserEntity.iduser, UserEntity.username)
+                .where(UserEntity.iduser.in_(select(PostEntity.id_user).distinct()))
+                .order_by(UserEntity.iduser)
+            )
+            users = [dict(user) for user in session.execute(statement).mappings()]
+
+        moved = 0
+        for user in users:
+            shard = ShardRepository.locate(connection, user['iduser'])
+            idposts = ShardRepository.copy_posts(connection.Session, shard, user, set())
+            ShardRepository.delete_posts(connection.Session, idposts)
+            moved += len(idposts)
+
+        if moved:
+            connection.bump_generation()
+
+        return moved
+
+    @staticmethod
+    def user_counts(connection: Connection) -> Dict[int, Dict[int, int]]:
+        statement = select(PostEntity.id_user, func.count()).group_by(PostEntity.id_user)
+
+        def count(shard: Shard) -> Dict[int, int]:
+            with shard.Session() as session:
+                return dict(session.execute(statement).tuples().all())
+
+        return dict(enumerate(connection.shard_set.scatter(count)))
+
+    @staticmethod
+    def status(connection: Connection) -> List[Dict]:
+        return [
+            {
+                'shard': index,
+                'url': connection.shard_set[index].url,
+                'users': len(users),
+                'posts': sum(users.values()),
+            }
+            for index, users in ShardRepository.user_counts(connection).items()
+        ]
+
+    @staticmethod
+    def plan_rebalance(counts: Dict[int, Dict[int, int]], tolerance: float = 0.1) -> List[Move]:
+        loads = {shard: sum(users.values()) for shard, users in counts.items()}
+        placement = {id_user: shard for shard, users in counts.items() for id_user in users}
+        posts = {id_user: count for users in counts.values() for id_user, count in users.items()}
+        current = dict(placement)
+        mean = sum(loads.values()) / max(1, len(loads))
+
+        while len(loads) > 1:
+            heavy = max(loads, key=lambda shard: loads[shard])
+            light = min(loads, key=lambda shard: loads[shard])
+            gap = loads[heavy] - loads[light]
+            if gap <= tolerance * mean:
+                break
+
+            candidates = [
+                (abs(gap - 2 * count), id_user)
+                for id_user, count in posts.items()
+                if current[id_user] == heavy and 0 < count < gap
+            ]
+            if not len(candidates):
+                break
+
+            _, id_user = min(candidates)
+            current[id_user] = light
+            loads[heavy] -= posts[id_user]
+            loads[light] += posts[id_user]
+
+        return [
+            (id_user, placement[id_user], shard)
+            for id_user, shard in sorted(current.items())
+            if shard != placement[id_user]
+        ]
+
+    @staticmethod
+    def rebalance(connection: Connection, tolerance: float = 0.1) -> List[Move]:
+        moves = ShardRepository.plan_rebalance(ShardRepository.user_counts(connection), tolerance)
+        for id_user, _, target in moves:
+            ShardRepository.move_user(connection, id_user, target)
+
+        return moves
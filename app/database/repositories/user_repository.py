@@ -1,16 +1,29 @@
+from typing import Any
 from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
 
-from app.database.connections import LocalConnection
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.database.connections import Connection
 from app.database.entities import UserEntity
 from app.database.exceptions import AlreadyRegistered
+from app.database.exceptions import InvalidRegister
 from app.database.exceptions import MissingRequiredField
 from app.database.exceptions import RegisterNotFound
+from app.database.repositories.batches import BatchReport
+from app.database.repositories.batches import chunked
+from app.database.repositories.batches import ErrorHandler
 
 
 class UserRepository:
     @staticmethod
-    def check_insert_one(conneciton: LocalConnection, username: str, password: str) -> None:
+    def check_insert_one(conneciton: Connection, username: str, password: str) -> None:
         if not len(username):
             raise MissingRequiredField('username')
 
@@ -25,22 +38,135 @@ class UserRepository:
             pass
 
     @staticmethod
-    def insert_one(connection: LocalConnection, username: str, password: str) -> Dict:
+    def insert_one(connection: Connection, username: str, password: str) -> Dict:
         UserRepository.check_insert_one(connection, username, password)
 
         with connection.Session() as session:
             user = UserEntity(username=username, password=password)
             session.add(user)
             session.commit()
+            connection.mark_written()
+            UserRepository.invalidate(connection, user.iduser)
 
             return user.asdict()
 
     @staticmethod
-    def select_one(connection: LocalConnection, **kwargs) -> Dict:
-        with connection.Session() as session:
-            registers = session.query(UserEntity).filter_by(**kwargs).all()
+    def select_one(connection: Connection, **kwargs) -> Dict:
+        with connection.ReadSession() as session:
+            if list(kwargs) == ['iduser']:
+                register = session.get(UserEntity, kwargs['iduser'])
+                registers = [register] if register is not None else []
+            else:
+                registers = session.query(UserEntity).filter_by(**kwargs).all()
+
             if len(registers):
                 user = registers[0]
                 return user.asdict()
 
         raise RegisterNotFound('user')
+
+    @staticmethod
+    def update_password(connection: Connection, iduser: int, password: str) -> None:
+        if not len(password):
+            raise MissingRequiredField('password')
+
+        with connection.Session() as session:
+            result = session.execute(update(UserEntity).where(UserEntity.iduser == iduser).values(password=password))
+            session.commit()
+            connection.mark_written()
+            UserRepository.invalidate(connection, iduser)
+
+            if result.rowcount == 0:
+                raise RegisterNotFound('user')
+
+    @staticmethod
+    def select_shallow(connection: Connection, iduser: int) -> Dict:
+        statement = select(UserEntity.iduser, UserEntity.username).where(UserEntity.iduser == iduser)
+        with connection.ReadSession() as session:
+            register = session.execute(statement).mappings().first()
+            if register is not None:
+                return dict(register)
+
+        raise RegisterNotFound('user')
+
+    @staticmethod
+    def select_current(connection: Connection, iduser: int) -> Dict:
+        user = connection.user_cache.get(iduser)
+        if user is None:
+            user = UserRepository.select_shallow(connection, iduser)
+            connection.user_cache.set(iduser, user)
+
+        return user
+
+    @staticmethod
+    def invalidate(connection: Connection, iduser: int) -> None:
+        connection.user_cache.invalidate(iduser)
+
+    @staticmethod
+    def insert_many(
+        connection: Connection,
+        registers: Iterable[Any],
+        chunk_size: int = 1000,
+        on_error: Optional[ErrorHandler] = None,
+    ) -> Dict:
+        report = BatchReport(on_error)
+        for chunk in chunked(registers, chunk_size):
+            UserRepository.insert_chunk(connection, chunk, report)
+
+        return report.asdict()
+
+    @staticmethod
+    def insert_chunk(connection: Connection, chunk: List[Tuple[int, Any]], report: BatchReport) -> None:
+        valid: Dict[str, Tuple[int, Dict]] = {}
+        for index, register in chunk:
+            try:
+                if not isinstance(register, dict):
+                    raise InvalidRegister('user')
+
+                username = register.get('username', '')
+                password = register.get('password', '')
+                if not isinstance(username, str) or not isinstance(password, str):
+                    raise InvalidRegister('user')
+
+                elif not len(username):
+                    raise MissingRequiredField('username')
+
+                elif not len(password):
+                    raise MissingRequiredField('password')
+
+                elif username in valid:
+                    raise AlreadyRegistered(username)
+
+            except (InvalidRegister, MissingRequiredField, AlreadyRegistered) as error:
+                report.fail(index, error)
+
+            except TypeError:
+                report.fail(index, InvalidRegister('user'))
+
+            else:
+                valid[username] = (index, {'username': username, 'password': password})
+
+        with connection.Session() as session:
+            statement = select(UserEntity.username).where(UserEntity.username.in_(valid))
+            for username in session.scalars(statement).all():
+                report.fail(valid.pop(username)[0], AlreadyRegistered(username))
+
+            if not len(valid):
+                return
+
+            try:
+                with session.begin_nested():
+                    session.execute(insert(UserEntity), [register for _, register in valid.values()])
+                report.inserted += len(valid)
+
+            except IntegrityError:
+                for index, register in valid.values():
+                    try:
+                        with session.begin_nested():
+                            session.execute(insert(UserEntity), [register])
+                        report.inserted += 1
+                    except IntegrityError:
+                        report.fail(index, AlreadyRegistered(register['username']))
+
+            session.commit()
+            connection.mark_written()
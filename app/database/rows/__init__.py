@@ -0,0 +1,2 @@
+from .post_row import PostRow  # isort:skip
+from .post_row import SearchRow  # isort:skip
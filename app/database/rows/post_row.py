@@ -0,0 +1,60 @@
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+from typing import ClassVar
+from typing import Dict
+from typing import Iterator
+from typing import Tuple
+
+
+class PostRow(Mapping):
+    __slots__ = ('idpost', 'title', 'body', 'created', 'id_user', 'username')
+
+    fields: ClassVar[Tuple[str, ...]] = __slots__
+
+    def __init__(self, idpost: int, title: str, body: str, created: datetime, id_user: int, username: str) -> None:
+        self.idpost = idpost
+        self.title = title
+        self.body = body
+        self.created = created
+        self.id_user = id_user
+        self.username = username
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.fields:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({", ".join(f"{key}={getattr(self, key)!r}" for key in self.fields)})'
+
+    def asdict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.fields}
+
+
+class SearchRow(PostRow):
+    __slots__ = ('snippet', 'rank')
+
+    fields: ClassVar[Tuple[str, ...]] = PostRow.fields + __slots__
+
+    def __init__(
+        self,
+        idpost: int,
+        title: str,
+        body: str,
+        created: datetime,
+        id_user: int,
+        username: str,
+        snippet: str,
+        rank: float,
+    ) -> None:
+        super().__init__(idpost, title, body, created, id_user, username)
+        self.snippet = snippet
+        self.rank = rank
@@ -1,23 +1,98 @@
+import os
+from typing import Any
+from typing import Dict
+from typing import Optional
+
 from flask import Flask
+from sqlalchemy.orm import configure_mappers
 
 from app import constants
 from app.database.repositories import UserRepository
+from app.view.blueprints import api
+from app.view.blueprints import async_auth
+from app.view.blueprints import async_blog
 from app.view.blueprints import auth
 from app.view.blueprints import blog
-from app.view.database import get_database_connection
+from app.view.caching import configure_page_cache
+from app.view.commands import configure_commands
+from app.view.compression import configure_compression
+from app.view.database import configure_database
+from app.view.hashing import configure_password_hasher
+from app.view.metrics import configure_metrics
+from app.view.throttling import configure_throttle
+from app.view.warmup import configure_warmup
+from app.view.warmup import StartupReport
 
 
 def configure_blog_routes(application: Flask) -> None:
-    application.register_blueprint(blog.blueprint)
+    application.register_blueprint(async_blog.blueprint if application.config['DATABASE_ASYNC'] else blog.blueprint)
     application.add_url_rule('/', endpoint='index')
 
 
 def configure_auth_routes(application: Flask) -> None:
-    application.register_blueprint(auth.blueprint)
+    application.register_blueprint(async_auth.blueprint if application.config['DATABASE_ASYNC'] else auth.blueprint)
+
+
+def configure_api_routes(application: Flask) -> None:
+    application.register_blueprint(api.blueprint)
 
 
 def configure_default_settings(application: Flask) -> None:
-    application.config.from_mapping(SECRET_KEY='dev')
+    application.config.from_mapping(
+        SECRET_KEY='dev',
+        DATABASE_URL=f'sqlite:///{constants.LOCAL_DATABASE_PATH}',
+        DATABASE_POOL_SIZE=5,
+        DATABASE_MAX_OVERFLOW=10,
+        DATABASE_POOL_RECYCLE=-1,
+        DATABASE_UNIT_OF_WORK=False,
+        DATABASE_ASYNC=False,
+        DATABASE_PROFILE='default',
+        DATABASE_REPLICA_URLS=[],
+        DATABASE_REPLICA_HEALTH_CHECK_INTERVAL=5.0,
+        DATABASE_REPLICA_STICKY_SECONDS=5.0,
+        DATABASE_SHARD_URLS=[],
+        DATABASE_LOCKED_RETRY_AFTER=1,
+        DATABASE_GROUP_COMMIT=False,
+        DATABASE_GROUP_COMMIT_BATCH=64,
+        DATABASE_GROUP_COMMIT_DELAY=0.005,
+        DATABASE_GROUP_COMMIT_TIMEOUT=30.0,
+        USER_CACHE_SIZE=1024,
+        USER_CACHE_TTL=60.0,
+        POSTS_PER_PAGE=20,
+        EXPORT_BATCH_SIZE=1000,
+        PAGE_CACHE_ENABLED=True,
+        PAGE_CACHE_SIZE=256,
+        PAGE_CACHE_TTL=10.0,
+        PASSWORD_HASH_METHOD='scrypt',
+        PASSWORD_HASH_WORKERS=os.cpu_count() or 1,
+        PASSWORD_HASH_QUEUE_DEPTH=16,
+        PASSWORD_HASH_EXECUTOR='thread',
+        PASSWORD_HASH_RETRY_AFTER=1,
+        AUTH_THROTTLE_ENABLED=True,
+        AUTH_THROTTLE_IP_RATE=1.0,
+        AUTH_THROTTLE_IP_BURST=20,
+        AUTH_THROTTLE_USERNAME_RATE=0.2,
+        AUTH_THROTTLE_USERNAME_BURST=5,
+        AUTH_THROTTLE_SIZE=10_000,
+        METRICS_ENABLED=False,
+        SLOW_QUERY_THRESHOLD=0.1,
+        COMPRESSION_ENABLED=True,
+        COMPRESSION_ENCODINGS=['zstd', 'br', 'gzip'],
+        COMPRESSION_MIN_SIZE=500,
+        COMPRESSION_STREAMING=True,
+        COMPRESSION_MIMETYPES=[
+            'text/html',
+            'text/css',
+            'text/plain',
+            'text/javascript',
+            'application/javascript',
+            'application/json',
+            'application/x-ndjson',
+            'image/svg+xml',
+        ],
+        WARMUP_ENABLED=True,
+        JINJA_BYTECODE_CACHE=True,
+    )
 
 
 def configure_instance_folder(application: Flask) -> None:
@@ -25,7 +100,7 @@ def configure_instance_folder(application: Flask) -> None:
         constants.INSTANCE_DIR.mkdir()
 
 
-def create_app() -> Flask:
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
     application = Flask(
         __name__,
         instance_relative_config=True,
@@ -33,9 +108,35 @@ def create_app() -> Flask:
         static_folder=constants.STATIC_DIR.absolute(),
     )
 
-    configure_blog_routes(application)
-    configure_auth_routes(application)
-    configure_instance_folder(application)
-    configure_default_settings(application)
+    report = StartupReport()
+    application.extensions['startup_report'] = report
+
+    with report.phase('settings'):
+        configure_instance_folder(application)
+        configure_default_settings(application)
+        application.config.from_prefixed_env()
+        if config is not None:
+            application.config.from_mapping(config)
+
+    with report.phase('mappers'):
+        configure_mappers()
+
+    with report.phase('database'):
+        configure_database(application)
+
+    with report.phase('extensions'):
+        configure_page_cache(application)
+        configure_password_hasher(application)
+        configure_throttle(application)
+        configure_compression(application)
+        configure_metrics(application)
+
+    with report.phase('routes'):
+        configure_blog_routes(application)
+        configure_auth_routes(application)
+        configure_api_routes(application)
+        configure_commands(application)
+
+    configure_warmup(application, report)
 
     return application
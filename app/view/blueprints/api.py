@@ -0,0 +1,67 @@
+import json
+from datetime import datetime
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+from flask import abort
+from flask import Blueprint
+from flask import current_app
+from flask import request
+from flask import stream_with_context
+from werkzeug.wrappers.response import Response
+
+from app.database.repositories import PostRepository
+from app.database.rows import PostRow
+from app.view.database import get_database_connection
+
+
+blueprint = Blueprint('api', __name__, url_prefix='/api')
+
+
+def serialize(register: PostRow) -> str:
+    return json.dumps(register.asdict(), default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+
+
+def serialized_batches(registers: Iterable[PostRow], batch_size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for register in registers:
+        batch.append(serialize(register))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if len(batch):
+        yield batch
+
+
+def ndjson_lines(registers: Iterable[PostRow], batch_size: int) -> Iterator[str]:
+    for batch in serialized_batches(registers, batch_size):
+        yield '\n'.join(batch) + '\n'
+
+
+def json_array(registers: Iterable[PostRow], batch_size: int) -> Iterator[str]:
+    yield '['
+    separator = ''
+    for batch in serialized_batches(registers, batch_size):
+        yield separator + ','.join(batch)
+        separator = ','
+
+    yield ']'
+
+
+@blueprint.route('/posts', methods=('GET',))
+def posts() -> Response:
+    since = request.args.get('since', None)
+    try:
+        since_datetime = datetime.fromisoformat(since) if since else None
+    except ValueError:
+        abort(400, f'Invalid since {since}.')
+
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    registers = PostRepository.iterate(get_database_connection(), since_datetime, batch_size)
+
+    if request.args.get('format', 'ndjson') == 'json':
+        return Response(stream_with_context(json_array(registers, batch_size)), mimetype='application/json')
+
+    return Response(stream_with_context(ndjson_lines(registers, batch_size)), mimetype='application/x-ndjson')
@@ -0,0 +1,105 @@
+import asyncio
+import functools
+from typing import Callable
+from typing import Union
+
+from flask import Blueprint
+from flask import flash
+from flask import g
+from flask import redirect
+from flask import request
+from flask import render_template
+from flask import session
+from flask import url_for
+from werkzeug.wrappers.response import Response
+
+from app.database.exceptions import AlreadyRegistered
+from app.database.exceptions import MissingRequiredField
+from app.database.exceptions import RegisterNotFound
+from app.database.repositories import AsyncUserRepository
+from app.view.blueprints.auth import logout
+from app.view.database import get_async_database_connection
+from app.view.hashing import get_password_hasher
+from app.view.throttling import throttled
+from app.view.exceptions import InvalidUsernamePassword
+
+
+blueprint = Blueprint('auth', __name__, url_prefix='/auth')
+blueprint.add_url_rule('/logout', view_func=logout, methods=('GET',))
+
+
+@blueprint.route('/register', methods=('GET', 'POST'))
+@throttled
+async def register() -> Union[Response, str]:
+    if request.method == 'POST':
+        try:
+            username = request.form.get('username', '')
+            password = request.form.get('password', '')
+            connection = get_async_database_connection()
+            await AsyncUserRepository.check_insert_one(connection, username, password)
+            pwhash = await asyncio.to_thread(get_password_hasher().hash, password)
+            await AsyncUserRepository.insert_one(connection, username, pwhash)
+
+        except (MissingRequiredField, AlreadyRegistered) as error:
+            flash(str(error))
+
+        else:
+            return redirect(url_for('auth.login'))
+
+    return render_template('auth/register.html')
+
+
+@blueprint.route('/login', methods=('GET', 'POST'))
+@throttled
+async def login() -> Union[Response, str]:
+    if request.method == 'POST':
+        try:
+            username = request.form.get('username', '')
+            password = request.form.get('password', '')
+            connection = get_async_database_connection()
+            user = await AsyncUserRepository.select_one(connection, username=username)
+            hasher = get_password_hasher()
+            valid, rehashed = await asyncio.to_thread(hasher.check_and_rehash, user['password'], password)
+            if not valid:
+                raise InvalidUsernamePassword
+
+            if rehashed is not None:
+                await AsyncUserRepository.update_password(connection, user['iduser'], rehashed)
+
+        except (MissingRequiredField) as error:
+            flash(str(error))
+
+        except (RegisterNotFound, InvalidUsernamePassword):
+            flash('Invalid username or password.')
+
+        else:
+            session.clear()
+            session['iduser'] = user['iduser']
+            return redirect(url_for('blog.index'))
+
+    return render_template('auth/login.html')
+
+
+@blueprint.before_app_request
+async def load_user():
+    iduser = session.get('iduser', None)
+
+    if iduser is None:
+        g.user = None
+    else:
+        try:
+            connection = get_async_database_connection()
+            g.user = await AsyncUserRepository.select_current(connection, iduser)
+        except RegisterNotFound:
+            g.user = None
+
+
+def login_required(view) -> Callable:
+    @functools.wraps(view)
+    async def wrapped_view(**kwargs):
+        if g.user is None:
+            return redirect(url_for('auth.login'))
+
+        return await view(**kwargs)
+
+    return wrapped_view
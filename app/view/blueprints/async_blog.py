@@ -0,0 +1,159 @@
+from typing import Dict
+from typing import Union
+
+from flask import abort
+from flask import Blueprint
+from flask import current_app
+from flask import flash
+from flask import g
+from flask import redirect
+from flask import request
+from flask import render_template
+from flask import url_for
+from werkzeug.wrappers.response import Response
+
+from app.database.exceptions import MissingRequiredField
+from app.database.exceptions import NotRegisterOwner
+from app.database.exceptions import RegisterNotFound
+from app.database.repositories import AsyncPostRepository
+from app.view.blueprints.async_auth import login_required
+from app.view.blueprints.blog import highlight
+from app.view.caching import cached_page
+from app.view.cursors import decode_cursor
+from app.view.cursors import decode_search_cursor
+from app.view.cursors import encode_cursor
+from app.view.cursors import encode_search_cursor
+from app.view.database import get_async_database_connection
+from app.view.exceptions import InvalidCursor
+from app.view.exceptions import NotPostOwner
+
+
+blueprint = Blueprint('blog', __name__)
+blueprint.add_app_template_filter(highlight, 'highlight')
+
+
+@blueprint.route('/', methods=('GET',))
+@cached_page
+async def index() -> str:
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except InvalidCursor as error:
+        abort(400, str(error))
+
+    connection = get_async_database_connection()
+    limit = current_app.config['POSTS_PER_PAGE']
+
+    if cursor is None:
+        page = await AsyncPostRepository.select_page(connection, limit=limit)
+        has_previous, has_next = False, page['has_more']
+
+    elif cursor.backwards:
+        page = await AsyncPostRepository.select_page(connection, cursor.created, cursor.idpost, limit, backwards=True)
+        has_previous, has_next = page['has_more'], True
+        if not has_previous:
+            page = await AsyncPostRepository.select_page(connection, limit=limit)
+            has_next = page['has_more']
+
+    else:
+        page = await AsyncPostRepository.select_page(connection, cursor.created, cursor.idpost, limit)
+        has_previous, has_next = True, page['has_more']
+
+    posts = page['posts']
+    previous_cursor = encode_cursor(posts[0], backwards=True) if posts and has_previous else None
+    next_cursor = encode_cursor(posts[-1]) if posts and has_next else None
+
+    return render_template('blog/index.html', posts=posts, previous_cursor=previous_cursor, next_cursor=next_cursor)
+
+
+@blueprint.route('/search', methods=('GET',))
+async def search() -> str:
+    query = request.args.get('q', '')
+    try:
+        cursor = decode_search_cursor(request.args.get('cursor'))
+    except InvalidCursor as error:
+        abort(400, str(error))
+
+    connection = get_async_database_connection()
+    page = await AsyncPostRepository.search(connection, query, current_app.config['POSTS_PER_PAGE'], cursor)
+    posts = page['posts']
+    next_cursor = encode_search_cursor(posts[-1]) if page['has_more'] else None
+
+    return render_template('blog/search.html', query=query, posts=posts, next_cursor=next_cursor)
+
+
+@blueprint.route('/create', methods=('GET', 'POST'))
+@login_required
+async def create() -> Union[Response, str]:
+    if request.method == 'POST':
+        try:
+            title = request.form.get('title', '')
+            body = request.form.get('body', '')
+            connection = get_async_database_connection()
+            await AsyncPostRepository.insert_one(connection, title, body, g.user['iduser'])
+
+        except (MissingRequiredField, RegisterNotFound) as error:
+            flash(str(error))
+
+        else:
+            return redirect(url_for('blog.index'))
+
+    return render_template('blog/create.html')
+
+
+@blueprint.route('/<int:idpost>/update', methods=('GET', 'POST'))
+@login_required
+async def update(idpost: int) -> Union[Response, str]:
+    if request.method == 'POST':
+        try:
+            connection = get_async_database_connection()
+            title = request.form.get('title', '')
+            body = request.form.get('body', '')
+            await AsyncPostRepository.update_owned(connection, idpost, g.user['iduser'], title, body)
+
+        except RegisterNotFound as error:
+            abort(404, str(error))
+
+        except NotRegisterOwner as error:
+            abort(403, str(error))
+
+        except MissingRequiredField as error:
+            flash(str(error))
+
+        else:
+            return redirect(url_for('blog.index'))
+
+    return render_template('blog/update.html', post=await get_post(idpost))
+
+
+@blueprint.route('/<int:idpost>/delete', methods=('POST',))
+@login_required
+async def delete(idpost: int) -> Response:
+    try:
+        connection = get_async_database_connection()
+        await AsyncPostRepository.delete_owned(connection, idpost, g.user['iduser'])
+
+    except RegisterNotFound as error:
+        abort(404, str(error))
+
+    except NotRegisterOwner as error:
+        abort(403, str(error))
+
+    return redirect(url_for('blog.index'))
+
+
+async def get_post(idpost: int, check_author: bool = True) -> Dict:
+    try:
+        connection = get_async_database_connection()
+        post = await AsyncPostRepository.select_one(connection, idpost)
+
+        if check_author and post['id_user'] != g.user['iduser']:
+            raise NotPostOwner
+
+    except RegisterNotFound as error:
+        abort(404, str(error))
+
+    except NotPostOwner as error:
+        abort(403, str(error))
+
+    else:
+        return post
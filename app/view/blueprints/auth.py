@@ -10,8 +10,6 @@ from flask import request
 from flask import render_template
 from flask import session
 from flask import url_for
-from werkzeug.security import check_password_hash
-from werkzeug.security import generate_password_hash
 from werkzeug.wrappers.response import Response
 
 from app import constants
@@ -20,6 +18,8 @@ from app.database.exceptions import MissingRequiredField
 from app.database.exceptions import RegisterNotFound
 from app.database.repositories import UserRepository
 from app.view.database import get_database_connection
+from app.view.hashing import get_password_hasher
+from app.view.throttling import throttled
 from app.view.exceptions import InvalidUsernamePassword
 
 
@@ -27,13 +27,15 @@ blueprint = Blueprint('auth', __name__, url_prefix='/auth')
 
 
 @blueprint.route('/register', methods=('GET', 'POST'))
+@throttled
 def register() -> Union[Response, str]:
     if request.method == 'POST':
         try:
             username = request.form.get('username', '')
             password = request.form.get('password', '')
             connection = get_database_connection()
-            user = UserRepository.insert_one(connection, username, generate_password_hash(password))
+            UserRepository.check_insert_one(connection, username, password)
+            user = UserRepository.insert_one(connection, username, get_password_hasher().hash(password))
 
         except (MissingRequiredField, AlreadyRegistered) as error:
             flash(str(error))
@@ -45,6 +47,7 @@ def register() -> Union[Response, str]:
 
 
 @blueprint.route('/login', methods=('GET', 'POST'))
+@throttled
 def login() -> Union[Response, str]:
     if request.method == 'POST':
         try:
@@ -52,9 +55,13 @@ def login() -> Union[Response, str]:
             password = request.form.get('password', '')
             connection = get_database_connection()
             user = UserRepository.select_one(connection, username=username)
-            if not check_password_hash(user['password'], password):
+            valid, rehashed = get_password_hasher().check_and_rehash(user['password'], password)
+            if not valid:
                 raise InvalidUsernamePassword
 
+            if rehashed is not None:
+                UserRepository.update_password(connection, user['iduser'], rehashed)
+
         except (MissingRequiredField) as error:
             flash(str(error))
 
@@ -83,9 +90,11 @@ def load_user():
     if iduser is None:
         g.user = None
     else:
-        connection = get_database_connection()
-        user = UserRepository.select_one(connection, iduser=iduser)
-        g.user = user
+        try:
+            connection = get_database_connection()
+            g.user = UserRepository.select_current(connection, iduser)
+        except RegisterNotFound:
+            g.user = None
 
 
 def login_required(view) -> Callable:
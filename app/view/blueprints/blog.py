@@ -3,19 +3,32 @@ from typing import Union
 
 from flask import abort
 from flask import Blueprint
+from flask import current_app
 from flask import flash
 from flask import g
 from flask import redirect
 from flask import request
 from flask import render_template
 from flask import url_for
+from markupsafe import escape
+from markupsafe import Markup
 from werkzeug.wrappers.response import Response
 
 from app.database.exceptions import MissingRequiredField
+from app.database.exceptions import NotRegisterOwner
 from app.database.exceptions import RegisterNotFound
+from app.database.repositories import FeedRepository
 from app.database.repositories import PostRepository
+from app.database.repositories.post_repository import HIGHLIGHT_END
+from app.database.repositories.post_repository import HIGHLIGHT_START
 from app.view.blueprints.auth import login_required
+from app.view.caching import cached_page
+from app.view.cursors import decode_cursor
+from app.view.cursors import decode_search_cursor
+from app.view.cursors import encode_cursor
+from app.view.cursors import encode_search_cursor
 from app.view.database import get_database_connection
+from app.view.exceptions import InvalidCursor
 from app.view.exceptions import NotPostOwner
 
 
@@ -23,11 +36,57 @@ blueprint = Blueprint('blog', __name__)
 
 
 @blueprint.route('/', methods=('GET',))
+@cached_page
 def index() -> str:
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except InvalidCursor as error:
+        abort(400, str(error))
+
+    connection = get_database_connection()
+    limit = current_app.config['POSTS_PER_PAGE']
+
+    if cursor is None:
+        page = FeedRepository.select_page(connection, limit=limit)
+        has_previous, has_next = False, page['has_more']
+
+    elif cursor.backwards:
+        page = FeedRepository.select_page(connection, cursor.created, cursor.idpost, limit, backwards=True)
+        has_previous, has_next = page['has_more'], True
+        if not has_previous:
+            page = FeedRepository.select_page(connection, limit=limit)
+            has_next = page['has_more']
+
+    else:
+        page = FeedRepository.select_page(connection, cursor.created, cursor.idpost, limit)
+        has_previous, has_next = True, page['has_more']
+
+    posts = page['posts']
+    previous_cursor = encode_cursor(posts[0], backwards=True) if posts and has_previous else None
+    next_cursor = encode_cursor(posts[-1]) if posts and has_next else None
+
+    return render_template('blog/index.html', posts=posts, previous_cursor=previous_cursor, next_cursor=next_cursor)
+
+
+@blueprint.route('/search', methods=('GET',))
+def search() -> str:
+    query = request.args.get('q', '')
+    try:
+        cursor = decode_search_cursor(request.args.get('cursor'))
+    except InvalidCursor as error:
+        abort(400, str(error))
+
     connection = get_database_connection()
-    posts = PostRepository.select_all(connection)
+    page = PostRepository.search(connection, query, current_app.config['POSTS_PER_PAGE'], cursor)
+    posts = page['posts']
+    next_cursor = encode_search_cursor(posts[-1]) if page['has_more'] else None
+
+    return render_template('blog/search.html', query=query, posts=posts, next_cursor=next_cursor)
 
-    return render_template('blog/index.html', posts=posts)
+
+@blueprint.app_template_filter('highlight')
+def highlight(snippet: str) -> Markup:
+    return escape(snippet).replace(HIGHLIGHT_START, Markup('<mark>')).replace(HIGHLIGHT_END, Markup('</mark>'))
 
 
 @blueprint.route('/create', methods=('GET', 'POST'))
@@ -50,30 +109,42 @@ def create() -> Union[Response, str]:
 
 
 @blueprint.route('/<int:idpost>/update', methods=('GET', 'POST'))
+@login_required
 def update(idpost: int) -> Union[Response, str]:
-    post = get_post(idpost)
-
     if request.method == 'POST':
         try:
             connection = get_database_connection()
             title = request.form.get('title', '')
             body = request.form.get('body', '')
-            PostRepository.update_one(connection, post['idpost'], title=title, body=body)
+            PostRepository.update_owned(connection, idpost, g.user['iduser'], title, body)
+
+        except RegisterNotFound as error:
+            abort(404, str(error))
 
-        except (RegisterNotFound, MissingRequiredField) as error:
+        except NotRegisterOwner as error:
+            abort(403, str(error))
+
+        except MissingRequiredField as error:
             flash(str(error))
 
         else:
             return redirect(url_for('blog.index'))
 
-    return render_template('blog/update.html', post=post)
+    return render_template('blog/update.html', post=get_post(idpost))
 
 
 @blueprint.route('/<int:idpost>/delete', methods=('POST',))
+@login_required
 def delete(idpost: int) -> Response:
-    post = get_post(idpost)
-    connection = get_database_connection()
-    PostRepository.delete_one(connection, post['idpost'])
+    try:
+        connection = get_database_connection()
+        PostRepository.delete_owned(connection, idpost, g.user['iduser'])
+
+    except RegisterNotFound as error:
+        abort(404, str(error))
+
+    except NotRegisterOwner as error:
+        abort(403, str(error))
 
     return redirect(url_for('blog.index'))
 
@@ -0,0 +1,82 @@
+import functools
+import hashlib
+import inspect
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+from flask import current_app
+from flask import Flask
+from flask import g
+from flask import make_response
+from flask import request
+from flask import session
+from werkzeug.wrappers.response import Response
+
+from app.database.caches import LRUCache
+
+
+def configure_page_cache(application: Flask) -> None:
+    application.extensions['page_cache'] = LRUCache(
+        application.config['PAGE_CACHE_SIZE'],
+        application.config['PAGE_CACHE_TTL'],
+    )
+
+
+def page_cache_key() -> Optional[Tuple]:
+    if not current_app.config['PAGE_CACHE_ENABLED'] or '_flashes' in session:
+        return None
+
+    iduser = g.user['iduser'] if g.user is not None else None
+    generation = current_app.extensions['database'].generation
+    return (request.endpoint, request.full_path, iduser, generation)
+
+
+def cache_page(key: Tuple, body: str) -> Tuple[str, str]:
+    page = (body, hashlib.sha256(body.encode()).hexdigest())
+    current_app.extensions['page_cache'].set(key, page)
+
+    return page
+
+
+def page_response(page: Tuple[str, str]) -> Response:
+    response = make_response(page[0])
+    response.set_etag(page[1])
+    response.cache_control.no_cache = True
+    if g.user is not None:
+        response.cache_control.private = True
+    response.vary.add('Cookie')
+
+    return response.make_conditional(request)
+
+
+def cached_page(view) -> Callable:
+    if inspect.iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def wrapped_async_view(**kwargs) -> Response:
+            key = page_cache_key()
+            if key is None:
+                return await view(**kwargs)
+
+            page = current_app.extensions['page_cache'].get(key)
+            if page is None:
+                page = cache_page(key, await view(**kwargs))
+
+            return page_response(page)
+
+        return wrapped_async_view
+
+    @functools.wraps(view)
+    def wrapped_view(**kwargs) -> Response:
+        key = page_cache_key()
+        if key is None:
+            return view(**kwargs)
+
+        page = current_app.extensions['page_cache'].get(key)
+        if page is None:
+            page = cache_page(key, view(**kwargs))
+
+        return page_response(page)
+
+    return wrapped_view
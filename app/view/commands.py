@@ -0,0 +1,167 @@
+import json
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+
+import click
+from flask import current_app
+from flask import Flask
+from flask.cli import AppGroup
+
+from app.database.connections import Connection
+from app.database.exceptions import InvalidOption
+from app.database.exceptions import RegisterNotFound
+from app.database.migrations import MigrationRunner
+from app.database.repositories import FeedRepository
+from app.database.repositories import PostRepository
+from app.database.repositories import ShardRepository
+from app.database.repositories import UserRepository
+from app.view.compression import precompress
+from app.view.database import get_database_connection
+
+
+database_commands = AppGroup('db', help='Manage the database schema.')
+import_commands = AppGroup('import', help='Bulk import registers from JSONL files.')
+search_commands = AppGroup('search', help='Manage the full-text search index.')
+feed_commands = AppGroup('feed', help='Manage the denormalized front page feed.')
+shard_commands = AppGroup('shard', help='Inspect and rebalance post shards.')
+static_commands = AppGroup('static', help='Build static assets.')
+
+
+@database_commands.command('upgrade')
+@click.option('--target', type=int, default=None, help='Schema version to upgrade to (defaults to latest).')
+def upgrade(target: Optional[int]) -> None:
+    connection = get_database_connection()
+    engine = connection.engine
+    for migration in MigrationRunner.upgrade(engine, target):
+        click.echo(f'Applied migration {migration.version}: {migration.description}')
+
+    for shard in connection.shard_set:
+        for migration in MigrationRunner.upgrade(shard.engine, target):
+            click.echo(f'Applied migration {migration.version} to shard {shard.index}: {migration.description}')
+
+    click.echo(f'Schema version {MigrationRunner.current_version(engine)}.')
+
+
+@database_commands.command('current')
+def current() -> None:
+    engine = get_database_connection().engine
+    click.echo(f'Schema version {MigrationRunner.current_version(engine)} (latest {MigrationRunner.head()}).')
+
+
+def read_jsonl(file: TextIO) -> Iterator[Any]:
+    for line in file:
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield None
+
+
+def report_error(index: int, error: str) -> None:
+    click.echo(f'Register {index + 1}: {error}', err=True)
+
+
+@import_commands.command('users')
+@click.argument('file', type=click.File('r'))
+@click.option('--chunk-size', type=int, default=1000, show_default=True)
+def import_users(file: TextIO, chunk_size: int) -> None:
+    connection = get_database_connection()
+    report = UserRepository.insert_many(connection, read_jsonl(file), chunk_size, on_error=report_error)
+    click.echo(f'Imported {report["inserted"]} users.')
+
+
+@import_commands.command('posts')
+@click.argument('file', type=click.File('r'))
+@click.option('--chunk-size', type=int, default=1000, show_default=True)
+def import_posts(file: TextIO, chunk_size: int) -> None:
+    connection = get_database_connection()
+    report = PostRepository.insert_many(connection, read_jsonl(file), chunk_size, on_error=report_error)
+    click.echo(f'Imported {report["inserted"]} posts.')
+
+
+@search_commands.command('rebuild')
+def rebuild_search() -> None:
+    PostRepository.rebuild_search_index(get_database_connection())
+    click.echo('Rebuilt the post search index.')
+
+
+@feed_commands.command('rebuild')
+def rebuild_feed() -> None:
+    count = FeedRepository.rebuild(get_database_connection())
+    click.echo(f'Rebuilt the feed with {count} posts.')
+
+
+def get_sharded_connection() -> Connection:
+    connection = get_database_connection()
+    if not len(connection.shard_set):
+        raise click.ClickException('No shards configured, set DATABASE_SHARD_URLS.')
+
+    return connection
+
+
+@shard_commands.command('status')
+def shard_status() -> None:
+    for shard in ShardRepository.status(get_sharded_connection()):
+        click.echo(f'Shard {shard["shard"]}: {shard["users"]} users, {shard["posts"]} posts ({shard["url"]}).')
+
+
+@shard_commands.command('move')
+@click.argument('iduser', type=int)
+@click.argument('shard', type=int)
+def move_user(iduser: int, shard: int) -> None:
+    try:
+        moved = ShardRepository.move_user(get_sharded_connection(), iduser, shard)
+    except (InvalidOption, RegisterNotFound) as error:
+        raise click.ClickException(str(error))
+
+    click.echo(f'Moved {moved} posts of user {iduser} to shard {shard}.')
+
+
+@shard_commands.command('rebalance')
+@click.option('--tolerance', type=float, default=0.1, show_default=True, help='Allowed gap as a share of the mean.')
+@click.option('--dry-run', is_flag=True, help='Print the planned moves without applying them.')
+def rebalance(tolerance: float, dry_run: bool) -> None:
+    connection = get_sharded_connection()
+    if dry_run:
+        moves = ShardRepository.plan_rebalance(ShardRepository.user_counts(connection), tolerance)
+    else:
+        moves = ShardRepository.rebalance(connection, tolerance)
+
+    for iduser, source, target in moves:
+        click.echo(f'User {iduser}: shard {source} -> shard {target}')
+
+    click.echo(f'{"Planned" if dry_run else "Applied"} {len(moves)} moves.')
+
+
+@shard_commands.command('distribute')
+def distribute() -> None:
+    moved = ShardRepository.distribute(get_sharded_connection())
+    click.echo(f'Moved {moved} posts from the primary database to their shards.')
+
+
+@static_commands.command('precompress')
+def precompress_static() -> None:
+    written = precompress(
+        Path(current_app.static_folder or ''),
+        current_app.config['COMPRESSION_ENCODINGS'],
+        current_app.config['COMPRESSION_MIN_SIZE'],
+        current_app.config['COMPRESSION_MIMETYPES'],
+    )
+    for path in written:
+        click.echo(f'Wrote {path} ({path.stat().st_size} bytes)')
+
+    click.echo(f'Precompressed {len(written)} static files.')
+
+
+def configure_commands(application: Flask) -> None:
+    application.cli.add_command(database_commands)
+    application.cli.add_command(import_commands)
+    application.cli.add_command(search_commands)
+    application.cli.add_command(feed_commands)
+    application.cli.add_command(shard_commands)
+    application.cli.add_command(static_commands)
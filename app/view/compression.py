@@ -0,0 +1,238 @@
+import gzip
+import mimetypes
+import os
+import zlib
+from abc import ABC
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+
+from flask import current_app
+from flask import Flask
+from flask import request
+from flask import send_from_directory
+from werkzeug.security import safe_join
+from werkzeug.wrappers.response import Response
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:
+    zstandard = None
+
+
+class Codec(ABC):
+    encoding = ''
+    suffix = ''
+    dynamic_level = 0
+    static_level = 0
+
+    def __init__(self, level: int) -> None:
+        self.level = level
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        ...
+
+
+class GzipCodec(Codec):
+    encoding = 'gzip'
+    suffix = '.gz'
+    dynamic_level = 6
+    static_level = 9
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, self.level, mtime=0)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if len(data):
+                yield data
+
+        yield compressor.flush()
+
+
+class BrotliCodec(Codec):
+    encoding = 'br'
+    suffix = '.br'
+    dynamic_level = 4
+    static_level = 11
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = brotli.Compressor(quality=self.level)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if len(data):
+                yield data
+
+        yield compressor.finish()
+
+
+class ZstdCodec(Codec):
+    encoding = 'zstd'
+    suffix = '.zst'
+    dynamic_level = 3
+    static_level = 19
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if len(data):
+                yield data
+
+        yield compressor.flush()
+
+
+CODEC_MODULES: Tuple[Tuple[Type[Codec], Any], ...] = ((ZstdCodec, zstandard), (BrotliCodec, brotli), (GzipCodec, gzip))
+
+CODECS: Dict[str, Type[Codec]] = {codec.encoding: codec for codec, module in CODEC_MODULES if module is not None}
+
+
+def available_codecs(encodings: Sequence[str], static: bool = False) -> Dict[str, Codec]:
+    return {
+        encoding: CODECS[encoding](CODECS[encoding].static_level if static else CODECS[encoding].dynamic_level)
+        for encoding in encodings
+        if encoding in CODECS
+    }
+
+
+def compressible(mimetype: Optional[str]) -> bool:
+    return mimetype in current_app.config['COMPRESSION_MIMETYPES']
+
+
+def negotiate(encodings: Sequence[str]) -> Optional[str]:
+    return request.accept_encodings.best_match(encodings)
+
+
+def compress_response(response: Response) -> Response:
+    if (
+        not current_app.config['COMPRESSION_ENABLED']
+        or response.status_code != 200
+        or response.direct_passthrough
+        or not compressible(response.mimetype)
+        or 'Content-Encoding' in response.headers
+        or response.cache_control.no_transform
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    codecs: Dict[str, Codec] = current_app.extensions['compression']
+    encoding = negotiate(list(codecs))
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        if not current_app.config['COMPRESSION_STREAMING']:
+            return response
+
+        response.response = codecs[encoding].stream(response.iter_encoded())
+        response.headers.pop('Content-Length', None)
+
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config['COMPRESSION_MIN_SIZE']:
+            return response
+
+        response.set_data(codecs[encoding].compress(data))
+
+    response.content_encoding = encoding
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
+
+
+def fresh_variant(directory: str, filename: str, suffix: str) -> bool:
+    source = safe_join(directory, filename)
+    variant = safe_join(directory, f'{filename}{suffix}')
+    if source is None or variant is None or not os.path.isfile(source) or not os.path.isfile(variant):
+        return False
+
+    return os.stat(variant).st_mtime >= os.stat(source).st_mtime
+
+
+def send_static(filename: str) -> Response:
+    directory = current_app.static_folder or ''
+    codecs: Dict[str, Codec] = current_app.extensions['compression']
+    mimetype = mimetypes.guess_type(filename)[0]
+    precompressed = [encoding for encoding, codec in codecs.items() if fresh_variant(directory, filename, codec.suffix)]
+    encoding = (
+        negotiate(precompressed)
+        if current_app.config['COMPRESSION_ENABLED'] and len(precompressed) and compressible(mimetype)
+        else None
+    )
+
+    if encoding is None:
+        response = current_app.send_static_file(filename)
+    else:
+        response = send_from_directory(
+            directory,
+            f'{filename}{codecs[encoding].suffix}',
+            mimetype=mimetype,
+            max_age=current_app.get_send_file_max_age(filename),
+        )
+        response.content_encoding = encoding
+
+    if compressible(response.mimetype):
+        response.vary.add('Accept-Encoding')
+
+    return response
+
+
+def precompress(directory: Path, encodings: Sequence[str], min_size: int, types: Sequence[str]) -> List[Path]:
+    codecs = available_codecs(encodings, static=True)
+    suffixes = tuple(codec.suffix for codec in CODECS.values())
+    written: List[Path] = []
+    for path in sorted(directory.rglob('*')):
+        if not path.is_file() or path.name.endswith(suffixes) or mimetypes.guess_type(path.name)[0] not in types:
+            continue
+
+        data = path.read_bytes()
+        if len(data) < min_size:
+            continue
+
+        for codec in codecs.values():
+            target = path.with_name(path.name + codec.suffix)
+            if target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+                continue
+
+            compressed = codec.compress(data)
+            if len(compressed) < len(data):
+                target.write_bytes(compressed)
+                os.utime(target, (path.stat().st_atime, path.stat().st_mtime))
+                written.append(target)
+
+    return written
+
+
+def configure_compression(application: Flask) -> None:
+    application.extensions['compression'] = available_codecs(application.config['COMPRESSION_ENCODINGS'])
+    application.after_request(compress_response)
+    if 'static' in application.view_functions:
+        application.view_functions['static'] = send_static
@@ -0,0 +1,62 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from app.view.exceptions import InvalidCursor
+
+
+class Cursor(NamedTuple):
+    backwards: bool
+    created: datetime
+    idpost: int
+
+
+def encode_cursor(post: Dict, backwards: bool = False) -> str:
+    direction = 'previous' if backwards else 'next'
+    value = f'{direction}|{post["created"].isoformat()}|{post["idpost"]}'
+
+    return encode_value(value)
+
+
+def encode_value(value: str) -> str:
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_value(token: str) -> str:
+    return base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Cursor]:
+    if not token:
+        return None
+
+    try:
+        value = decode_value(token)
+        direction, created, idpost = value.split('|')
+        if direction not in ('next', 'previous'):
+            raise ValueError(direction)
+
+        return Cursor(direction == 'previous', datetime.fromisoformat(created), int(idpost))
+
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise InvalidCursor from error
+
+
+def encode_search_cursor(post: Dict) -> str:
+    return encode_value(f'{post["rank"]!r}|{post["idpost"]}')
+
+
+def decode_search_cursor(token: Optional[str]) -> Optional[Tuple[float, int]]:
+    if not token:
+        return None
+
+    try:
+        rank, idpost = decode_value(token).split('|')
+        return float(rank), int(idpost)
+
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise InvalidCursor from error
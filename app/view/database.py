@@ -1,6 +1,130 @@
-from app import constants
+import asyncio
+import time
+from typing import Optional
+
+from flask import current_app
+from flask import Flask
+from flask import g
+from flask import has_request_context
+from flask import session
+from sqlalchemy.exc import OperationalError
+from werkzeug.wrappers.response import Response
+
+from app.database.connections import AsyncLocalConnection
+from app.database.connections import Connection
+from app.database.connections import is_sqlite_file
 from app.database.connections import LocalConnection
+from app.database.connections import SQLITE_PROFILES
+from app.database.connections import UnitOfWork
+from app.database.exceptions import InvalidOption
+from app.database.migrations import MigrationRunner
+
+
+def configure_database(application: Flask) -> None:
+    profile = application.config['DATABASE_PROFILE']
+    if profile not in SQLITE_PROFILES:
+        raise InvalidOption('database profile', profile)
+
+    elif application.config['DATABASE_ASYNC'] and len(application.config['DATABASE_SHARD_URLS']):
+        raise InvalidOption('database setting', 'DATABASE_ASYNC with DATABASE_SHARD_URLS')
+
+    connection = LocalConnection(
+        application.config['DATABASE_URL'],
+        pool_size=application.config['DATABASE_POOL_SIZE'],
+        max_overflow=application.config['DATABASE_MAX_OVERFLOW'],
+        pool_recycle=application.config['DATABASE_POOL_RECYCLE'],
+        user_cache_size=application.config['USER_CACHE_SIZE'],
+        user_cache_ttl=application.config['USER_CACHE_TTL'],
+        pragmas=SQLITE_PROFILES[profile],
+        replica_urls=application.config['DATABASE_REPLICA_URLS'],
+        replica_health_check_interval=application.config['DATABASE_REPLICA_HEALTH_CHECK_INTERVAL'],
+        shard_urls=application.config['DATABASE_SHARD_URLS'],
+        group_commit=application.config['DATABASE_GROUP_COMMIT'],
+        group_commit_batch=application.config['DATABASE_GROUP_COMMIT_BATCH'],
+        group_commit_delay=application.config['DATABASE_GROUP_COMMIT_DELAY'],
+        group_commit_timeout=application.config['DATABASE_GROUP_COMMIT_TIMEOUT'],
+    )
+    application.extensions['database'] = connection
+    application.after_request(commit_unit_of_work)
+    application.teardown_request(close_unit_of_work)
+    application.register_error_handler(OperationalError, database_locked)
+
+    if application.config['DATABASE_ASYNC']:
+        async_connection = AsyncLocalConnection.from_connection(
+            connection,
+            pool_size=application.config['DATABASE_POOL_SIZE'],
+            max_overflow=application.config['DATABASE_MAX_OVERFLOW'],
+            pool_recycle=application.config['DATABASE_POOL_RECYCLE'],
+        )
+        asyncio.run(async_connection.initialize())
+        application.extensions['async_database'] = async_connection
+
+    if len(connection.replica_set):
+        application.before_request(stick_to_primary)
+        application.after_request(remember_write)
+
+    if is_sqlite_file(connection.url):
+        application.logger.info('SQLite profile %s, effective pragmas %s', profile, connection.effective_pragmas())
+
+    pending = MigrationRunner.pending(connection.engine)
+    if len(pending):
+        application.logger.warning('%d pending schema migration(s), run "flask db upgrade".', len(pending))
+
+
+def get_database_connection() -> Connection:
+    connection: LocalConnection = current_app.extensions['database']
+    if not current_app.config['DATABASE_UNIT_OF_WORK'] or not has_request_context():
+        return connection
+
+    if 'unit_of_work' not in g:
+        g.unit_of_work = UnitOfWork(connection)
+
+    return g.unit_of_work
+
+
+def get_async_database_connection() -> AsyncLocalConnection:
+    return current_app.extensions['async_database']
+
+
+def commit_unit_of_work(response: Response) -> Response:
+    unit_of_work: Optional[UnitOfWork] = g.get('unit_of_work')
+    if unit_of_work is not None:
+        unit_of_work.commit()
+
+    return response
+
+
+def close_unit_of_work(error: Optional[BaseException]) -> None:
+    unit_of_work: Optional[UnitOfWork] = g.pop('unit_of_work', None)
+    if unit_of_work is None:
+        return
+
+    try:
+        unit_of_work.rollback()
+    finally:
+        unit_of_work.close()
+
+
+def database_locked(error: OperationalError) -> Response:
+    if 'locked' not in str(error.orig):
+        raise error
+
+    current_app.logger.warning('Database locked: %s', error.orig)
+    response = Response('Database is locked.', status=503, mimetype='text/plain')
+    response.retry_after = current_app.config['DATABASE_LOCKED_RETRY_AFTER']
+
+    return response
+
+
+def stick_to_primary() -> None:
+    connection: LocalConnection = current_app.extensions['database']
+    wrote_at = session.get('wrote_at', 0.0)
+    connection.stick(time.time() - wrote_at < current_app.config['DATABASE_REPLICA_STICKY_SECONDS'])
+
 
+def remember_write(response: Response) -> Response:
+    connection: LocalConnection = current_app.extensions['database']
+    if connection.written.get():
+        session['wrote_at'] = time.time()
 
-def get_database_connection() -> LocalConnection:
-    return LocalConnection(f'sqlite:///{constants.LOCAL_DATABASE_PATH}')
+    return response
@@ -1,2 +1,5 @@
 from .exceptions import InvalidUsernamePassword  # isort:skip
 from .exceptions import NotPostOwner  # isort:skip
+from .exceptions import InvalidCursor  # isort:skip
+from .exceptions import HashingUnavailable  # isort:skip
+from .exceptions import RequestThrottled  # isort:skip
@@ -6,3 +6,19 @@ class InvalidUsernamePassword(Exception):
 class NotPostOwner(Exception):
     def __init__(self) -> None:
         super().__init__('Current user is not post owner.')
+
+
+class InvalidCursor(Exception):
+    def __init__(self) -> None:
+        super().__init__('Invalid pagination cursor.')
+
+
+class HashingUnavailable(Exception):
+    def __init__(self) -> None:
+        super().__init__('Password hashing is temporarily unavailable, try again shortly.')
+
+
+class RequestThrottled(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__('Too many attempts, try again shortly.')
+        self.retry_after = retry_after
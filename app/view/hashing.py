@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from flask import current_app
+from flask import Flask
+from werkzeug.security import check_password_hash
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+from werkzeug.security import generate_password_hash
+from werkzeug.wrappers.response import Response
+
+from app.view.exceptions import HashingUnavailable
+
+
+def method_prefix(method: str) -> str:
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = map(int, args) if len(args) else (2**15, 8, 1)
+        return f'scrypt:{n}:{r}:{p}'
+
+    elif name == 'pbkdf2':
+        hash_name = args[0] if len(args) else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+
+    return method
+
+
+class PasswordHasher:
+    def __init__(self, method: str, workers: int, queue_depth: int, executor: str = 'thread') -> None:
+        self.method = method
+        self.executor: Executor = (
+            ProcessPoolExecutor(workers) if executor == 'process' else ThreadPoolExecutor(workers, 'password-hasher')
+        )
+        self.slots = threading.BoundedSemaphore(workers + queue_depth)
+        self.prefix = method_prefix(method)
+        self.statistics: Dict[str, int] = {'hashes': 0, 'checks': 0, 'rehashes': 0, 'rejected': 0}
+        self.statistics_lock = threading.Lock()
+
+    def count(self, key: str) -> None:
+        with self.statistics_lock:
+            self.statistics[key] += 1
+
+    def status(self) -> Dict[str, int]:
+        with self.statistics_lock:
+            return dict(self.statistics)
+
+    def submit(self, function: Callable, *args: Any) -> Any:
+        if not self.slots.acquire(blocking=False):
+            self.count('rejected')
+            raise HashingUnavailable
+
+        try:
+            return self.executor.submit(function, *args).result()
+        finally:
+            self.slots.release()
+
+    def hash(self, password: str) -> str:
+        self.count('hashes')
+        return self.submit(generate_password_hash, password, self.method)
+
+    def check(self, pwhash: str, password: str) -> bool:
+        self.count('checks')
+        return self.submit(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        return pwhash.split('$', 1)[0] != self.prefix
+
+    def check_and_rehash(self, pwhash: str, password: str) -> Tuple[bool, Optional[str]]:
+        if not self.check(pwhash, password):
+            return False, None
+
+        if not self.needs_rehash(pwhash):
+            return True, None
+
+        self.count('rehashes')
+        return True, self.hash(password)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+def configure_password_hasher(application: Flask) -> None:
+    application.extensions['password_hasher'] = PasswordHasher(
+        application.config['PASSWORD_HASH_METHOD'],
+        application.config['PASSWORD_HASH_WORKERS'],
+        application.config['PASSWORD_HASH_QUEUE_DEPTH'],
+        application.config['PASSWORD_HASH_EXECUTOR'],
+    )
+    application.register_error_handler(HashingUnavailable, hashing_unavailable)
+
+
+def get_password_hasher() -> PasswordHasher:
+    return current_app.extensions['password_hasher']
+
+
+def hashing_unavailable(error: HashingUnavailable) -> Response:
+    response = Response(str(error), status=503, mimetype='text/plain')
+    response.retry_after = current_app.config['PASSWORD_HASH_RETRY_AFTER']
+
+    return response
@@ -0,0 +1,386 @@
+import bisect
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from flask import current_app
+from flask import Flask
+from flask import g
+from flask import has_request_context
+from flask import request
+from sqlalchemy import event
+from werkzeug.wrappers.response import Response
+
+from app.database.caches import LRUCache
+from app.database.connections import GroupCommitWriter
+from app.database.connections import LocalConnection
+
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Labels, float]
+Metric = Tuple[str, str, str, List[Sample]]
+Collector = Callable[[], Iterable[Metric]]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0, 256.0)
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: Labels) -> List[Sample]:
+        samples: List[Sample] = []
+        cumulative = 0
+        for bucket, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bucket == float('inf') else repr(bucket)
+            samples.append((f'{name}_bucket', labels + (('le', le),), cumulative))
+
+        samples.append((f'{name}_sum', labels, self.sum))
+        samples.append((f'{name}_count', labels, self.count))
+
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.request_latency: Dict[str, Histogram] = {}
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.sql_statements: Dict[str, int] = {}
+        self.sql_seconds: Dict[str, float] = {}
+        self.slow_queries = 0
+        self.collectors: List[Collector] = []
+
+    def register_collector(self, collector: Collector) -> None:
+        self.collectors.append(collector)
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float) -> None:
+        with self.lock:
+            self.request_latency.setdefault(endpoint, Histogram()).observe(seconds)
+            self.requests[(endpoint, method, status)] = self.requests.get((endpoint, method, status), 0) + 1
+
+    def observe_statement(self, endpoint: str, seconds: float, slow: bool) -> None:
+        with self.lock:
+            self.sql_statements[endpoint] = self.sql_statements.get(endpoint, 0) + 1
+            self.sql_seconds[endpoint] = self.sql_seconds.get(endpoint, 0.0) + seconds
+            self.slow_queries += int(slow)
+
+    def collect(self) -> List[Metric]:
+        with self.lock:
+            metrics: List[Metric] = [
+                (
+                    'flask_request_duration_seconds',
+                    'histogram',
+                    'Request latency by endpoint.',
+                    [
+                        sample
+                        for endpoint, histogram in sorted(self.request_latency.items())
+                        for sample in histogram.samples('flask_request_duration_seconds', (('endpoint', endpoint),))
+                    ],
+                ),
+                (
+                    'flask_requests_total',
+                    'counter',
+                    'Requests by endpoint, method and status.',
+                    [
+                        (
+                            'flask_requests_total',
+                            (('endpoint', endpoint), ('method', method), ('status', str(status))),
+                            count,
+                        )
+                        for (endpoint, method, status), count in sorted(self.requests.items())
+                    ],
+                ),
+                (
+                    'sql_statements_total',
+                    'counter',
+                    'SQL statements executed by endpoint.',
+                    [
+                        ('sql_statements_total', (('endpoint', endpoint),), count)
+                        for endpoint, count in sorted(self.sql_statements.items())
+                    ],
+                ),
+                (
+                    'sql_duration_seconds_total',
+                    'counter',
+                    'Time spent executing SQL by endpoint.',
+                    [
+                        ('sql_duration_seconds_total', (('endpoint', endpoint),), seconds)
+                        for endpoint, seconds in sorted(self.sql_seconds.items())
+                    ],
+                ),
+                (
+                    'sql_slow_queries_total',
+                    'counter',
+                    'SQL statements slower than the slow query threshold.',
+                    [('sql_slow_queries_total', (), self.slow_queries)],
+                ),
+            ]
+
+        for collector in self.collectors:
+            metrics.extend(collector())
+
+        return metrics
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, kind, description, samples in self.collect():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for sample_name, labels, value in samples:
+                lines.append(f'{sample_name}{format_labels(labels)} {format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels: Labels) -> str:
+    if not len(labels):
+        return ''
+
+    escaped = (
+        (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def pool_collector(connection: LocalConnection) -> Collector:
+    def collect() -> Iterable[Metric]:
+        status = connection.pool_status()
+        return [
+            (
+                'database_pool_events_total',
+                'counter',
+                'Connection pool connects, checkouts and checkins.',
+                [
+                    ('database_pool_events_total', (('event', key),), status[key])
+                    for key in ('connects', 'checkouts', 'checkins')
+                ],
+            ),
+            (
+                'database_pool_connections',
+                'gauge',
+                'Connection pool size, checked out and overflow connections.',
+                [
+                    ('database_pool_connections', (('state', key),), status[key])
+                    for key in ('size', 'checked_out', 'overflow')
+                ],
+            ),
+        ]
+
+    return collect
+
+
+def replica_collector(connection: LocalConnection) -> Collector:
+    def collect() -> Iterable[Metric]:
+        status = connection.replica_set.status()
+        return [
+            (
+                'database_replica_healthy',
+                'gauge',
+                'Whether each read replica passed its last health check.',
+                [
+                    ('database_replica_healthy', (('replica', str(index)),), int(replica['healthy']))
+                    for index, replica in enumerate(status)
+                ],
+            ),
+            (
+                'database_replica_reads_total',
+                'counter',
+                'Read sessions routed to each replica.',
+                [
+                    ('database_replica_reads_total', (('replica', str(index)),), replica['reads'])
+                    for index, replica in enumerate(status)
+                ],
+            ),
+        ]
+
+    return collect
+
+
+def cache_collector(caches: Dict[str, LRUCache]) -> Collector:
+    def collect() -> Iterable[Metric]:
+        statistics = {name: cache.statistics() for name, cache in caches.items()}
+        return [
+            (
+                'cache_requests_total',
+                'counter',
+                'Cache lookups by cache and result.',
+                [
+                    ('cache_requests_total', (('cache', name), ('result', result)), values[key])
+                    for name, values in statistics.items()
+                    for result, key in (('hit', 'hits'), ('miss', 'misses'))
+                ],
+            ),
+            (
+                'cache_hit_ratio',
+                'gauge',
+                'Cache hit ratio since startup.',
+                [
+                    ('cache_hit_ratio', (('cache', name),), ratio(values['hits'], values['misses']))
+                    for name, values in statistics.items()
+                ],
+            ),
+        ]
+
+    return collect
+
+
+def group_commit_collector(writer: GroupCommitWriter) -> Collector:
+    lock = threading.Lock()
+    batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+    durations = Histogram()
+
+    def observe(size: int, seconds: float) -> None:
+        with lock:
+            batch_sizes.observe(size)
+            durations.observe(seconds)
+
+    writer.observers.append(observe)
+
+    def collect() -> Iterable[Metric]:
+        with lock:
+            return [
+                (
+                    'group_commit_queue_depth',
+                    'gauge',
+                    'Write operations waiting for the group commit writer.',
+                    [('group_commit_queue_depth', (), writer.depth())],
+                ),
+                (
+                    'group_commit_batch_size',
+                    'histogram',
+                    'Write operations applied per group commit.',
+                    batch_sizes.samples('group_commit_batch_size', ()),
+                ),
+                (
+                    'group_commit_duration_seconds',
+                    'histogram',
+                    'Time to apply and commit one group.',
+                    durations.samples('group_commit_duration_seconds', ()),
+                ),
+            ]
+
+    return collect
+
+
+def statistics_collector(name: str, description: str, statistics: Callable[[], Dict[str, int]]) -> Collector:
+    def collect() -> Iterable[Metric]:
+        return [
+            (
+                name,
+                'counter',
+                description,
+                [(name, (('event', key),), value) for key, value in sorted(statistics().items())],
+            )
+        ]
+
+    return collect
+
+
+def ratio(hits: int, misses: int) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return current_app.extensions['metrics']
+
+
+def current_endpoint() -> str:
+    return (request.endpoint or 'none') if has_request_context() else 'none'
+
+
+def configure_metrics(application: Flask) -> None:
+    registry = MetricsRegistry()
+    application.extensions['metrics'] = registry
+    connection: LocalConnection = application.extensions['database']
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        seconds = time.perf_counter() - conn.info['query_start'].pop()
+        threshold: Optional[float] = application.config['SLOW_QUERY_THRESHOLD']
+        slow = threshold is not None and seconds > threshold
+        registry.observe_statement(current_endpoint(), seconds, slow)
+        if slow:
+            application.logger.warning('Slow query (%.1f ms): %s', seconds * 1000, statement)
+
+    engines = [connection.engine]
+    engines += [replica.engine for replica in connection.replica_set.replicas]
+    engines += [shard.engine for shard in connection.shard_set]
+    if 'async_database' in application.extensions:
+        engines.append(application.extensions['async_database'].engine.sync_engine)
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+    registry.register_collector(pool_collector(connection))
+    if len(connection.replica_set):
+        registry.register_collector(replica_collector(connection))
+    if connection.writer is not None:
+        writer = connection.writer
+        registry.register_collector(group_commit_collector(writer))
+        registry.register_collector(
+            statistics_collector(
+                'group_commit_events_total',
+                'Group commit batches, operations and failed operations.',
+                writer.status,
+            )
+        )
+    registry.register_collector(
+        cache_collector({'user': connection.user_cache, 'page': application.extensions['page_cache']})
+    )
+    registry.register_collector(
+        statistics_collector(
+            'password_hasher_events_total',
+            'Password hashes, checks, rehashes and rejected submissions.',
+            application.extensions['password_hasher'].status,
+        )
+    )
+    registry.register_collector(
+        statistics_collector(
+            'auth_throttle_events_total',
+            'Login and register attempts allowed or rejected by client IP or username.',
+            lambda: dict(application.extensions['throttle'].statistics),
+        )
+    )
+
+    @application.before_request
+    def start_request_timer() -> None:
+        g.request_start = time.perf_counter()
+
+    @application.after_request
+    def observe_request(response: Response) -> Response:
+        if 'request_start' in g:
+            seconds = time.perf_counter() - g.request_start
+            registry.observe_request(current_endpoint(), request.method, response.status_code, seconds)
+
+        return response
+
+    if application.config['METRICS_ENABLED']:
+        application.add_url_rule('/metrics', endpoint='metrics', view_func=metrics)
+
+
+def metrics() -> Response:
+    return Response(get_metrics_registry().render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,108 @@
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Tuple
+
+from flask import current_app
+from flask import Flask
+from flask import request
+from werkzeug.wrappers.response import Response
+
+from app.database.caches import LRUCache
+from app.view.exceptions import RequestThrottled
+
+
+Limit = Tuple[float, float]
+
+
+class Throttle:
+    def __init__(self, limits: Dict[str, Limit], maxsize: int = 10_000) -> None:
+        self.limits = limits
+        self.buckets = LRUCache(maxsize, ttl=None)
+        self.lock = threading.Lock()
+        self.statistics: Dict[str, int] = {'allowed': 0, **{f'rejected_{kind}': 0 for kind in limits}}
+
+    def refill(self, kind: str, key: Hashable, now: float) -> float:
+        rate, burst = self.limits[kind]
+        tokens, updated = self.buckets.get((kind, key), (burst, now))
+
+        return min(burst, tokens + (now - updated) * rate)
+
+    def acquire(self, keys: Dict[str, Hashable]) -> float:
+        now = time.monotonic()
+        with self.lock:
+            tokens = {kind: self.refill(kind, key, now) for kind, key in keys.items()}
+            waits: List[Tuple[float, str]] = [
+                ((1 - available) / self.limits[kind][0], kind) for kind, available in tokens.items() if available < 1
+            ]
+            spent = 0 if len(waits) else 1
+            for kind, key in keys.items():
+                self.buckets.set((kind, key), (tokens[kind] - spent, now))
+
+            if len(waits):
+                wait, kind = max(waits)
+                self.statistics[f'rejected_{kind}'] += 1
+                return wait
+
+            self.statistics['allowed'] += 1
+            return 0.0
+
+
+def configure_throttle(application: Flask) -> None:
+    application.extensions['throttle'] = Throttle(
+        {
+            'ip': (application.config['AUTH_THROTTLE_IP_RATE'], application.config['AUTH_THROTTLE_IP_BURST']),
+            'username': (
+                application.config['AUTH_THROTTLE_USERNAME_RATE'],
+                application.config['AUTH_THROTTLE_USERNAME_BURST'],
+            ),
+        },
+        application.config['AUTH_THROTTLE_SIZE'],
+    )
+    application.register_error_handler(RequestThrottled, request_throttled)
+
+
+def get_throttle() -> Throttle:
+    return current_app.extensions['throttle']
+
+
+def check_throttle() -> None:
+    if not current_app.config['AUTH_THROTTLE_ENABLED'] or request.method != 'POST':
+        return
+
+    wait = get_throttle().acquire(
+        {'ip': request.remote_addr or '', 'username': request.form.get('username', '').casefold()}
+    )
+    if wait > 0:
+        raise RequestThrottled(wait)
+
+
+def throttled(view) -> Callable:
+    if inspect.iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def wrapped_async_view(**kwargs):
+            check_throttle()
+            return await view(**kwargs)
+
+        return wrapped_async_view
+
+    @functools.wraps(view)
+    def wrapped_view(**kwargs):
+        check_throttle()
+        return view(**kwargs)
+
+    return wrapped_view
+
+
+def request_throttled(error: RequestThrottled) -> Response:
+    response = Response(str(error), status=429, mimetype='text/plain')
+    response.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+
+    return response
@@ -0,0 +1,57 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+
+from app import constants
+
+
+class StartupReport:
+    def __init__(self) -> None:
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def total(self) -> float:
+        return sum(seconds for _, seconds in self.phases)
+
+    def render(self) -> str:
+        lines = [f'{"phase":<20} {"ms":>9}']
+        for name, seconds in self.phases + [('total', self.total())]:
+            lines.append(f'{name:<20} {seconds * 1000:>9.2f}')
+
+        return '\n'.join(lines)
+
+
+def configure_bytecode_cache(application: Flask) -> None:
+    constants.JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    application.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(constants.JINJA_CACHE_DIR.absolute()))
+
+
+def compile_templates(application: Flask) -> int:
+    names = application.jinja_env.list_templates(extensions=('html',))
+    for name in names:
+        application.jinja_env.get_template(name)
+
+    return len(names)
+
+
+def configure_warmup(application: Flask, report: StartupReport) -> None:
+    if application.config['JINJA_BYTECODE_CACHE']:
+        configure_bytecode_cache(application)
+
+    if not application.config['WARMUP_ENABLED']:
+        return
+
+    with report.phase('templates'):
+        compile_templates(application)
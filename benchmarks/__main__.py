@@ -0,0 +1,63 @@
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from app import constants
+from benchmarks.report import compare
+from benchmarks.report import format_table
+from benchmarks.suite import run_size
+
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark repositories and routes.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--data-dir', type=Path, default=constants.INSTANCE_DIR / 'benchmarks')
+    parser.add_argument('--password-method', default='scrypt')
+    parser.add_argument('--concurrency', type=int, default=8, help='Threads for the sync/async request comparison.')
+    parser.add_argument('--output', type=Path, default=Path('benchmark.json'))
+    parser.add_argument('--compare', type=Path, default=None, help='Baseline JSON file to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative slowdown.')
+
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    options = parse_arguments(arguments)
+    current: Dict = {
+        'meta': {
+            'created': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': options.iterations,
+            'concurrency': options.concurrency,
+        },
+        'results': {},
+    }
+
+    for size in options.sizes:
+        current['results'][str(size)] = run_size(
+            options.data_dir, size, options.iterations, options.password_method, options.concurrency
+        )
+
+    options.output.write_text(json.dumps(current, indent=2))
+    print(format_table(current))
+
+    if options.compare is not None:
+        regressions = compare(json.loads(options.compare.read_text()), current, options.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+
+        return 1 if len(regressions) else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict
+from typing import Iterator
+
+from werkzeug.security import generate_password_hash
+
+from app.database.connections import LocalConnection
+from app.database.migrations import MigrationRunner
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+
+
+PASSWORD = 'password'
+POSTS_PER_USER = 100
+
+
+def users(count: int, pwhash: str) -> Iterator[Dict]:
+    for index in range(count):
+        yield {'username': f'user{index}', 'password': pwhash}
+
+
+def posts(count: int, users_count: int) -> Iterator[Dict]:
+    start = datetime(2020, 1, 1)
+    for index in range(count):
+        yield {
+            'title': f'Post {index}',
+            'body': f'Body of post {index}. ' * 8,
+            'id_user': index % users_count + 1,
+            'created': start + timedelta(seconds=index),
+        }
+
+
+def remove(path: Path) -> None:
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def seed(path: Path, size: int, password_method: str) -> Path:
+    if path.exists():
+        connection = LocalConnection(f'sqlite:///{path}')
+        MigrationRunner.upgrade(connection.engine)
+        connection.dispose()
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = LocalConnection(f'sqlite:///{path}')
+    users_count = max(1, size // POSTS_PER_USER)
+    UserRepository.insert_many(connection, users(users_count, generate_password_hash(PASSWORD, password_method)))
+    PostRepository.insert_many(connection, posts(size, users_count), chunk_size=10000)
+    connection.dispose()
+
+    return path
@@ -0,0 +1,321 @@
+import argparse
+import json
+import logging
+import random
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Protocol
+from typing import Sequence
+from typing import Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import build_opener
+from urllib.request import HTTPCookieProcessor
+from urllib.request import HTTPRedirectHandler
+from urllib.request import Request
+
+from flask import Flask
+from werkzeug.serving import make_server
+
+from app import constants
+from benchmarks import datasets
+from benchmarks.report import percentile
+from benchmarks.suite import build_application
+
+
+ENDPOINTS = ('index', 'search', 'create', 'update', 'login')
+
+DEFAULT_MIX = 'index=70,search=5,create=10,update=10,login=5'
+
+OWNED_POSTS_PER_USER = 20
+
+
+class Sample(NamedTuple):
+    endpoint: str
+    status: int
+    seconds: float
+    locked: bool
+
+
+Operation = Tuple[str, str, Optional[Dict[str, str]]]
+
+
+class Client(Protocol):
+    def request(self, method: str, path: str, data: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        ...
+
+
+class InProcessClient:
+    def __init__(self, application: Flask) -> None:
+        self.client = application.test_client()
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        response = self.client.open(path, method=method, data=data)
+        return response.status_code, response.get_data()
+
+
+class NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+class HttpClient:
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()), NoRedirect())
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        body = urlencode(data).encode() if data is not None else None
+        try:
+            with self.opener.open(Request(self.base_url + path, data=body, method=method), timeout=60) as response:
+                return response.status, response.read()
+        except HTTPError as error:
+            return error.code, error.read()
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in mix.split(','):
+        endpoint, _, weight = part.partition('=')
+        if endpoint.strip() not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f'Invalid endpoint {endpoint.strip()}.')
+
+        weights[endpoint.strip()] = float(weight or 1)
+
+    return weights
+
+
+def owned_posts(path: Path, users_count: int) -> Dict[int, List[int]]:
+    owned: Dict[int, List[int]] = {}
+    with sqlite3.connect(path) as database:
+        for iduser in range(1, users_count + 1):
+            rows = database.execute(
+                'SELECT idpost FROM post WHERE id_user = ? LIMIT ?', (iduser, OWNED_POSTS_PER_USER)
+            ).fetchall()
+            owned[iduser] = [row[0] for row in rows]
+
+    return owned
+
+
+def operation(endpoint: str, iduser: int, owned: Sequence[int], generator: random.Random) -> Operation:
+    if endpoint == 'index':
+        return 'GET', '/', None
+
+    elif endpoint == 'search':
+        return 'GET', f'/search?q=post+{generator.randrange(1000)}', None
+
+    elif endpoint == 'create' or (endpoint == 'update' and not len(owned)):
+        return 'POST', '/create', {'title': 'Load title', 'body': 'Load body'}
+
+    elif endpoint == 'update':
+        return 'POST', f'/{generator.choice(owned)}/update', {'title': 'Updated title', 'body': 'Updated body'}
+
+    return 'POST', '/auth/login', {'username': f'user{iduser - 1}', 'password': datasets.PASSWORD}
+
+
+def run_user(
+    client: Client,
+    iduser: int,
+    owned: Sequence[int],
+    mix: Dict[str, float],
+    think_time: float,
+    deadline: float,
+    seed: int,
+) -> List[Sample]:
+    generator = random.Random(seed)
+    endpoints, weights = list(mix), list(mix.values())
+    client.request('POST', '/auth/login', {'username': f'user{iduser - 1}', 'password': datasets.PASSWORD})
+
+    samples: List[Sample] = []
+    while time.time() < deadline:
+        endpoint = generator.choices(endpoints, weights)[0]
+        method, path, data = operation(endpoint, iduser, owned, generator)
+        start = time.perf_counter()
+        try:
+            status, body = client.request(method, path, data)
+        except OSError:
+            status, body = 0, b''
+
+        samples.append(Sample(endpoint, status, time.perf_counter() - start, status == 503 and b'locked' in body))
+        if think_time > 0:
+            time.sleep(generator.expovariate(1 / think_time))
+
+    return samples
+
+
+def run_process(
+    process: int,
+    users: Sequence[int],
+    owned: Dict[int, List[int]],
+    options: Dict,
+) -> List[Sample]:
+    if options['base_url'] is None:
+        application = build_application(
+            Path(options['database']), options['password_method'], settings=options['settings']
+        )
+        clients: List[Client] = [InProcessClient(application) for _ in users]
+    else:
+        clients = [HttpClient(options['base_url']) for _ in users]
+
+    deadline = time.time() + options['duration']
+    with ThreadPoolExecutor(max(1, len(users))) as executor:
+        futures = [
+            executor.submit(
+                run_user,
+                client,
+                iduser,
+                owned[iduser],
+                options['mix'],
+                options['think_time'],
+                deadline,
+                process * 100_000 + iduser,
+            )
+            for client, iduser in zip(clients, users)
+        ]
+        return [sample for future in futures for sample in future.result()]
+
+
+def summarize_load(samples: Sequence[Sample], duration: float) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for endpoint in sorted({sample.endpoint for sample in samples}) + ['total']:
+        selected = [sample for sample in samples if endpoint in ('total', sample.endpoint)]
+        latencies = [sample.seconds for sample in selected]
+        errors = sum(1 for sample in selected if sample.status == 0 or sample.status >= 500)
+        results[endpoint] = {
+            'requests': len(selected),
+            'throughput': len(selected) / duration,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'error_rate': errors / len(selected),
+            'lock_timeouts': sum(1 for sample in selected if sample.locked),
+        }
+
+    return results
+
+
+def format_load_table(results: Dict[str, Dict[str, float]]) -> str:
+    lines = [
+        f'{"endpoint":<10} {"requests":>9} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} '
+        f'{"errors":>7} {"locked":>7}'
+    ]
+    for endpoint, result in results.items():
+        lines.append(
+            f'{endpoint:<10} {result["requests"]:>9} {result["throughput"]:>9.1f} {result["p50_ms"]:>9.2f} '
+            f'{result["p95_ms"]:>9.2f} {result["p99_ms"]:>9.2f} {result["error_rate"]:>7.1%} '
+            f'{result["lock_timeouts"]:>7}'
+        )
+
+    return '\n'.join(lines)
+
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.load', description='Drive mixed read/write load against the application.'
+    )
+    parser.add_argument('--size', type=int, default=10_000, help='Posts in the seeded dataset.')
+    parser.add_argument('--users', type=int, default=16, help='Concurrent virtual users.')
+    parser.add_argument('--processes', type=int, default=4, help='Worker processes sharing the users.')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per process.')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Mean pause between requests in seconds.')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f'Defaults to {DEFAULT_MIX}.')
+    parser.add_argument('--target', choices=('inprocess', 'server'), default='inprocess')
+    parser.add_argument('--profile', default='default', help='SQLite profile of the application under load.')
+    parser.add_argument('--page-cache', action='store_true', help='Keep the page cache enabled.')
+    parser.add_argument('--group-commit', action='store_true', help='Batch post writes through the group commit writer.')
+    parser.add_argument('--data-dir', type=Path, default=constants.INSTANCE_DIR / 'benchmarks')
+    parser.add_argument('--password-method', default='pbkdf2:sha256:10000')
+    parser.add_argument('--output', type=Path, default=Path('load.json'))
+
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    options = parse_arguments(arguments)
+    dataset = datasets.seed(
+        options.data_dir / f'posts-{options.size}-{options.password_method}.sqlite', options.size, options.password_method
+    )
+    path = options.data_dir / f'load-{options.size}.sqlite'
+    datasets.remove(path)
+    shutil.copyfile(dataset, path)
+
+    users_count = max(1, options.size // datasets.POSTS_PER_USER)
+    owned = owned_posts(path, users_count)
+    users = [index % users_count + 1 for index in range(options.users)]
+
+    settings = {
+        'TESTING': False,
+        'PAGE_CACHE_ENABLED': options.page_cache,
+        'DATABASE_PROFILE': options.profile,
+        'SLOW_QUERY_THRESHOLD': None,
+        'DATABASE_GROUP_COMMIT': options.group_commit,
+    }
+    server = None
+    base_url = None
+    if options.target == 'server':
+        application = build_application(path, options.password_method, settings=settings)
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        server = make_server('127.0.0.1', 0, application, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+
+    process_options = {
+        'base_url': base_url,
+        'database': str(path),
+        'password_method': options.password_method,
+        'settings': settings,
+        'duration': options.duration,
+        'think_time': options.think_time,
+        'mix': options.mix,
+    }
+    processes = max(1, min(options.processes, options.users))
+    with ProcessPoolExecutor(processes) as executor:
+        futures = [
+            executor.submit(run_process, process, users[process::processes], owned, process_options)
+            for process in range(processes)
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+
+    if server is not None:
+        server.shutdown()
+    datasets.remove(path)
+
+    results = summarize_load(samples, options.duration)
+    options.output.write_text(
+        json.dumps(
+            {
+                'meta': {
+                    'size': options.size,
+                    'users': options.users,
+                    'processes': processes,
+                    'duration': options.duration,
+                    'think_time': options.think_time,
+                    'mix': options.mix,
+                    'target': options.target,
+                    'profile': options.profile,
+                    'group_commit': options.group_commit,
+                },
+                'results': results,
+            },
+            indent=2,
+        )
+    )
+    print(format_load_table(results))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
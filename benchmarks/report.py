@@ -0,0 +1,59 @@
+import statistics
+from typing import Dict
+from typing import List
+from typing import Sequence
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+
+    return ordered[index]
+
+
+def summarize(samples: Sequence[float], statements: int) -> Dict[str, float]:
+    total = sum(samples)
+
+    return {
+        'iterations': len(samples),
+        'throughput': len(samples) / total if total else 0.0,
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': percentile(samples, 0.50) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'statements': statements / len(samples),
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    regressions: List[str] = []
+    for size, cases in current['results'].items():
+        for name, result in cases.items():
+            previous = baseline.get('results', {}).get(size, {}).get(name, None)
+            if previous is None:
+                continue
+
+            if result['p50_ms'] > previous['p50_ms'] * (1 + threshold):
+                regressions.append(f'{size}/{name}: p50 {previous["p50_ms"]:.3f}ms -> {result["p50_ms"]:.3f}ms')
+
+            if result['p99_ms'] > previous['p99_ms'] * (1 + threshold):
+                regressions.append(f'{size}/{name}: p99 {previous["p99_ms"]:.3f}ms -> {result["p99_ms"]:.3f}ms')
+
+            if result['statements'] > previous['statements']:
+                regressions.append(
+                    f'{size}/{name}: statements {previous["statements"]:.1f} -> {result["statements"]:.1f}'
+                )
+
+    return regressions
+
+
+def format_table(current: Dict) -> str:
+    lines = [f'{"size":>9} {"case":<40} {"ops/s":>10} {"p50 ms":>9} {"p99 ms":>9} {"sql":>6} {"peak MB":>8}']
+    for size, cases in current['results'].items():
+        for name, result in cases.items():
+            peak = f'{result["peak_mb"]:>8.1f}' if 'peak_mb' in result else f'{"-":>8}'
+            lines.append(
+                f'{size:>9} {name:<40} {result["throughput"]:>10.1f} {result["p50_ms"]:>9.3f} '
+                f'{result["p99_ms"]:>9.3f} {result["statements"]:>6.1f} {peak}'
+            )
+
+    return '\n'.join(lines)
@@ -0,0 +1,202 @@
+import gc
+import random
+import shutil
+import time
+import tracemalloc
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from flask import Flask
+from sqlalchemy.engine import Engine
+
+from app.database.connections import LocalConnection
+from app.database.connections import StatementCounter
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+from app.view.cursors import encode_cursor
+from benchmarks import datasets
+from benchmarks.report import summarize
+
+
+Case = Tuple[str, Callable[[], object], int]
+
+FULL_LISTING_LIMIT = 100_000
+
+
+def repository_cases(connection: LocalConnection, size: int, iterations: int) -> Iterator[Case]:
+    generator = random.Random(0)
+    users_count = max(1, size // datasets.POSTS_PER_USER)
+
+    def random_post() -> Dict:
+        return PostRepository.select_one(connection, idpost=generator.randint(1, size))
+
+    yield 'user.select_one', lambda: UserRepository.select_one(
+        connection, username=f'user{generator.randrange(users_count)}'
+    ), iterations
+    yield 'user.select_shallow', lambda: UserRepository.select_shallow(
+        connection, generator.randint(1, users_count)
+    ), iterations
+    yield 'post.select_one', random_post, iterations
+
+    def select_page() -> Dict:
+        post = random_post()
+        return PostRepository.select_page(connection, post['created'], post['idpost'], 20)
+
+    yield 'post.select_page', select_page, iterations
+
+    if size <= FULL_LISTING_LIMIT:
+        yield 'post.select_all', lambda: PostRepository.select_all(connection), max(1, iterations // 50)
+        yield 'post.select_all.joined', lambda: PostRepository.select_all(
+            connection, strategy='joined'
+        ), max(1, iterations // 50)
+
+    yield 'post.insert_one', lambda: PostRepository.insert_one(
+        connection, 'Title', 'Body', generator.randint(1, users_count)
+    ), iterations
+    yield 'post.update_one', lambda: PostRepository.update_one(
+        connection, generator.randint(1, size), title='Updated title'
+    ), iterations
+
+
+def memory_cases(connection: LocalConnection, size: int) -> Iterator[Tuple[str, Callable[[], object]]]:
+    if size <= FULL_LISTING_LIMIT:
+        yield 'post.select_all', lambda: PostRepository.select_all(connection)
+        yield 'post.select_all.joined', lambda: PostRepository.select_all(connection, strategy='joined')
+
+
+def build_application(
+    path: Path, password_method: str, asynchronous: bool = False, settings: Optional[Dict[str, Any]] = None
+) -> Flask:
+    return create_app(
+        {
+            'TESTING': True,
+            'DATABASE_URL': f'sqlite:///{path}',
+            'DATABASE_ASYNC': asynchronous,
+            'PAGE_CACHE_ENABLED': False,
+            'PASSWORD_HASH_METHOD': password_method,
+            'AUTH_THROTTLE_ENABLED': False,
+            **(settings or {}),
+        }
+    )
+
+
+def route_cases(application: Flask, iterations: int) -> Iterator[Case]:
+    anonymous = application.test_client()
+    author = application.test_client()
+    with author.session_transaction() as session:
+        session['iduser'] = 1
+
+    cursor = anonymous.get('/').text.rsplit('cursor=', 1)[-1].split('"', 1)[0]
+
+    yield 'route.blog.index', lambda: anonymous.get('/'), iterations
+    yield 'route.blog.index.page2', lambda: anonymous.get(f'/?cursor={cursor}'), iterations
+    yield 'route.blog.create', lambda: author.post('/create', data={'title': 'Title', 'body': 'Body'}), iterations
+    yield 'route.auth.login', lambda: anonymous.post(
+        '/auth/login', data={'username': 'user0', 'password': datasets.PASSWORD}
+    ), max(1, iterations // 10)
+
+
+def concurrent_cases(application: Flask, size: int, iterations: int) -> Iterator[Case]:
+    generator = random.Random(0)
+    connection: LocalConnection = application.extensions['database']
+
+    def random_page() -> object:
+        post = PostRepository.select_one(connection, idpost=generator.randint(1, size))
+        cursor = encode_cursor(post)
+        return application.test_client().get(f'/?cursor={cursor}')
+
+    yield 'blog.index', lambda: application.test_client().get('/'), iterations
+    yield 'blog.index.random_page', random_page, iterations
+
+
+def measure(connection: LocalConnection, function: Callable[[], object], iterations: int) -> Dict[str, float]:
+    samples: List[float] = []
+    with StatementCounter(connection.engine) as counter:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            function()
+            samples.append(time.perf_counter() - start)
+
+    return summarize(samples, counter.count)
+
+
+def measure_concurrent(
+    engines: Sequence[Engine], function: Callable[[], object], iterations: int, concurrency: int
+) -> Dict[str, float]:
+    def timed(_: int) -> float:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+
+    with ExitStack() as stack:
+        counters = [stack.enter_context(StatementCounter(engine)) for engine in engines]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            samples = list(executor.map(timed, range(iterations)))
+        elapsed = time.perf_counter() - start
+
+    summary = summarize(samples, sum(counter.count for counter in counters))
+    summary['throughput'] = iterations / elapsed
+
+    return summary
+
+
+def measure_memory(function: Callable[[], object]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / 2**20
+
+
+def run_size(
+    data_dir: Path, size: int, iterations: int, password_method: str, concurrency: int = 8
+) -> Dict[str, Dict[str, float]]:
+    dataset = datasets.seed(data_dir / f'posts-{size}.sqlite', size, password_method)
+    path = data_dir / f'work-{size}.sqlite'
+    datasets.remove(path)
+    shutil.copyfile(dataset, path)
+
+    results: Dict[str, Dict[str, float]] = {}
+    application = build_application(path, password_method)
+    connection: LocalConnection = application.extensions['database']
+    for name, function, count in repository_cases(connection, size, iterations):
+        results[name] = measure(connection, function, count)
+
+    for name, function in memory_cases(connection, size):
+        results[name]['peak_mb'] = measure_memory(function)
+
+    for name, function, count in route_cases(application, iterations):
+        results[name] = measure(connection, function, count)
+
+    connection.dispose()
+
+    for stack, asynchronous in (('sync', False), ('async', True)):
+        application = build_application(path, password_method, asynchronous)
+        connection = application.extensions['database']
+        engines = [connection.engine]
+        if asynchronous:
+            engines.append(application.extensions['async_database'].engine.sync_engine)
+
+        for name, function, count in concurrent_cases(application, size, iterations):
+            results[f'concurrent.{stack}.{name}'] = measure_concurrent(engines, function, count, concurrency)
+
+        connection.dispose()
+
+    datasets.remove(path)
+
+    return results
@@ -1,8 +1,23 @@
+import argparse
+from typing import List
+from typing import Optional
+
 from app.view.application import create_app
 
 
-def main() -> None:
-    create_app()
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Create the application.')
+    parser.add_argument('--startup-report', action='store_true', help='Print time spent per startup phase.')
+
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    options = parse_arguments(arguments)
+    application = create_app()
+
+    if options.startup_report:
+        print(application.extensions['startup_report'].render())
 
 
 if __name__ == '__main__':
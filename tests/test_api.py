@@ -0,0 +1,72 @@
+import json
+import tracemalloc
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite', 'EXPORT_BATCH_SIZE': 2})
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+@pytest.fixture(scope='function')
+def client(application: Flask) -> FlaskClient:
+    connection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    for index in range(5):
+        PostRepository.insert_one(connection, f'Title {index}', 'Body', user['iduser'])
+
+    return application.test_client()
+
+
+def test_posts_must_stream_ndjson(client: FlaskClient) -> None:
+    response = client.get('/api/posts')
+    posts = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.mimetype == 'application/x-ndjson'
+    assert [post['title'] for post in posts] == [f'Title {index}' for index in range(5)]
+    assert posts[0]['username'] == 'admin'
+
+
+def test_posts_must_stream_json_array(client: FlaskClient) -> None:
+    response = client.get('/api/posts?format=json')
+
+    assert response.mimetype == 'application/json'
+    assert len(json.loads(response.text)) == 5
+
+
+def test_posts_must_filter_since(client: FlaskClient) -> None:
+    posts = [json.loads(line) for line in client.get('/api/posts').text.splitlines()]
+    response = client.get('/api/posts', query_string={'since': posts[2]['created']})
+
+    assert [json.loads(line)['title'] for line in response.text.splitlines()] == ['Title 3', 'Title 4']
+
+
+def test_posts_must_reject_invalid_since(client: FlaskClient) -> None:
+    assert client.get('/api/posts?since=yesterday').status_code == 400
+
+
+def test_iterate_must_keep_memory_flat(application: Flask) -> None:
+    connection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    registers = ({'title': f'Title {index}', 'body': 'Body ' * 50, 'id_user': user['iduser']} for index in range(20000))
+    PostRepository.insert_many(connection, registers, chunk_size=5000)
+
+    tracemalloc.start()
+    count = sum(1 for _ in PostRepository.iterate(connection, batch_size=500))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == 20000
+    assert peak < 2 * 1024 * 1024
@@ -0,0 +1,117 @@
+import sqlite3
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+
+from app.database.connections import assert_max_statements
+from app.database.connections import UnitOfWork
+from app.database.migrations import MigrationRunner
+from app.database.repositories import PostRepository
+from app.view.application import create_app
+from app.view.database import get_database_connection
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite'})
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_create_app_must_register_database_connection(application: Flask) -> None:
+    with application.app_context():
+        connection = get_database_connection()
+
+    assert connection is application.extensions['database']
+
+
+def test_get_database_connection_must_reuse_connection_between_requests(application: Flask) -> None:
+    client = application.test_client()
+    client.get('/')
+    connects = application.extensions['database'].pool_status()['connects']
+    client.get('/')
+
+    assert application.extensions['database'].pool_status()['connects'] == connects
+
+
+def test_unit_of_work_must_use_one_connection_per_request() -> None:
+    application = create_app(
+        {'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite', 'DATABASE_UNIT_OF_WORK': True}
+    )
+    connection = application.extensions['database']
+    client = application.test_client()
+    client.post('/auth/register', data={'username': 'admin', 'password': 'admin'})
+    client.post('/auth/login', data={'username': 'admin', 'password': 'admin'})
+
+    checkouts = connection.pool_status()['checkouts']
+    with assert_max_statements(connection.engine, 3):
+        client.post('/create', data={'title': 'Title', 'body': 'Body'})
+
+    assert connection.pool_status()['checkouts'] == checkouts + 1
+    connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_failed_unit_of_work_commit_must_fail_the_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    application = create_app(
+        {
+            'TESTING': True,
+            'PROPAGATE_EXCEPTIONS': False,
+            'DATABASE_URL': 'sqlite:///test.sqlite',
+            'DATABASE_UNIT_OF_WORK': True,
+        }
+    )
+    connection = application.extensions['database']
+    client = application.test_client()
+    client.post('/auth/register', data={'username': 'admin', 'password': 'admin'})
+    client.post('/auth/login', data={'username': 'admin', 'password': 'admin'})
+
+    def commit(self: UnitOfWork) -> None:
+        raise OperationalError('COMMIT', {}, sqlite3.OperationalError('database is locked'))
+
+    monkeypatch.setattr(UnitOfWork, 'commit', commit)
+    response = client.post('/create', data={'title': 'Title', 'body': 'Body'})
+    monkeypatch.undo()
+
+    assert response.status_code == 500
+    assert PostRepository.select_all(connection) == []
+    connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_db_upgrade_command_must_report_schema_version(application: Flask) -> None:
+    result = application.test_cli_runner().invoke(args=['db', 'upgrade'])
+
+    assert f'Schema version {MigrationRunner.head()}.' in result.output
+
+
+def test_import_commands_must_stream_jsonl_files(application: Flask, tmp_path: Path) -> None:
+    users = tmp_path / 'users.jsonl'
+    users.write_text('{"username": "admin", "password": "admin"}\n\nnot json\n')
+    posts = tmp_path / 'posts.jsonl'
+    posts.write_text('{"title": "Title", "body": "Body", "id_user": 1}\n')
+    runner = application.test_cli_runner()
+
+    users_result = runner.invoke(args=['import', 'users', str(users)])
+    posts_result = runner.invoke(args=['import', 'posts', str(posts)])
+
+    assert 'Imported 1 users.' in users_result.output
+    assert 'Register 2: Invalid user register.' in users_result.output
+    assert 'Imported 1 posts.' in posts_result.output
+
+
+def test_locked_database_must_answer_service_unavailable(application: Flask) -> None:
+    application.config['TESTING'] = False
+
+    @application.route('/locked')
+    def locked() -> str:
+        raise OperationalError('INSERT INTO post', {}, sqlite3.OperationalError('database is locked'))
+
+    response = application.test_client().get('/locked')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
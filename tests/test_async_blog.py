@@ -0,0 +1,65 @@
+import re
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app(
+        {
+            'TESTING': True,
+            'DATABASE_URL': 'sqlite:///test.sqlite',
+            'DATABASE_ASYNC': True,
+            'POSTS_PER_PAGE': 2,
+            'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        }
+    )
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+@pytest.fixture(scope='function')
+def client(application: Flask) -> FlaskClient:
+    connection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    for index in range(5):
+        PostRepository.insert_one(connection, f'Title {index}', 'Body', user['iduser'])
+
+    return application.test_client()
+
+
+def test_async_index_must_paginate_posts(client: FlaskClient) -> None:
+    first_page = client.get('/').text
+    next_cursor = re.findall(r'cursor=([\w-]+)">Older', first_page)[0]
+
+    assert re.findall(r'<h1>(Title \d)</h1>', first_page) == ['Title 4', 'Title 3']
+    assert re.findall(r'<h1>(Title \d)</h1>', client.get(f'/?cursor={next_cursor}').text) == ['Title 2', 'Title 1']
+
+
+def test_async_register_login_and_create_post(application: Flask, client: FlaskClient) -> None:
+    client.post('/auth/register', data={'username': 'writer', 'password': 'secret'})
+    response = client.post('/auth/login', data={'username': 'writer', 'password': 'secret'})
+    created = client.post('/create', data={'title': 'Async', 'body': 'Body'})
+
+    assert response.status_code == 302
+    assert created.status_code == 302
+    assert '<h1>Async</h1>' in client.get('/').text
+
+
+def test_async_update_and_delete_must_reject_other_users(application: Flask, client: FlaskClient) -> None:
+    other = UserRepository.insert_one(application.extensions['database'], 'other', 'other')
+    with client.session_transaction() as session:
+        session['iduser'] = other['iduser']
+
+    assert client.post('/1/update', data={'title': 'Changed', 'body': 'Body'}).status_code == 403
+    assert client.post('/1/delete').status_code == 403
+    assert client.post('/99/delete').status_code == 404
@@ -0,0 +1,90 @@
+import asyncio
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from app.database.connections import AsyncLocalConnection
+from app.database.connections import LocalConnection
+from app.database.exceptions import AlreadyRegistered
+from app.database.exceptions import NotRegisterOwner
+from app.database.repositories import AsyncPostRepository
+from app.database.repositories import AsyncUserRepository
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+
+
+@pytest.fixture(scope='function')
+def connection() -> Iterator[LocalConnection]:
+    local_connection = LocalConnection('sqlite:///test.sqlite')
+    yield local_connection
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+@pytest.fixture(scope='function')
+def async_connection(connection: LocalConnection) -> AsyncLocalConnection:
+    return AsyncLocalConnection.from_connection(connection)
+
+
+def test_async_insert_one_must_be_visible_to_sync_repository(
+    connection: LocalConnection, async_connection: AsyncLocalConnection
+) -> None:
+    async def insert() -> dict:
+        user = await AsyncUserRepository.insert_one(async_connection, 'admin', 'admin')
+        return await AsyncPostRepository.insert_one(async_connection, 'Title', 'Body', user['iduser'])
+
+    post = asyncio.run(insert())
+
+    assert PostRepository.select_one(connection, idpost=post['idpost'])['username'] == 'admin'
+    assert connection.generation == 1
+
+
+def test_async_insert_one_raises_exception_if_already_registered(
+    connection: LocalConnection, async_connection: AsyncLocalConnection
+) -> None:
+    UserRepository.insert_one(connection, 'admin', 'admin')
+
+    with pytest.raises(AlreadyRegistered):
+        asyncio.run(AsyncUserRepository.insert_one(async_connection, 'admin', 'admin'))
+
+
+def test_async_select_page_must_match_sync_select_page(
+    connection: LocalConnection, async_connection: AsyncLocalConnection
+) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    for index in range(5):
+        PostRepository.insert_one(connection, f'Title {index}', 'Body flask', user['iduser'])
+
+    page = asyncio.run(AsyncPostRepository.select_page(async_connection, limit=3))
+    search = asyncio.run(AsyncPostRepository.search(async_connection, 'flask', limit=3))
+
+    assert page == PostRepository.select_page(connection, limit=3)
+    assert search == PostRepository.search(connection, 'flask', limit=3)
+
+
+def test_async_update_owned_raises_exception_if_not_owner(
+    connection: LocalConnection, async_connection: AsyncLocalConnection
+) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    other = UserRepository.insert_one(connection, 'other', 'other')
+    post = PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+
+    with pytest.raises(NotRegisterOwner):
+        asyncio.run(AsyncPostRepository.update_owned(async_connection, post['idpost'], other['iduser'], 'New', 'Body'))
+
+    asyncio.run(AsyncPostRepository.delete_owned(async_connection, post['idpost'], user['iduser']))
+
+    assert PostRepository.select_all(connection) == []
+
+
+def test_async_connections_must_be_pooled_between_event_loops(
+    connection: LocalConnection, async_connection: AsyncLocalConnection
+) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+
+    for _ in range(3):
+        asyncio.run(AsyncUserRepository.select_shallow(async_connection, user['iduser']))
+
+    assert async_connection.statistics['connects'] == 1
+    asyncio.run(async_connection.dispose())
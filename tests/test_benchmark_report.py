@@ -0,0 +1,27 @@
+from benchmarks.report import compare
+from benchmarks.report import percentile
+from benchmarks.report import summarize
+
+
+def test_percentile_must_pick_nearest_rank() -> None:
+    samples = [float(value) for value in range(1, 101)]
+
+    assert percentile(samples, 0.50) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+
+
+def test_summarize_must_average_statements_per_iteration() -> None:
+    summary = summarize([0.001, 0.002], statements=6)
+
+    assert summary['iterations'] == 2
+    assert summary['statements'] == 3
+
+
+def test_compare_must_flag_slower_cases_above_threshold() -> None:
+    baseline = {'results': {'1000': {'case': {'p50_ms': 1.0, 'p99_ms': 2.0, 'statements': 1.0}}}}
+    current = {'results': {'1000': {'case': {'p50_ms': 1.5, 'p99_ms': 2.1, 'statements': 2.0}}}}
+
+    regressions = compare(baseline, current, threshold=0.10)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith('1000/case: p50')
@@ -0,0 +1,137 @@
+import re
+from pathlib import Path
+from typing import Iterator
+from typing import List
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app.database.connections import StatementCounter
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite', 'POSTS_PER_PAGE': 2})
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+@pytest.fixture(scope='function')
+def client(application: Flask) -> FlaskClient:
+    connection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    for index in range(5):
+        PostRepository.insert_one(connection, f'Title {index}', 'Body', user['iduser'])
+
+    return application.test_client()
+
+
+def titles(html: str) -> List[str]:
+    return re.findall(r'<h1>(Title \d)</h1>', html)
+
+
+def test_index_must_paginate_posts(client: FlaskClient) -> None:
+    response = client.get('/')
+
+    assert titles(response.text) == ['Title 4', 'Title 3']
+    assert 'Newer' not in response.text
+
+
+def test_index_must_follow_next_and_previous_cursors(client: FlaskClient) -> None:
+    first_page = client.get('/').text
+    next_cursor = re.findall(r'cursor=([\w-]+)">Older', first_page)[0]
+    second_page = client.get(f'/?cursor={next_cursor}').text
+    previous_cursor = re.findall(r'cursor=([\w-]+)">Newer', second_page)[0]
+
+    assert titles(second_page) == ['Title 2', 'Title 1']
+    assert titles(client.get(f'/?cursor={previous_cursor}').text) == ['Title 4', 'Title 3']
+
+
+def test_index_must_reject_invalid_cursor(client: FlaskClient) -> None:
+    response = client.get('/?cursor=invalid')
+
+    assert response.status_code == 400
+
+
+def test_index_must_answer_not_modified_for_matching_etag(client: FlaskClient) -> None:
+    response = client.get('/')
+    cached_response = client.get('/', headers={'If-None-Match': response.headers['ETag']})
+
+    assert response.status_code == 200
+    assert cached_response.status_code == 304
+
+
+def test_index_must_not_render_again_while_cached(application: Flask, client: FlaskClient) -> None:
+    client.get('/')
+
+    with StatementCounter(application.extensions['database'].engine) as counter:
+        client.get('/')
+
+    assert counter.count == 0
+
+
+def test_index_must_change_etag_after_post_write(application: Flask, client: FlaskClient) -> None:
+    etag = client.get('/').headers['ETag']
+    PostRepository.insert_one(application.extensions['database'], 'Title 5', 'Body', 1)
+    response = client.get('/', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert titles(response.text) == ['Title 5', 'Title 4']
+
+
+def test_search_must_escape_and_highlight_snippets(application: Flask, client: FlaskClient) -> None:
+    PostRepository.insert_one(application.extensions['database'], 'Markup', '<script>flask</script>', 1)
+    response = client.get('/search?q=flask')
+
+    assert '&lt;script&gt;<mark>flask</mark>&lt;/script&gt;' in response.text
+
+
+def test_search_rebuild_command_must_reindex_posts(application: Flask) -> None:
+    result = application.test_cli_runner().invoke(args=['search', 'rebuild'])
+
+    assert 'Rebuilt the post search index.' in result.output
+
+
+def login(client: FlaskClient, iduser: int) -> None:
+    with client.session_transaction() as session:
+        session['iduser'] = iduser
+
+
+def test_update_must_require_login(client: FlaskClient) -> None:
+    response = client.post('/1/update', data={'title': 'Changed', 'body': 'Body'})
+
+    assert response.status_code == 302
+    assert '/auth/login' in response.headers['Location']
+
+
+def test_update_must_write_in_a_single_statement(application: Flask, client: FlaskClient) -> None:
+    login(client, 1)
+    client.get('/')
+
+    with StatementCounter(application.extensions['database'].engine) as counter:
+        response = client.post('/1/update', data={'title': 'Changed', 'body': 'Body'})
+
+    assert response.status_code == 302
+    assert len([statement for statement in counter.statements if statement.startswith('UPDATE post')]) == 1
+    assert PostRepository.select_one(application.extensions['database'], idpost=1)['title'] == 'Changed'
+
+
+def test_update_and_delete_must_reject_other_users(application: Flask, client: FlaskClient) -> None:
+    other = UserRepository.insert_one(application.extensions['database'], 'other', 'other')
+    login(client, other['iduser'])
+
+    assert client.post('/1/update', data={'title': 'Changed', 'body': 'Body'}).status_code == 403
+    assert client.post('/1/delete').status_code == 403
+    assert client.post('/99/delete').status_code == 404
+
+
+def test_feed_rebuild_command_must_report_posts(application: Flask, client: FlaskClient) -> None:
+    result = application.test_cli_runner().invoke(args=['feed', 'rebuild'])
+
+    assert 'Rebuilt the feed with 5 posts.' in result.output
@@ -0,0 +1,108 @@
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+from app.view.compression import precompress
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite'})
+    connection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    for index in range(10):
+        PostRepository.insert_one(connection, f'Title {index}', 'Body ' * 50, user['iduser'])
+
+    yield application
+    connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_index_must_be_gzip_compressed_when_accepted(application: Flask) -> None:
+    client = application.test_client()
+    plain = client.get('/')
+    response = client.get('/', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+
+    assert plain.headers.get('Content-Encoding') is None
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) < len(plain.data)
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_compressed_page_must_revalidate_with_weak_etag(application: Flask) -> None:
+    client = application.test_client()
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['ETag'].startswith('W/')
+    assert client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def test_small_or_refused_responses_must_not_be_compressed(application: Flask) -> None:
+    application.config['COMPRESSION_MIN_SIZE'] = 1_000_000
+    client = application.test_client()
+
+    assert client.get('/', headers={'Accept-Encoding': 'gzip'}).headers.get('Content-Encoding') is None
+
+    application.config['COMPRESSION_MIN_SIZE'] = 0
+    refused = client.get('/', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert refused.headers.get('Content-Encoding') is None
+
+
+def test_streamed_export_must_be_compressed_incrementally(application: Flask) -> None:
+    response = application.test_client().get(
+        '/api/posts?format=json', headers={'Accept-Encoding': 'gzip'}, buffered=False
+    )
+    chunks = list(response.iter_encoded())
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert len(chunks) > 1
+    assert len(json.loads(gzip.decompress(b''.join(chunks)))) == 10
+
+
+def test_precompressed_static_files_must_be_served(application: Flask, tmp_path: Path) -> None:
+    stylesheet = tmp_path / 'css' / 'style.css'
+    stylesheet.parent.mkdir()
+    stylesheet.write_text('body { color: black; }\n' * 100)
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG' * 1000)
+
+    written = precompress(tmp_path, ['gzip'], 500, application.config['COMPRESSION_MIMETYPES'])
+    application.static_folder = str(tmp_path)
+    client = application.test_client()
+    response = client.get('/static/css/style.css', headers={'Accept-Encoding': 'gzip'})
+    plain = client.get('/static/css/style.css')
+
+    assert written == [tmp_path / 'css' / 'style.css.gz']
+    assert precompress(tmp_path, ['gzip'], 500, application.config['COMPRESSION_MIMETYPES']) == []
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'text/css'
+    assert gzip.decompress(response.get_data()) == stylesheet.read_bytes()
+    assert plain.headers.get('Content-Encoding') is None
+    assert plain.get_data() == stylesheet.read_bytes()
+    response.close()
+    plain.close()
+
+
+def test_stale_precompressed_static_files_must_not_be_served(application: Flask, tmp_path: Path) -> None:
+    stylesheet = tmp_path / 'style.css'
+    stylesheet.write_text('body { color: black; }\n' * 100)
+    precompress(tmp_path, ['gzip'], 500, application.config['COMPRESSION_MIMETYPES'])
+    stylesheet.write_text('body { color: red; }\n' * 100)
+    compressed = tmp_path / 'style.css.gz'
+    os.utime(stylesheet, (compressed.stat().st_atime, compressed.stat().st_mtime + 1))
+
+    application.static_folder = str(tmp_path)
+    response = application.test_client().get('/static/style.css', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers.get('Content-Encoding') is None
+    assert response.get_data() == stylesheet.read_bytes()
+    response.close()
@@ -0,0 +1,95 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from sqlalchemy import text
+
+from app.database.connections import LocalConnection
+from app.database.connections import StatementCounter
+from app.database.entities import FEED_EXCERPT_LENGTH
+from app.database.repositories import FeedRepository
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+
+
+@pytest.fixture(scope='function')
+def connection() -> Iterator[LocalConnection]:
+    local_connection = LocalConnection('sqlite:///test.sqlite')
+    yield local_connection
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_feed_must_follow_post_writes(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    first = PostRepository.insert_one(connection, 'First', 'Body', user['iduser'])
+    second = PostRepository.insert_one(connection, 'Second', 'Body', user['iduser'])
+    PostRepository.update_owned(connection, first['idpost'], user['iduser'], 'Changed', 'Body')
+    PostRepository.delete_owned(connection, second['idpost'], user['iduser'])
+
+    page = FeedRepository.select_page(connection)
+
+    assert [post['title'] for post in page['posts']] == ['Changed']
+    assert page['posts'][0]['username'] == 'admin'
+
+
+def test_feed_must_follow_bulk_inserts(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    posts = ({'title': f'Title {index}', 'body': 'Body', 'id_user': user['iduser']} for index in range(5))
+    PostRepository.insert_many(connection, posts)
+
+    assert len(FeedRepository.select_page(connection, limit=10)['posts']) == 5
+
+
+def test_feed_must_store_body_excerpt(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    PostRepository.insert_one(connection, 'Title', 'x' * (FEED_EXCERPT_LENGTH * 2), user['iduser'])
+
+    assert len(FeedRepository.select_page(connection)['posts'][0]['body']) == FEED_EXCERPT_LENGTH
+
+
+def test_feed_page_must_match_post_page(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    for index in range(5):
+        PostRepository.insert_one(connection, f'Title {index}', 'Body', user['iduser'])
+
+    first_page = FeedRepository.select_page(connection, limit=2)
+    last = first_page['posts'][-1]
+
+    assert first_page == PostRepository.select_page(connection, limit=2)
+    assert FeedRepository.select_page(connection, last['created'], last['idpost'], 2) == PostRepository.select_page(
+        connection, last['created'], last['idpost'], 2
+    )
+
+
+def test_feed_page_must_scan_index_without_join(connection: LocalConnection) -> None:
+    statement = FeedRepository.page_statement(datetime(2024, 1, 1), 1).compile(
+        connection.engine, compile_kwargs={'literal_binds': True}
+    )
+    with connection.engine.connect() as database:
+        plan = ' '.join(row[-1] for row in database.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}'))
+
+    assert 'ix_feed_created_idpost' in plan
+    assert 'user' not in plan
+
+
+def test_rebuild_must_repair_drift(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+    with connection.engine.begin() as database:
+        database.execute(text('DELETE FROM feed'))
+
+    assert FeedRepository.rebuild(connection) == 1
+    assert len(FeedRepository.select_page(connection)['posts']) == 1
+
+
+def test_index_must_read_feed_in_one_statement(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+
+    with StatementCounter(connection.engine) as counter:
+        FeedRepository.select_page(connection)
+
+    assert counter.count == 1
+    assert 'FROM feed' in counter.statements[0]
@@ -0,0 +1,146 @@
+import threading
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database.connections import LocalConnection
+from app.database.entities import UserEntity
+from app.database.exceptions import RegisterNotFound
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+
+
+@pytest.fixture(scope='function')
+def connection() -> Iterator[LocalConnection]:
+    local_connection = LocalConnection('sqlite:///test.sqlite', group_commit=True, group_commit_delay=0.05)
+    yield local_connection
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_concurrent_inserts_must_share_commits(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    barrier = threading.Barrier(16)
+    posts = []
+
+    def insert() -> None:
+        barrier.wait()
+        posts.append(PostRepository.insert_one(connection, 'Title', 'Body', user['iduser']))
+
+    threads = [threading.Thread(target=insert) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert connection.writer is not None
+    assert len({post['idpost'] for post in posts}) == 16
+    assert connection.writer.statistics['operations'] == 16
+    assert connection.writer.statistics['batches'] < 16
+    assert connection.generation == connection.writer.statistics['batches']
+
+
+def test_batch_must_run_its_savepoints_inside_one_transaction(connection: LocalConnection) -> None:
+    assert connection.writer is not None
+    savepoints: List[bool] = []
+
+    def before_cursor_execute(bind: Connection, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.startswith('SAVEPOINT'):
+            savepoints.append(cursor.connection.in_transaction)
+
+    def insert(username: str) -> Callable[[Session], None]:
+        return lambda session: session.add(UserEntity(username=username, password='password'))
+
+    event.listen(connection.engine, 'before_cursor_execute', before_cursor_execute)
+    futures = [connection.writer.submit(insert(f'user{index}')) for index in range(3)]
+    for future in futures:
+        future.result()
+
+    assert connection.writer.statistics['batches'] == 1
+    assert savepoints == [True, True, True]
+
+
+def test_failed_operation_must_not_discard_its_batch(connection: LocalConnection) -> None:
+    assert connection.writer is not None
+
+    def fail(session: Session) -> None:
+        session.execute(text("INSERT INTO user (username, password) VALUES ('admin', 'admin')"))
+        raise ValueError('fail')
+
+    def insert(session: Session) -> int:
+        return session.scalar(text("INSERT INTO user (username, password) VALUES ('other', 'other') RETURNING iduser"))
+
+    failed = connection.writer.submit(fail)
+    inserted = connection.writer.submit(insert)
+
+    with pytest.raises(ValueError):
+        failed.result()
+    assert inserted.result() is not None
+    assert UserRepository.select_one(connection, iduser=inserted.result())['username'] == 'other'
+    with pytest.raises(RegisterNotFound):
+        UserRepository.select_one(connection, username='admin')
+    assert connection.writer.statistics['errors'] == 1
+
+
+def test_failed_batch_must_fail_its_operations_and_keep_the_writer_running(
+    connection: LocalConnection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert connection.writer is not None
+
+    def on_commit() -> None:
+        raise RuntimeError('on_commit')
+
+    def insert(username: str) -> Callable[[Session], int]:
+        return lambda session: session.scalar(
+            text('INSERT INTO user (username, password) VALUES (:username, :username) RETURNING iduser'),
+            {'username': username},
+        )
+
+    monkeypatch.setattr(connection.writer, 'on_commit', on_commit)
+    futures = [connection.writer.submit(insert(f'user{index}')) for index in range(2)]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    monkeypatch.undo()
+
+    assert connection.writer.execute(insert('other')) is not None
+    assert connection.writer.thread.is_alive()
+    assert connection.writer.status()['errors'] == 2
+
+
+def test_update_owned_must_report_missing_post_through_writer(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+
+    with pytest.raises(RegisterNotFound):
+        PostRepository.update_owned(connection, 1, user['iduser'], 'Title', 'Body')
+
+
+def test_metrics_must_expose_group_commit_statistics() -> None:
+    application = create_app(
+        {
+            'TESTING': True,
+            'DATABASE_URL': 'sqlite:///test.sqlite',
+            'METRICS_ENABLED': True,
+            'DATABASE_GROUP_COMMIT': True,
+        }
+    )
+    with application.app_context():
+        user = UserRepository.insert_one(application.extensions['database'], 'admin', 'admin')
+        PostRepository.insert_one(application.extensions['database'], 'Title', 'Body', user['iduser'])
+
+    body = application.extensions['metrics'].render()
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+    assert 'group_commit_queue_depth 0' in body
+    assert 'group_commit_batch_size_count 1' in body
+    assert 'group_commit_events_total{event="operations"} 1' in body
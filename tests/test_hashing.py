@@ -0,0 +1,84 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+from app.view.exceptions import HashingUnavailable
+from app.view.hashing import method_prefix
+from app.view.hashing import PasswordHasher
+
+
+@pytest.fixture(scope='function')
+def hasher() -> Iterator[PasswordHasher]:
+    password_hasher = PasswordHasher('pbkdf2:sha256:1000', workers=1, queue_depth=0)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app(
+        {'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite', 'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'}
+    )
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_check_must_accept_hashed_password(hasher: PasswordHasher) -> None:
+    pwhash = hasher.hash('password')
+
+    assert hasher.check(pwhash, 'password')
+    assert not hasher.check(pwhash, 'wrong')
+
+
+def test_needs_rehash_must_detect_outdated_method(hasher: PasswordHasher) -> None:
+    assert not hasher.needs_rehash(hasher.hash('password'))
+    assert hasher.needs_rehash(generate_password_hash('password', 'pbkdf2:sha256:2000'))
+
+
+@pytest.mark.parametrize('method', ['scrypt', 'scrypt:16384:8:1', 'pbkdf2', 'pbkdf2:sha512', 'pbkdf2:sha256:1000'])
+def test_method_prefix_must_match_generated_hashes(method: str) -> None:
+    assert method_prefix(method) == generate_password_hash('password', method).split('$', 1)[0]
+
+
+def test_needs_rehash_must_not_hash(hasher: PasswordHasher) -> None:
+    hasher.needs_rehash(generate_password_hash('password', 'pbkdf2:sha256:2000'))
+
+    assert hasher.status()['hashes'] == 0
+
+
+def test_submit_raises_exception_if_pool_is_saturated(hasher: PasswordHasher) -> None:
+    hasher.slots.acquire()
+
+    with pytest.raises(HashingUnavailable):
+        hasher.hash('password')
+
+    assert hasher.statistics['rejected'] == 1
+
+
+def test_login_must_rehash_outdated_password(application: Flask) -> None:
+    connection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', generate_password_hash('admin', 'pbkdf2:sha256:2000'))
+
+    response = application.test_client().post('/auth/login', data={'username': 'admin', 'password': 'admin'})
+    password = UserRepository.select_one(connection, iduser=user['iduser'])['password']
+
+    assert response.status_code == 302
+    assert password.startswith('pbkdf2:sha256:1000$')
+
+
+def test_login_must_answer_service_unavailable_if_pool_is_saturated(application: Flask) -> None:
+    UserRepository.insert_one(application.extensions['database'], 'admin', 'admin')
+    hasher: PasswordHasher = application.extensions['password_hasher']
+    for _ in range(application.config['PASSWORD_HASH_WORKERS'] + application.config['PASSWORD_HASH_QUEUE_DEPTH']):
+        hasher.slots.acquire()
+
+    response = application.test_client().post('/auth/login', data={'username': 'admin', 'password': 'admin'})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
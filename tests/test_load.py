@@ -0,0 +1,32 @@
+import argparse
+
+import pytest
+
+from benchmarks.load import parse_mix
+from benchmarks.load import Sample
+from benchmarks.load import summarize_load
+
+
+def test_parse_mix_must_read_weights() -> None:
+    assert parse_mix('index=70,create=30') == {'index': 70.0, 'create': 30.0}
+
+
+def test_parse_mix_raises_exception_if_endpoint_is_invalid() -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix('index=70,delete=30')
+
+
+def test_summarize_load_must_count_errors_and_lock_timeouts() -> None:
+    samples = [
+        Sample('index', 200, 0.010, False),
+        Sample('create', 302, 0.020, False),
+        Sample('create', 503, 5.000, True),
+        Sample('create', 500, 0.030, False),
+    ]
+
+    results = summarize_load(samples, duration=2.0)
+
+    assert results['create']['requests'] == 3
+    assert results['create']['lock_timeouts'] == 1
+    assert results['create']['error_rate'] == pytest.approx(2 / 3)
+    assert results['total']['throughput'] == 2.0
@@ -0,0 +1,73 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+from app.database.connections import LocalConnection
+from app.database.connections import read_only_url
+from app.database.connections import SQLITE_PROFILES
+from app.database.repositories import UserRepository
+
+
+@pytest.fixture(scope='function')
+def connection() -> Iterator[LocalConnection]:
+    local_connection = LocalConnection('sqlite:///test.sqlite', pool_size=2, max_overflow=1)
+    yield local_connection
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_init_must_create_schema(connection: LocalConnection) -> None:
+    tables = inspect(connection.engine).get_table_names()
+
+    assert {'user', 'post'}.issubset(tables)
+
+
+def test_init_must_apply_pool_options(connection: LocalConnection) -> None:
+    status = connection.pool_status()
+
+    assert status['size'] == 2
+
+
+def test_pool_status_must_count_checkouts(connection: LocalConnection) -> None:
+    before = connection.pool_status()
+    UserRepository.insert_one(connection, 'admin', 'admin')
+    after = connection.pool_status()
+
+    assert after['checkouts'] > before['checkouts']
+    assert after['checked_out'] == 0
+
+
+def test_pool_options_must_be_skipped_for_memory_database() -> None:
+    local_connection = LocalConnection('sqlite://', pool_size=2, max_overflow=1)
+
+    assert 'user' in inspect(local_connection.engine).get_table_names()
+
+
+def test_pragmas_must_be_applied_on_connect() -> None:
+    local_connection = LocalConnection('sqlite:///test.sqlite', pragmas=SQLITE_PROFILES['production'])
+    pragmas = local_connection.effective_pragmas()
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+    assert pragmas['journal_mode'] == 'wal'
+    assert pragmas['synchronous'] == 1
+    assert pragmas['busy_timeout'] == 5000
+    assert pragmas['temp_store'] == 2
+
+
+def test_read_only_url_must_use_uri_mode() -> None:
+    assert read_only_url('sqlite:///instance/database.sqlite') == (
+        'sqlite:///file:instance/database.sqlite?mode=ro&uri=true'
+    )
+
+
+def test_read_only_connection_must_reject_writes(connection: LocalConnection) -> None:
+    reader = LocalConnection(connection.url, read_only=True, pragmas=SQLITE_PROFILES['production'])
+
+    with pytest.raises(OperationalError):
+        UserRepository.insert_one(reader, 'admin', 'admin')
+
+    reader.dispose()
@@ -0,0 +1,52 @@
+import time
+
+from app.database.caches import LRUCache
+
+
+def test_get_must_return_default_if_key_not_found() -> None:
+    cache = LRUCache()
+
+    assert cache.get('key', 'default') == 'default'
+
+
+def test_get_must_return_stored_value() -> None:
+    cache = LRUCache()
+    cache.set('key', 'value')
+
+    assert cache.get('key') == 'value'
+
+
+def test_set_must_evict_least_recently_used_key() -> None:
+    cache = LRUCache(maxsize=2)
+    cache.set('first', 1)
+    cache.set('second', 2)
+    cache.get('first')
+    cache.set('third', 3)
+
+    assert cache.get('second') is None
+    assert cache.get('first') == 1
+
+
+def test_get_must_expire_values_after_ttl() -> None:
+    cache = LRUCache(ttl=0.01)
+    cache.set('key', 'value')
+    time.sleep(0.02)
+
+    assert cache.get('key') is None
+
+
+def test_invalidate_must_remove_key() -> None:
+    cache = LRUCache()
+    cache.set('key', 'value')
+    cache.invalidate('key')
+
+    assert cache.get('key') is None
+
+
+def test_statistics_must_count_hits_and_misses() -> None:
+    cache = LRUCache()
+    cache.set('key', 'value')
+    cache.get('key')
+    cache.get('missing')
+
+    assert cache.statistics() == {'hits': 1, 'misses': 1, 'size': 1}
@@ -0,0 +1,80 @@
+import logging
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from app.view.application import create_app
+from app.view.metrics import Histogram
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite', 'METRICS_ENABLED': True})
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_histogram_must_count_observations_cumulatively() -> None:
+    histogram = Histogram(buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    samples = {labels[-1][1]: value for name, labels, value in histogram.samples('latency', ()) if labels}
+
+    assert samples == {'0.1': 1, '1.0': 2, '+Inf': 3}
+
+
+def test_metrics_must_expose_request_and_sql_metrics(application: Flask) -> None:
+    client = application.test_client()
+    client.get('/')
+    body = client.get('/metrics').text
+
+    assert 'flask_request_duration_seconds_count{endpoint="blog.index"} 1' in body
+    assert 'flask_requests_total{endpoint="blog.index",method="GET",status="200"} 1' in body
+    assert 'sql_statements_total{endpoint="blog.index"} 1' in body
+    assert 'database_pool_events_total{event="checkouts"}' in body
+    assert 'cache_requests_total{cache="page",result="miss"} 1' in body
+
+
+def test_metrics_must_count_statements_on_replicas() -> None:
+    application = create_app(
+        {
+            'TESTING': True,
+            'DATABASE_URL': 'sqlite:///test.sqlite',
+            'DATABASE_REPLICA_URLS': ['sqlite:///test.sqlite'],
+            'METRICS_ENABLED': True,
+        }
+    )
+    connection = application.extensions['database']
+    client = application.test_client()
+    client.get('/')
+    body = client.get('/metrics').text
+
+    assert connection.replica_set.status()[0]['reads'] == 1
+    assert 'sql_statements_total{endpoint="blog.index"} 2' in body
+    connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_metrics_route_must_be_opt_in() -> None:
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite'})
+
+    assert application.test_client().get('/metrics').status_code == 404
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_slow_queries_must_be_logged(application: Flask, caplog: pytest.LogCaptureFixture) -> None:
+    application.config['SLOW_QUERY_THRESHOLD'] = 0.0
+    with application.app_context():
+        with application.extensions['database'].engine.connect() as connection:
+            with caplog.at_level(logging.WARNING):
+                connection.execute(text('SELECT 1'))
+
+    assert 'Slow query' in caplog.text
+    assert 'sql_slow_queries_total 1' in application.extensions['metrics'].render()
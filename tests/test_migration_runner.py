@@ -0,0 +1,122 @@
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+from typing import Set
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy import inspect
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.database.connections import LocalConnection
+from app.database.entities import BaseEntity
+from app.database.migrations import MIGRATIONS
+from app.database.migrations import MigrationRunner
+from app.database.repositories import FeedRepository
+from app.database.repositories import PostRepository
+
+
+@pytest.fixture(scope='function')
+def legacy_engine() -> Iterator[Engine]:
+    engine = create_engine('sqlite:///test.sqlite')
+    with engine.begin() as connection:
+        connection.execute(text('CREATE TABLE user (iduser INTEGER PRIMARY KEY, username VARCHAR, password VARCHAR)'))
+        connection.execute(
+            text(
+                'CREATE TABLE post '
+                '(idpost INTEGER PRIMARY KEY, title VARCHAR, body VARCHAR, created DATETIME, id_user INTEGER)'
+            )
+        )
+    yield engine
+    engine.dispose()
+    Path('test.sqlite').unlink()
+
+
+def index_names(engine: Engine) -> Set[Optional[str]]:
+    return {index['name'] for index in inspect(engine).get_indexes('post')}
+
+
+def test_fresh_database_must_be_stamped_with_latest_version() -> None:
+    connection = LocalConnection('sqlite:///test.sqlite')
+
+    assert MigrationRunner.current_version(connection.engine) == MigrationRunner.head()
+    assert MigrationRunner.pending(connection.engine) == []
+    connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_upgrade_must_add_indexes_to_existing_database(legacy_engine: Engine) -> None:
+    BaseEntity.metadata.create_all(legacy_engine, tables=[BaseEntity.metadata.tables['schema_version']])
+    assert 'ix_post_created_idpost' not in index_names(legacy_engine)
+
+    applied = MigrationRunner.upgrade(legacy_engine)
+
+    assert [migration.version for migration in applied] == [migration.version for migration in MIGRATIONS]
+    assert {'ix_post_created_idpost', 'ix_post_id_user_created'}.issubset(index_names(legacy_engine))
+    assert MigrationRunner.current_version(legacy_engine) == MigrationRunner.head()
+
+
+def test_prepare_must_upgrade_existing_database_instead_of_creating_tables(legacy_engine: Engine) -> None:
+    MigrationRunner.prepare(legacy_engine)
+
+    assert MigrationRunner.pending(legacy_engine) == []
+    assert {'ix_post_created_idpost', 'ix_post_id_user_created'}.issubset(index_names(legacy_engine))
+    assert {'feed', 'post_fts', 'user_shard', 'post_sequence'}.issubset(inspect(legacy_engine).get_table_names())
+    with legacy_engine.connect() as connection:
+        triggers = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars().all()
+
+    assert len(triggers)
+
+
+def test_upgrade_must_be_idempotent(legacy_engine: Engine) -> None:
+    MigrationRunner.prepare(legacy_engine)
+    MigrationRunner.upgrade(legacy_engine)
+
+    assert MigrationRunner.upgrade(legacy_engine) == []
+
+
+def test_upgrade_must_index_existing_posts_for_search(legacy_engine: Engine) -> None:
+    with legacy_engine.begin() as connection:
+        connection.execute(text("INSERT INTO user VALUES (1, 'admin', 'admin')"))
+        connection.execute(text("INSERT INTO post VALUES (1, 'Legacy title', 'Body', '2023-01-01 00:00:00', 1)"))
+
+    MigrationRunner.prepare(legacy_engine)
+    MigrationRunner.upgrade(legacy_engine)
+
+    with legacy_engine.connect() as connection:
+        rows = connection.execute(text("SELECT rowid FROM post_fts WHERE post_fts MATCH 'legacy'")).all()
+
+    assert rows == [(1,)]
+
+
+def test_upgrade_must_fill_feed_with_existing_posts(legacy_engine: Engine) -> None:
+    with legacy_engine.begin() as connection:
+        connection.execute(text("INSERT INTO user VALUES (1, 'admin', 'admin')"))
+        connection.execute(text("INSERT INTO post VALUES (1, 'Legacy title', 'Body', '2023-01-01 00:00:00', 1)"))
+
+    MigrationRunner.prepare(legacy_engine)
+    MigrationRunner.upgrade(legacy_engine)
+
+    with legacy_engine.connect() as connection:
+        rows = connection.execute(text('SELECT idpost, title, username FROM feed')).all()
+
+    assert rows == [(1, 'Legacy title', 'admin')]
+
+
+def test_create_schema_must_migrate_existing_database_with_rows(legacy_engine: Engine) -> None:
+    with legacy_engine.begin() as connection:
+        connection.execute(text("INSERT INTO user VALUES (1, 'admin', 'admin')"))
+        connection.execute(text("INSERT INTO post VALUES (1, 'Legacy title', 'Body', '2023-01-01 00:00:00', 1)"))
+        connection.execute(text("INSERT INTO post VALUES (2, 'Second title', 'Body', '2023-01-02 00:00:00', 1)"))
+
+    database = LocalConnection('sqlite:///test.sqlite')
+    feed = FeedRepository.select_page(database)
+    search = PostRepository.search(database, 'legacy')
+    version = MigrationRunner.current_version(database.engine)
+    database.dispose()
+
+    assert [(post['idpost'], post['username']) for post in feed['posts']] == [(2, 'admin'), (1, 'admin')]
+    assert [post['idpost'] for post in search['posts']] == [1]
+    assert {'ix_post_created_idpost', 'ix_post_id_user_created'}.issubset(index_names(legacy_engine))
+    assert version == MigrationRunner.head()
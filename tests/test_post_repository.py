@@ -4,7 +4,12 @@ from typing import Iterator
 import pytest
 
 from app.database.connections import LocalConnection
+from app.database.connections import StatementCounter
+from app.database.entities import PostEntity
+from app.database.entities import UserEntity
+from app.database.exceptions import InvalidOption
 from app.database.exceptions import MissingRequiredField
+from app.database.exceptions import NotRegisterOwner
 from app.database.exceptions import RegisterNotFound
 from app.database.repositories import PostRepository
 from app.database.repositories import UserRepository
@@ -144,3 +149,203 @@ def test_delete_one_must_persist_changes(connection: LocalConnection) -> None:
 
     with pytest.raises(RegisterNotFound):
         PostRepository.select_one(connection, idpost=post['idpost'])
+
+
+@pytest.mark.parametrize('strategy', ('projection', 'joined', 'selectin', 'lazy'))
+def test_select_all_must_return_same_registers_for_each_strategy(connection: LocalConnection, strategy: str) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+    PostRepository.insert_one(connection, 'Title Two', 'Body Two', user['iduser'])
+
+    posts = PostRepository.select_all(connection, strategy=strategy)
+
+    assert posts == PostRepository.select_all(connection, strategy='projection')
+
+
+@pytest.mark.parametrize('strategy', ('projection', 'joined', 'selectin', 'lazy'))
+def test_select_all_must_order_newest_first(connection: LocalConnection, strategy: str) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    days = [3, 1, 4, 2]
+    registers = [
+        {'title': f'Day {day}', 'body': 'Body', 'id_user': user['iduser'], 'created': f'2023-01-0{day}T10:00:00'}
+        for day in days
+    ]
+    PostRepository.insert_many(connection, registers)
+
+    posts = PostRepository.select_all(connection, strategy=strategy)
+
+    assert [post['title'] for post in posts] == ['Day 4', 'Day 3', 'Day 2', 'Day 1']
+
+
+def test_select_all_raises_exception_if_strategy_is_invalid(connection: LocalConnection) -> None:
+    with pytest.raises(InvalidOption):
+        PostRepository.select_all(connection, strategy='eager')
+
+
+def test_select_all_must_emit_one_statement_for_many_posts(connection: LocalConnection) -> None:
+    with connection.Session() as session:
+        users = [UserEntity(username=f'user{index}', password='password') for index in range(1000)]
+        session.add_all(PostEntity(title='Title', body='Body', user=user) for user in users)
+        session.commit()
+
+    with StatementCounter(connection.engine) as counter:
+        posts = PostRepository.select_all(connection)
+
+    assert len(posts) == 1000
+    assert counter.count == 1
+
+
+def test_select_page_must_return_posts_newest_first(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    posts = [PostRepository.insert_one(connection, f'Title {index}', 'Body', user['iduser']) for index in range(5)]
+
+    page = PostRepository.select_page(connection, limit=3)
+
+    assert [post['idpost'] for post in page['posts']] == [post['idpost'] for post in reversed(posts[2:])]
+    assert page['has_more']
+
+
+def test_select_page_must_continue_after_cursor(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    posts = [PostRepository.insert_one(connection, f'Title {index}', 'Body', user['iduser']) for index in range(5)]
+
+    first_page = PostRepository.select_page(connection, limit=3)
+    last = first_page['posts'][-1]
+    second_page = PostRepository.select_page(connection, last['created'], last['idpost'], limit=3)
+
+    assert [post['idpost'] for post in second_page['posts']] == [posts[1]['idpost'], posts[0]['idpost']]
+    assert not second_page['has_more']
+
+
+def test_select_page_must_go_backwards_from_cursor(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    posts = [PostRepository.insert_one(connection, f'Title {index}', 'Body', user['iduser']) for index in range(5)]
+
+    page = PostRepository.select_page(connection, posts[1]['created'], posts[1]['idpost'], limit=2, backwards=True)
+
+    assert [post['idpost'] for post in page['posts']] == [posts[3]['idpost'], posts[2]['idpost']]
+    assert page['has_more']
+
+
+def test_insert_many_must_insert_valid_registers(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    registers = [{'title': f'Title {index}', 'body': 'Body', 'id_user': user['iduser']} for index in range(25)]
+    report = PostRepository.insert_many(connection, registers, chunk_size=10)
+
+    assert report == {'inserted': 25, 'errors': []}
+    assert len(PostRepository.select_all(connection)) == 25
+
+
+def test_insert_many_must_report_invalid_registers_without_aborting(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    registers = [
+        {'title': 'Title', 'body': 'Body', 'id_user': user['iduser'], 'created': '2023-01-01T10:00:00'},
+        {'title': '', 'body': 'Body', 'id_user': user['iduser']},
+        {'title': 'Title', 'body': 'Body', 'id_user': -1},
+        {'title': 'Title', 'body': 'Body', 'id_user': user['iduser'], 'created': 'yesterday'},
+    ]
+    report = PostRepository.insert_many(connection, registers)
+
+    assert report['inserted'] == 1
+    assert sorted(index for index, _ in report['errors']) == [1, 2, 3]
+
+
+def test_insert_many_must_report_registers_with_invalid_types(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    registers = [
+        {'title': 'Title', 'body': 'Body', 'id_user': user['iduser'], 'created': 5},
+        {'title': ['Title'], 'body': 'Body', 'id_user': user['iduser']},
+        {'title': 'Title', 'body': {'text': 'Body'}, 'id_user': user['iduser']},
+        {'title': 'Title', 'body': 'Body', 'id_user': [user['iduser']]},
+        {'title': 'Title', 'body': 'Body', 'id_user': user['iduser']},
+    ]
+    report = PostRepository.insert_many(connection, registers)
+
+    assert report['inserted'] == 1
+    assert sorted(index for index, _ in report['errors']) == [0, 1, 2, 3]
+
+
+def test_search_must_rank_matching_posts(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    PostRepository.insert_one(connection, 'Gardening', 'Tomatoes and peppers', user['iduser'])
+    first = PostRepository.insert_one(connection, 'Flask tips', 'Flask flask flask', user['iduser'])
+    body = 'Mentions flask once among many other words'
+    second = PostRepository.insert_one(connection, 'Python', body, user['iduser'])
+
+    page = PostRepository.search(connection, 'flask')
+
+    assert [post['idpost'] for post in page['posts']] == [first['idpost'], second['idpost']]
+    assert '\x02Flask\x03' in page['posts'][0]['snippet']
+
+
+def test_search_must_continue_after_cursor(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    for index in range(3):
+        PostRepository.insert_one(connection, f'Title {index}', 'flask', user['iduser'])
+
+    first_page = PostRepository.search(connection, 'flask', limit=2)
+    last = first_page['posts'][-1]
+    second_page = PostRepository.search(connection, 'flask', limit=2, cursor=(last['rank'], last['idpost']))
+
+    assert first_page['has_more']
+    assert len(second_page['posts']) == 1
+    assert not second_page['has_more']
+
+
+def test_search_must_follow_updates_and_deletes(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    post = PostRepository.insert_one(connection, 'Title', 'flask', user['iduser'])
+    PostRepository.update_one(connection, post['idpost'], body='django')
+
+    assert PostRepository.search(connection, 'flask')['posts'] == []
+    assert len(PostRepository.search(connection, 'django')['posts']) == 1
+
+    PostRepository.delete_one(connection, post['idpost'])
+
+    assert PostRepository.search(connection, 'django')['posts'] == []
+
+
+@pytest.mark.parametrize('query', ('', '"', 'AND OR ('))
+def test_search_must_accept_any_query(connection: LocalConnection, query: str) -> None:
+    assert PostRepository.search(connection, query)['posts'] == []
+
+
+def test_update_owned_must_update_post_of_owner(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    post = PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+
+    updated = PostRepository.update_owned(connection, post['idpost'], user['iduser'], 'Changed', 'Body')
+
+    assert updated['title'] == 'Changed'
+    assert PostRepository.select_one(connection, idpost=post['idpost'])['title'] == 'Changed'
+
+
+def test_update_owned_must_use_a_single_statement(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    post = PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+
+    with StatementCounter(connection.engine) as counter:
+        PostRepository.update_owned(connection, post['idpost'], user['iduser'], 'Changed', 'Body')
+
+    assert counter.count == 1
+
+
+def test_update_owned_and_delete_owned_raise_exception_if_not_owner(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    other = UserRepository.insert_one(connection, 'other', 'other')
+    post = PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+
+    with pytest.raises(NotRegisterOwner):
+        PostRepository.update_owned(connection, post['idpost'], other['iduser'], 'Changed', 'Body')
+
+    with pytest.raises(NotRegisterOwner):
+        PostRepository.delete_owned(connection, post['idpost'], other['iduser'])
+
+    assert PostRepository.select_one(connection, idpost=post['idpost'])['title'] == 'Title'
+
+
+def test_delete_owned_raise_exception_if_post_not_found(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+
+    with pytest.raises(RegisterNotFound):
+        PostRepository.delete_owned(connection, 99, user['iduser'])
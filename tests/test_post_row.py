@@ -0,0 +1,39 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from app.database.rows import PostRow
+from app.database.rows import SearchRow
+
+
+def make_row() -> PostRow:
+    return PostRow(1, 'Title', 'Body', datetime(2024, 1, 1), 2, 'admin')
+
+
+def test_post_row_must_allow_mapping_and_attribute_access() -> None:
+    row = make_row()
+
+    assert row['title'] == row.title == 'Title'
+    assert row.get('missing', None) is None
+    assert list(row) == ['idpost', 'title', 'body', 'created', 'id_user', 'username']
+
+
+def test_post_row_must_compare_equal_to_dict() -> None:
+    row = make_row()
+
+    assert row == row.asdict()
+    assert dict(row) == row.asdict()
+
+
+def test_post_row_must_not_have_instance_dict() -> None:
+    with pytest.raises(AttributeError):
+        make_row().__dict__
+
+
+def test_search_row_must_extend_post_row_fields() -> None:
+    row = SearchRow(1, 'Title', 'Body', datetime(2024, 1, 1), 2, 'admin', 'snippet', -1.5)
+
+    assert row['rank'] == -1.5
+    assert len(row) == 8
+    assert json.loads(json.dumps(row.asdict(), default=str))['snippet'] == 'snippet'
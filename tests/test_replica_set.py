@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+
+from app.database.connections import LocalConnection
+from app.database.connections import StatementCounter
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+
+
+@pytest.fixture(scope='function')
+def connection() -> Iterator[LocalConnection]:
+    local_connection = LocalConnection('sqlite:///test.sqlite', replica_urls=['sqlite:///test.sqlite'] * 2)
+    yield local_connection
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_reads_must_be_routed_to_replicas_round_robin(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    connection.stick(False)
+    before = [replica['reads'] for replica in connection.replica_set.status()]
+
+    with StatementCounter(connection.engine) as counter:
+        for _ in range(4):
+            UserRepository.select_one(connection, iduser=user['iduser'])
+
+    after = [replica['reads'] for replica in connection.replica_set.status()]
+    assert counter.count == 0
+    assert [reads - previous for reads, previous in zip(after, before)] == [2, 2]
+
+
+def test_reads_must_stick_to_primary_after_write(connection: LocalConnection) -> None:
+    connection.stick(False)
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+
+    with StatementCounter(connection.engine) as counter:
+        UserRepository.select_one(connection, iduser=user['iduser'])
+
+    assert counter.count > 0
+
+
+def test_reads_must_fall_back_to_primary_if_replicas_are_unhealthy() -> None:
+    local_connection = LocalConnection('sqlite:///test.sqlite', replica_urls=['sqlite:///missing.sqlite'])
+    user = UserRepository.insert_one(local_connection, 'admin', 'admin')
+    local_connection.stick(False)
+
+    assert UserRepository.select_one(local_connection, iduser=user['iduser'])['username'] == 'admin'
+    assert local_connection.replica_set.status()[0]['healthy'] is False
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_session_must_read_its_own_writes_through_primary() -> None:
+    application = create_app(
+        {'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite', 'DATABASE_REPLICA_URLS': ['sqlite:///test.sqlite']}
+    )
+    connection: LocalConnection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+    writer = application.test_client()
+    reader = application.test_client()
+    with writer.session_transaction() as session:
+        session['iduser'] = user['iduser']
+
+    writer.post('/create', data={'title': 'Second', 'body': 'Body'})
+    reads = connection.replica_set.status()[0]['reads']
+    writer.get('/search?q=second')
+    assert connection.replica_set.status()[0]['reads'] == reads
+
+    reader.get('/search?q=second')
+    assert connection.replica_set.status()[0]['reads'] == reads + 1
+
+    connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_session_must_remember_writes_made_in_a_unit_of_work() -> None:
+    application = create_app(
+        {
+            'TESTING': True,
+            'DATABASE_URL': 'sqlite:///test.sqlite',
+            'DATABASE_REPLICA_URLS': ['sqlite:///test.sqlite'],
+            'DATABASE_UNIT_OF_WORK': True,
+        }
+    )
+    connection: LocalConnection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    writer = application.test_client()
+    with writer.session_transaction() as session:
+        session['iduser'] = user['iduser']
+
+    writer.post('/create', data={'title': 'Title', 'body': 'Body'})
+    with writer.session_transaction() as session:
+        assert 'wrote_at' in session
+
+    connection.dispose()
+    Path('test.sqlite').unlink()
@@ -0,0 +1,187 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+
+from app.database.connections import LocalConnection
+from app.database.entities import PostEntity
+from app.database.exceptions import InvalidOption
+from app.database.exceptions import NotRegisterOwner
+from app.database.exceptions import RegisterNotFound
+from app.database.repositories import FeedRepository
+from app.database.repositories import PostRepository
+from app.database.repositories import ShardRepository
+from app.database.repositories import UserRepository
+from app.view.application import create_app
+
+
+SHARD_PATHS = ('test-shard-0.sqlite', 'test-shard-1.sqlite')
+
+
+@pytest.fixture(scope='function')
+def connection() -> Iterator[LocalConnection]:
+    local_connection = LocalConnection('sqlite:///test.sqlite', shard_urls=[f'sqlite:///{path}' for path in SHARD_PATHS])
+    yield local_connection
+    local_connection.dispose()
+    for path in ('test.sqlite',) + SHARD_PATHS:
+        Path(path).unlink()
+
+
+def count_posts(connection: LocalConnection) -> list:
+    return [
+        session.scalar(select(func.count()).select_from(PostEntity))
+        for session in [connection.Session()] + [shard.Session() for shard in connection.shard_set]
+    ]
+
+
+def test_insert_one_must_place_posts_by_user(connection: LocalConnection) -> None:
+    first = UserRepository.insert_one(connection, 'first', 'first')
+    second = UserRepository.insert_one(connection, 'second', 'second')
+    posts = [PostRepository.insert_one(connection, 'Title', 'Body', user['iduser']) for user in (first, second, first)]
+
+    assert count_posts(connection) == [0, 1, 2]
+    assert [ShardRepository.locate_post(connection, post['idpost']).index for post in posts] == [
+        first['iduser'] % 2,
+        second['iduser'] % 2,
+        first['iduser'] % 2,
+    ]
+    assert len({post['idpost'] for post in posts}) == 3
+    assert PostRepository.select_one(connection, idpost=posts[1]['idpost'])['username'] == 'second'
+
+
+def test_select_page_must_merge_shards_by_created(connection: LocalConnection) -> None:
+    users = [UserRepository.insert_one(connection, name, name) for name in ('first', 'second')]
+    posts = [PostRepository.insert_one(connection, f'Title {index}', 'Body', users[index % 2]['iduser']) for index in range(5)]
+    expected = [post['idpost'] for post in reversed(posts)]
+
+    page = PostRepository.select_page(connection, limit=3)
+    feed = FeedRepository.select_page(connection, limit=3)
+    rest = FeedRepository.select_page(connection, page['posts'][-1]['created'], page['posts'][-1]['idpost'], 3)
+
+    assert [post['idpost'] for post in page['posts']] == expected[:3] and page['has_more']
+    assert [post['idpost'] for post in feed['posts']] == expected[:3]
+    assert [post['idpost'] for post in rest['posts']] == expected[3:] and not rest['has_more']
+    assert [post['idpost'] for post in PostRepository.select_all(connection)] == expected
+    assert [post['idpost'] for post in PostRepository.iterate(connection)] == expected[::-1]
+
+
+def test_owned_writes_must_check_ownership_on_the_user_shard(connection: LocalConnection) -> None:
+    owner = UserRepository.insert_one(connection, 'owner', 'owner')
+    other = UserRepository.insert_one(connection, 'other', 'other')
+    post = PostRepository.insert_one(connection, 'Title', 'Body', owner['iduser'])
+
+    with pytest.raises(NotRegisterOwner):
+        PostRepository.update_owned(connection, post['idpost'], other['iduser'], 'New title', 'New body')
+    with pytest.raises(NotRegisterOwner):
+        PostRepository.delete_owned(connection, post['idpost'], other['iduser'])
+    with pytest.raises(RegisterNotFound):
+        PostRepository.delete_owned(connection, post['idpost'] + 100, owner['iduser'])
+
+    PostRepository.update_owned(connection, post['idpost'], owner['iduser'], 'New title', 'New body')
+    assert PostRepository.select_one(connection, idpost=post['idpost'])['title'] == 'New title'
+
+    PostRepository.delete_owned(connection, post['idpost'], owner['iduser'])
+    with pytest.raises(RegisterNotFound):
+        PostRepository.select_one(connection, idpost=post['idpost'])
+
+
+def test_update_one_must_move_post_to_new_owner_shard(connection: LocalConnection) -> None:
+    first = UserRepository.insert_one(connection, 'first', 'first')
+    second = UserRepository.insert_one(connection, 'second', 'second')
+    post = PostRepository.insert_one(connection, 'Title', 'Body', first['iduser'])
+
+    updated = PostRepository.update_one(connection, post['idpost'], id_user=second['iduser'])
+
+    assert updated['username'] == 'second'
+    assert ShardRepository.locate_post(connection, post['idpost']) is ShardRepository.locate(connection, second['iduser'])
+    assert count_posts(connection) == [0, 1, 0] if second['iduser'] % 2 else [0, 0, 1]
+
+
+def test_move_user_must_copy_posts_and_update_directory(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    posts = [PostRepository.insert_one(connection, 'Title', 'Body', user['iduser']) for _ in range(3)]
+    source = ShardRepository.locate(connection, user['iduser'])
+    target = 1 - source.index
+
+    assert ShardRepository.move_user(connection, user['iduser'], target) == 3
+    assert ShardRepository.locate(connection, user['iduser']).index == target
+    assert [shard['posts'] for shard in ShardRepository.status(connection)][target] == 3
+
+    PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+    PostRepository.update_owned(connection, posts[0]['idpost'], user['iduser'], 'Moved', 'Body')
+    assert [shard['posts'] for shard in ShardRepository.status(connection)][target] == 4
+    assert PostRepository.search(connection, 'moved')['posts'][0]['idpost'] == posts[0]['idpost']
+
+    with pytest.raises(InvalidOption):
+        ShardRepository.move_user(connection, user['iduser'], 2)
+
+
+def test_moved_post_ids_must_not_be_reused(connection: LocalConnection) -> None:
+    users = [UserRepository.insert_one(connection, name, name) for name in ('first', 'second')]
+    mover = next(user for user in users if ShardRepository.locate(connection, user['iduser']).index == 0)
+    stayer = next(user for user in users if user is not mover)
+    moved = [PostRepository.insert_one(connection, 'Title', 'Body', mover['iduser'])['idpost'] for _ in range(2)]
+
+    ShardRepository.move_user(connection, mover['iduser'], 1)
+    ShardRepository.move_user(connection, stayer['iduser'], 0)
+    post = PostRepository.insert_one(connection, 'Title', 'Body', stayer['iduser'])
+    idposts = [register['idpost'] for register in PostRepository.select_all(connection)]
+
+    assert post['idpost'] > max(moved)
+    assert len(idposts) == len(set(idposts)) == 3
+
+
+def test_allocate_must_start_above_posts_on_every_shard(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    shard = ShardRepository.locate(connection, user['iduser'])
+    with shard.Session() as session:
+        ShardRepository.mirror_user(session, user['iduser'], user['username'])
+        values = {'title': 'Title', 'body': 'Body', 'created': datetime.now(), 'id_user': user['iduser']}
+        session.execute(insert(PostEntity).values(idpost=41, **values))
+        session.commit()
+
+    assert list(ShardRepository.allocate(connection, 2)) == [42, 43]
+    assert list(ShardRepository.allocate(connection)) == [44]
+
+
+def test_insert_many_must_route_rows_to_shards(connection: LocalConnection) -> None:
+    users = [UserRepository.insert_one(connection, name, name) for name in ('first', 'second')]
+    registers = [{'title': 'Title', 'body': 'Body', 'id_user': user['iduser']} for user in users * 2]
+
+    report = PostRepository.insert_many(connection, registers + [{'title': 'Title', 'body': 'Body', 'id_user': 99}])
+
+    assert report['inserted'] == 4
+    assert count_posts(connection) == [0, 2, 2]
+
+
+def test_plan_rebalance_must_even_out_shards() -> None:
+    counts = {0: {1: 50, 2: 30, 3: 10}, 1: {4: 5}}
+
+    moves = ShardRepository.plan_rebalance(counts)
+
+    assert moves == [(1, 0, 1), (4, 1, 0)]
+    assert ShardRepository.plan_rebalance({0: {1: 10}, 1: {2: 10}}) == []
+
+
+def test_shard_commands_must_report_and_rebalance() -> None:
+    shards = [f'sqlite:///{path}' for path in SHARD_PATHS]
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite', 'DATABASE_SHARD_URLS': shards})
+    connection = application.extensions['database']
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    PostRepository.insert_one(connection, 'Title', 'Body', user['iduser'])
+    runner = application.test_cli_runner()
+
+    status = runner.invoke(args=['shard', 'status'])
+    moved = runner.invoke(args=['shard', 'move', str(user['iduser']), str(1 - user['iduser'] % 2)])
+    rebalanced = runner.invoke(args=['shard', 'rebalance', '--dry-run'])
+    connection.dispose()
+    for path in ('test.sqlite',) + SHARD_PATHS:
+        Path(path).unlink()
+
+    assert f'Shard {user["iduser"] % 2}: 1 users, 1 posts' in status.output
+    assert 'Moved 1 posts' in moved.output
+    assert 'Planned 0 moves.' in rebalanced.output
@@ -0,0 +1,86 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+
+from app.view.application import create_app
+from app.view.throttling import Throttle
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app(
+        {
+            'TESTING': True,
+            'DATABASE_URL': 'sqlite:///test.sqlite',
+            'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+            'METRICS_ENABLED': True,
+            'AUTH_THROTTLE_USERNAME_BURST': 2,
+        }
+    )
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_acquire_must_reject_after_burst_and_refill(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr('app.view.throttling.time.monotonic', lambda: now[0])
+    throttle = Throttle({'ip': (0.5, 2)})
+
+    waits = [throttle.acquire({'ip': '10.0.0.1'}) for _ in range(3)]
+    now[0] += 2.0
+
+    assert waits[:2] == [0.0, 0.0] and waits[2] == pytest.approx(2.0)
+    assert throttle.acquire({'ip': '10.0.0.1'}) == 0.0
+    assert throttle.acquire({'ip': '10.0.0.2'}) == 0.0
+    assert throttle.statistics == {'allowed': 4, 'rejected_ip': 1}
+
+
+def test_acquire_must_not_spend_tokens_when_any_bucket_is_empty() -> None:
+    throttle = Throttle({'ip': (1.0, 5), 'username': (0.001, 1)})
+
+    throttle.acquire({'ip': '10.0.0.1', 'username': 'admin'})
+    wait = throttle.acquire({'ip': '10.0.0.1', 'username': 'admin'})
+
+    assert wait > 1
+    assert throttle.buckets.get(('ip', '10.0.0.1'))[0] == pytest.approx(4.0, abs=0.01)
+    assert throttle.statistics['rejected_username'] == 1
+
+
+def test_buckets_must_be_bounded() -> None:
+    throttle = Throttle({'ip': (1.0, 5)}, maxsize=2)
+
+    for address in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+        throttle.acquire({'ip': address})
+
+    assert throttle.buckets.statistics()['size'] == 2
+    assert throttle.buckets.get(('ip', '10.0.0.1')) is None
+
+
+def test_login_must_be_throttled_before_hashing(application: Flask) -> None:
+    client = application.test_client()
+    statuses = [
+        client.post('/auth/login', data={'username': 'Admin', 'password': 'wrong'}).status_code for _ in range(2)
+    ]
+    hashes = dict(application.extensions['password_hasher'].statistics)
+
+    response = client.post('/auth/login', data={'username': 'admin', 'password': 'wrong'})
+
+    assert statuses == [200, 200]
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert application.extensions['password_hasher'].statistics == hashes
+    assert client.get('/auth/login').status_code == 200
+    assert client.post('/auth/register', data={'username': 'other', 'password': 'other'}).status_code == 302
+    assert 'auth_throttle_events_total{event="rejected_username"} 1' in client.get('/metrics').text
+
+
+def test_throttle_must_be_opt_out(application: Flask) -> None:
+    application.config['AUTH_THROTTLE_ENABLED'] = False
+    client = application.test_client()
+
+    statuses = {client.post('/auth/login', data={'username': 'admin', 'password': 'x'}).status_code for _ in range(4)}
+
+    assert statuses == {200}
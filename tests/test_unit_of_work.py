@@ -0,0 +1,73 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from app.database.connections import assert_max_statements
+from app.database.connections import LocalConnection
+from app.database.connections import UnitOfWork
+from app.database.exceptions import RegisterNotFound
+from app.database.repositories import PostRepository
+from app.database.repositories import UserRepository
+
+
+@pytest.fixture(scope='function')
+def connection() -> Iterator[LocalConnection]:
+    local_connection = LocalConnection('sqlite:///test.sqlite')
+    yield local_connection
+    local_connection.dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_commit_must_persist_changes(connection: LocalConnection) -> None:
+    unit_of_work = UnitOfWork(connection)
+    user = UserRepository.insert_one(unit_of_work, 'admin', 'admin')
+    unit_of_work.commit()
+    unit_of_work.close()
+
+    assert UserRepository.select_one(connection, iduser=user['iduser'])['username'] == 'admin'
+
+
+def test_rollback_must_discard_changes(connection: LocalConnection) -> None:
+    unit_of_work = UnitOfWork(connection)
+    user = UserRepository.insert_one(unit_of_work, 'admin', 'admin')
+    unit_of_work.rollback()
+    unit_of_work.close()
+
+    with pytest.raises(RegisterNotFound):
+        UserRepository.select_one(connection, iduser=user['iduser'])
+
+
+def test_repositories_must_share_one_connection(connection: LocalConnection) -> None:
+    before = connection.pool_status()['checkouts']
+    unit_of_work = UnitOfWork(connection)
+    user = UserRepository.insert_one(unit_of_work, 'admin', 'admin')
+    post = PostRepository.insert_one(unit_of_work, 'Title', 'Body', user['iduser'])
+    PostRepository.update_one(unit_of_work, post['idpost'], title='Updated title')
+    unit_of_work.commit()
+    unit_of_work.close()
+
+    assert connection.pool_status()['checkouts'] == before + 1
+
+
+def test_statements_must_count_executed_sql(connection: LocalConnection) -> None:
+    unit_of_work = UnitOfWork(connection)
+    with assert_max_statements(connection.engine, 1) as counter:
+        with pytest.raises(RegisterNotFound):
+            UserRepository.select_one(unit_of_work, iduser=1)
+    unit_of_work.close()
+
+    assert unit_of_work.statements == counter.count == 1
+
+
+def test_commit_must_bump_generation_after_post_write(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    generation = connection.generation
+    unit_of_work = UnitOfWork(connection)
+    PostRepository.insert_one(unit_of_work, 'Title', 'Body', user['iduser'])
+
+    assert connection.generation == generation
+    unit_of_work.commit()
+    unit_of_work.close()
+
+    assert connection.generation == generation + 1
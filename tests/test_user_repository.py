@@ -2,8 +2,11 @@ from pathlib import Path
 from typing import Iterator
 
 import pytest
+from sqlalchemy import text
 
 from app.database.connections import LocalConnection
+from app.database.connections import StatementCounter
+from app.database.connections import UnitOfWork
 from app.database.exceptions import AlreadyRegistered
 from app.database.exceptions import MissingRequiredField
 from app.database.exceptions import RegisterNotFound
@@ -68,3 +71,95 @@ def test_select_one_must_return_dict_with_key(connection: LocalConnection, key:
 def test_select_one_must_raises_exception_if_user_not_found(connection: LocalConnection) -> None:
     with pytest.raises(RegisterNotFound):
         UserRepository.select_one(connection, iduser=1)
+
+
+def test_select_current_must_not_load_posts(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    current_user = UserRepository.select_current(connection, user['iduser'])
+
+    assert current_user == {'iduser': user['iduser'], 'username': 'admin'}
+
+
+def test_select_current_must_cache_user(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    UserRepository.select_current(connection, user['iduser'])
+
+    with StatementCounter(connection.engine) as counter:
+        UserRepository.select_current(connection, user['iduser'])
+
+    assert counter.count == 0
+    assert connection.user_cache.statistics()['hits'] == 1
+
+
+def test_invalidate_must_evict_cached_user(connection: LocalConnection) -> None:
+    user = UserRepository.insert_one(connection, 'admin', 'admin')
+    UserRepository.select_current(connection, user['iduser'])
+    UserRepository.invalidate(connection, user['iduser'])
+
+    with StatementCounter(connection.engine) as counter:
+        UserRepository.select_current(connection, user['iduser'])
+
+    assert counter.count == 1
+
+
+def test_select_current_must_raises_exception_if_user_not_found(connection: LocalConnection) -> None:
+    with pytest.raises(RegisterNotFound):
+        UserRepository.select_current(connection, 1)
+
+
+def test_insert_many_must_insert_valid_registers(connection: LocalConnection) -> None:
+    registers = [{'username': f'user{index}', 'password': 'password'} for index in range(25)]
+    report = UserRepository.insert_many(connection, registers, chunk_size=10)
+
+    assert report == {'inserted': 25, 'errors': []}
+    assert UserRepository.select_one(connection, username='user24')['password'] == 'password'
+
+
+def test_insert_many_must_report_invalid_registers_without_aborting(connection: LocalConnection) -> None:
+    UserRepository.insert_one(connection, 'admin', 'admin')
+    registers = [
+        {'username': 'first', 'password': 'password'},
+        {'username': 'admin', 'password': 'password'},
+        {'username': '', 'password': 'password'},
+        {'username': 'first', 'password': 'password'},
+        None,
+        {'username': 'second', 'password': 'password'},
+    ]
+    report = UserRepository.insert_many(connection, registers)
+
+    assert report['inserted'] == 2
+    assert sorted(index for index, _ in report['errors']) == [1, 2, 3, 4]
+
+
+def test_insert_many_must_report_registers_with_invalid_types(connection: LocalConnection) -> None:
+    registers = [
+        {'username': ['bad'], 'password': 'password'},
+        {'username': 'first', 'password': 5},
+        {'username': 'second', 'password': 'password'},
+    ]
+    report = UserRepository.insert_many(connection, registers)
+
+    assert report['inserted'] == 1
+    assert sorted(index for index, _ in report['errors']) == [0, 1]
+
+
+def test_insert_many_must_retry_conflicting_chunk_inside_the_unit_of_work(connection: LocalConnection) -> None:
+    with connection.engine.begin() as bind:
+        bind.execute(
+            text(
+                "CREATE TRIGGER reject_taken BEFORE INSERT ON user WHEN NEW.username = 'taken' "
+                "BEGIN SELECT RAISE(ABORT, 'UNIQUE constraint failed: user.username'); END"
+            )
+        )
+    registers = [{'username': username, 'password': 'password'} for username in ('first', 'taken', 'second')]
+    unit_of_work = UnitOfWork(connection)
+    UserRepository.insert_one(unit_of_work, 'admin', 'admin')
+
+    report = UserRepository.insert_many(unit_of_work, registers)
+    unit_of_work.commit()
+    unit_of_work.close()
+
+    assert report['inserted'] == 2
+    assert [index for index, _ in report['errors']] == [1]
+    usernames = ('admin', 'first', 'second')
+    assert [UserRepository.select_one(connection, username=name)['username'] for name in usernames] == list(usernames)
@@ -0,0 +1,43 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+
+from app.database.connections import StatementCounter
+from app.database.migrations import MigrationRunner
+from app.view.application import create_app
+from app.view.warmup import StartupReport
+
+
+@pytest.fixture(scope='function')
+def application() -> Iterator[Flask]:
+    application = create_app({'TESTING': True, 'DATABASE_URL': 'sqlite:///test.sqlite'})
+    yield application
+    application.extensions['database'].dispose()
+    Path('test.sqlite').unlink()
+
+
+def test_create_app_must_report_startup_phases(application: Flask) -> None:
+    report: StartupReport = application.extensions['startup_report']
+    phases = [name for name, _ in report.phases]
+
+    assert phases == ['settings', 'mappers', 'database', 'extensions', 'routes', 'templates']
+    assert 'total' in report.render()
+
+
+def test_create_app_must_precompile_templates(application: Flask) -> None:
+    assert application.jinja_env.cache is not None
+    loaded = {name for _, name in application.jinja_env.cache.keys()}
+
+    assert {'base.html', 'blog/index.html', 'auth/login.html'} <= loaded
+    assert application.jinja_env.bytecode_cache is not None
+
+
+def test_prepare_must_skip_schema_introspection_at_head(application: Flask) -> None:
+    engine = application.extensions['database'].engine
+
+    with StatementCounter(engine) as counter:
+        MigrationRunner.prepare(engine)
+
+    assert counter.count == 1